@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+atc_index.py — ATC 계층(5단계) 접두어 인덱스 + 노드별 집계
+
+제품마다 merge_tokens로 이어 붙인 `ATC코드`(예: `J05AB01·J05AB11`)를 풀어 각 코드의 상위 접두어
+(1: J, 2: J05, 3: J05A, 4: J05AB, 5: J05AB01)를 모두 노드로 만들고, 노드마다
+  - 하위 트리 전체의 제품/주성분 ID 정렬 배열(CSR)
+  - 제품 수, 주성분 수, 상한금액 최소/최대/평균/중앙값(제품 단위)
+을 미리 계산해 mmap_store 파일로 저장한다. "J05AB 아래 제품 전부"는 노드 이진 탐색 1회 + 결과 복사(O(log n + k)).
+
+  build_atc_index(enriched_df, "atc_index.plx")     # 제품코드/주성분코드/ATC코드/상한금액 컬럼
+  ix = AtcIndex("atc_index.plx")
+  ix.node("J05AB")          # {'code','level','n_products','n_substances','price_min',...}
+  ix.products("J05AB")      # ['제품코드', ...] (정렬)
+  ix.product_ids("J05AB")   # numpy uint32 (mmap 위 view, 복사 없음)
+  ix.children("J05A")       # 하위 단계 노드 코드
+
+CLI:
+  python atc_index.py build --enriched out/01_applied_price_enriched.csv --out out/atc_index.plx
+  python atc_index.py query --index out/atc_index.plx J05AB C09
+"""
+
+import re, argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from mmap_store import write_store, MappedStore, MappedStrings, SortedStrings, string_sections, sorted_string_sections
+
+MAGIC = b"PLXATCI1"
+LEVEL_LENS = (1, 3, 4, 5, 7)
+_LEVEL_OF = {n: i + 1 for i, n in enumerate(LEVEL_LENS)}
+_ATC_RX = re.compile(r'^[A-Z](?:\d{2}(?:[A-Z](?:[A-Z](?:\d{2})?)?)?)?$')
+
+def split_atc(s) -> list[str]:
+    """merge_tokens 결과(`·`/`,`/`|`/공백 구분) → 유효한 ATC 코드 목록(대문자)"""
+    if not isinstance(s, str):
+        return []
+    return [t for t in (x.strip().upper() for x in re.split(r'[·,|\s]+', s)) if t and _ATC_RX.match(t)]
+
+def atc_prefixes(code: str) -> list[str]:
+    return [code[:n] for n in LEVEL_LENS if n <= len(code)]
+
+def _price(s: pd.Series) -> pd.Series:
+    return pd.to_numeric(s.astype(str).str.replace(",", "", regex=False), errors="coerce")
+
+def _csr(node_ids: np.ndarray, vals: np.ndarray, n_nodes: int):
+    """(node, val) 쌍(정렬·중복 제거 완료) → ptr, idx"""
+    ptr = np.zeros(n_nodes + 1, dtype=np.uint64)
+    np.cumsum(np.bincount(node_ids, minlength=n_nodes), out=ptr[1:])
+    return ptr, vals.astype(np.uint32)
+
+def build_atc_index(df: pd.DataFrame, out_path) -> Path:
+    base = pd.DataFrame({
+        "제품코드": df["제품코드"].astype(str).str.strip(),
+        "주성분코드": df["주성분코드"].fillna("").astype(str).str.strip() if "주성분코드" in df else "",
+        "atc": df["ATC코드"].map(split_atc),
+        "price": _price(df["상한금액"]) if "상한금액" in df else np.nan,
+    })
+    base = base[base["제품코드"] != ""]
+    products = sorted(base["제품코드"].unique())
+    substances = sorted(s for s in base["주성분코드"].unique() if s and s.lower() != "nan")
+    pid_of = {c: i for i, c in enumerate(products)}
+    sid_of = {c: i for i, c in enumerate(substances)}
+    # 제품 단위 가격(같은 제품코드 여러 행이면 첫 값)
+    price_by_pid = base.groupby("제품코드")["price"].first().reindex(products).to_numpy(dtype=float)
+
+    pairs = base[["제품코드", "주성분코드", "atc"]].explode("atc").dropna(subset=["atc"])
+    pairs = pairs.assign(node=pairs["atc"].map(atc_prefixes)).explode("node")
+    pairs["pid"] = pairs["제품코드"].map(pid_of)
+    pairs["sid"] = pairs["주성분코드"].map(sid_of)
+
+    node_codes = sorted(pairs["node"].unique())   # ASCII → 바이트 순 = 문자열 순
+    node_of = {c: i for i, c in enumerate(node_codes)}
+    pairs["nid"] = pairs["node"].map(node_of)
+    n_nodes = len(node_codes)
+
+    pp = pairs[["nid", "pid"]].drop_duplicates().sort_values(["nid", "pid"])
+    ss = pairs[["nid", "sid"]].dropna().drop_duplicates().astype({"sid": np.int64}).sort_values(["nid", "sid"])
+    p_ptr, p_idx = _csr(pp["nid"].to_numpy(), pp["pid"].to_numpy(), n_nodes)
+    s_ptr, s_idx = _csr(ss["nid"].to_numpy(), ss["sid"].to_numpy(), n_nodes)
+
+    pr = pd.DataFrame({"nid": pp["nid"].to_numpy(), "price": price_by_pid[pp["pid"].to_numpy()]})
+    agg = pr.groupby("nid")["price"].agg(["min", "max", "mean", "median"]).reindex(range(n_nodes))
+
+    secs, _ = sorted_string_sections("node", node_codes)
+    secs.update({
+        "node.level": ("B", np.array([_LEVEL_OF[len(c)] for c in node_codes], dtype=np.uint8)),
+        "node.n_products": ("I", np.diff(p_ptr).astype(np.uint32)),
+        "node.n_substances": ("I", np.diff(s_ptr).astype(np.uint32)),
+        "node.price_min": ("d", agg["min"].to_numpy(dtype=float)),
+        "node.price_max": ("d", agg["max"].to_numpy(dtype=float)),
+        "node.price_mean": ("d", agg["mean"].to_numpy(dtype=float)),
+        "node.price_median": ("d", agg["median"].to_numpy(dtype=float)),
+        "prod.ptr": ("Q", p_ptr), "prod.idx": ("I", p_idx),
+        "subs.ptr": ("Q", s_ptr), "subs.idx": ("I", s_idx),
+        **string_sections("product", products),
+        **string_sections("substance", substances),
+    })
+    return write_store(out_path, secs, magic=MAGIC)
+
+class AtcIndex:
+    def __init__(self, path):
+        self.store = st = MappedStore(path, magic=MAGIC)
+        self.nodes = SortedStrings(st, "node")
+        self.product_codes = MappedStrings(st, "product")
+        self.substance_codes = MappedStrings(st, "substance")
+        self._level = st["node.level"]
+        self._np, self._ns = st["node.n_products"], st["node.n_substances"]
+        self._price = {k: st[f"node.price_{k}"] for k in ("min", "max", "mean", "median")}
+        self._pptr, self._pidx = st["prod.ptr"], st["prod.idx"]
+        self._sptr, self._sidx = st["subs.ptr"], st["subs.idx"]
+
+    def _nid(self, code: str) -> int:
+        return self.nodes.find((code or "").strip().upper())
+
+    def node(self, code: str) -> dict | None:
+        i = self._nid(code)
+        if i < 0:
+            return None
+        d = {"code": self.nodes[i], "level": self._level[i],
+             "n_products": self._np[i], "n_substances": self._ns[i]}
+        for k, arr in self._price.items():
+            v = arr[i]
+            d[f"price_{k}"] = None if v != v else v   # NaN → None
+        return d
+
+    def product_ids(self, code: str) -> np.ndarray:
+        i = self._nid(code)
+        if i < 0:
+            return np.zeros(0, dtype=np.uint32)
+        return np.frombuffer(self._pidx[self._pptr[i]:self._pptr[i + 1]], dtype=np.uint32)
+
+    def substance_ids(self, code: str) -> np.ndarray:
+        i = self._nid(code)
+        if i < 0:
+            return np.zeros(0, dtype=np.uint32)
+        return np.frombuffer(self._sidx[self._sptr[i]:self._sptr[i + 1]], dtype=np.uint32)
+
+    def products(self, code: str) -> list[str]:
+        pc = self.product_codes
+        return [pc[int(i)] for i in self.product_ids(code)]
+
+    def substances(self, code: str) -> list[str]:
+        sc = self.substance_codes
+        return [sc[int(i)] for i in self.substance_ids(code)]
+
+    def children(self, code: str) -> list[str]:
+        """바로 아래 단계 노드(정렬 상 code로 시작하는 연속 구간에서 level+1만)"""
+        i = self._nid(code)
+        if i < 0:
+            return []
+        lo, hi = self.nodes.prefix_range(self.nodes[i])
+        want = self._level[i] + 1
+        return [self.nodes[j] for j in range(lo, hi) if self._level[j] == want]
+
+def main():
+    ap = argparse.ArgumentParser()
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build")
+    b.add_argument("--enriched", required=True, help="01_applied_price_enriched.csv 또는 스냅샷 CSV")
+    b.add_argument("--out", required=True)
+    q = sub.add_parser("query")
+    q.add_argument("--index", required=True)
+    q.add_argument("--limit", type=int, default=10)
+    q.add_argument("codes", nargs="+")
+    args = ap.parse_args()
+
+    if args.cmd == "build":
+        df = pd.read_csv(args.enriched, dtype=str, encoding="utf-8-sig")
+        p = build_atc_index(df, args.out)
+        print(f"[OK] atc index → {p} ({p.stat().st_size/2**20:.1f} MB)")
+        return
+    ix = AtcIndex(args.index)
+    for c in args.codes:
+        n = ix.node(c)
+        if n is None:
+            print(f"{c}\t- (ATC 노드 아님: 길이 {LEVEL_LENS} 접두어만)")
+            continue
+        print(f"{c}\tL{n['level']}  products={n['n_products']:,}  substances={n['n_substances']:,}  "
+              f"price min/median/max={n['price_min']}/{n['price_median']}/{n['price_max']}")
+        print(f"  children: {', '.join(ix.children(c)[:args.limit])}")
+        print(f"  products: {', '.join(ix.products(c)[:args.limit])}")
+
+if __name__ == "__main__":
+    main()
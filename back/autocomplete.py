@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+"""
+autocomplete.py — 초성/접두어 자동완성 인덱스(정렬 배열 + 이진 탐색, mmap 파일)
+
+대상: 품명_정제(브랜드), 성분명_KO / 성분명_EN(`·` 분리), 업체명 — 01_applied_price_enriched.csv 기준.
+가중치 = 해당 표기를 가진 제품코드 수(브랜드/성분/업체 모두 제품 수로 순위).
+
+  - 키 2벌: surface_key(전체 표기)와 to_chosung(초성 투영, 아시클로버 → ㅇㅅㅋㄹㅂ)
+    입력에 낱자 자음(ㄱ~ㅎ)이 섞여 있으면 초성 표에서, 아니면 전체 표에서 찾는다
+    (`아ㅅㅋ`처럼 섞인 입력은 초성 표에서 찾은 뒤 완성된 음절 위치가 일치하는 것만 남김)
+  - 접두어 범위 [lo, hi)는 bisect 두 번, 범위 내 top-k는 가중치 sparse table(RMQ)로
+    범위 크기와 무관하게 O(k log k)
+  - 파일은 mmap_store 형식 → 로드 시 파싱 없음, 워커끼리 페이지 공유
+
+  build_autocomplete(enriched_df, "autocomplete.idx")
+  ac = Autocomplete("autocomplete.idx")
+  ac.complete("ㅇㅅㅋㄹ", k=10)     # [Completion(text, kind, weight), ...] 가중치↓
+
+CLI:
+  python autocomplete.py build --enriched out/01_applied_price_enriched.csv --out out/autocomplete.idx
+  python autocomplete.py query --index out/autocomplete.idx ㅇㅅㅋㄹㅂ 타이레 amox
+"""
+
+import heapq, time, argparse
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils_kor import surface_key, to_chosung
+from mmap_store import write_store, MappedStore, MappedStrings, SortedStrings, string_sections, sorted_string_sections
+
+MAGIC = b"PLXAUTO1"
+KINDS = ("brand", "ingredient", "ingredient_en", "company")
+Completion = namedtuple("Completion", "text kind weight")
+
+_BARE_JAMO = frozenset(chr(c) for c in range(0x3131, 0x314F))   # ㄱ..ㅎ
+
+# ---------- 빌드 ----------
+def collect_entries(enriched: pd.DataFrame) -> pd.DataFrame:
+    """(text, kind, weight) — 같은 표기라도 종류가 다르면 별도 항목"""
+    df = enriched.fillna("").astype(str)
+    parts = []
+    def count(col_values: pd.Series, codes: pd.Series, kind: str):
+        t = pd.DataFrame({"text": col_values.str.strip(), "code": codes})
+        t = t[(t["text"] != "") & ~t["text"].str.lower().isin(["nan", "none", "null"])]
+        g = t.groupby("text")["code"].nunique().rename("weight").reset_index()
+        g["kind"] = kind
+        parts.append(g)
+    codes = df["제품코드"]
+    count(df["품명_정제"], codes, "brand")
+    # 성분명_KO가 비면(약가마스터 미매칭) 제품명에서 뽑은 성분_정제로 대신
+    ko = df["성분명_KO"].where(df["성분명_KO"].str.strip() != "", df.get("성분_정제", df["성분명_KO"]))
+    for vals, kind in ((ko, "ingredient"), (df["성분명_EN"], "ingredient_en")):
+        ex = pd.DataFrame({"v": vals.str.split("·"), "c": codes}).explode("v")
+        count(ex["v"], ex["c"], kind)
+    if "업체명" in df:
+        count(df["업체명"], codes, "company")
+    return pd.concat(parts, ignore_index=True)[["text", "kind", "weight"]]
+
+def _rmq_levels(weights: np.ndarray) -> np.ndarray:
+    """sparse table: level j, 위치 i → [i, i+2^j) 구간 최대 가중치 행 번호(동률은 왼쪽). n×L 평탄화"""
+    n = len(weights)
+    L = max(1, n.bit_length())
+    sp = np.zeros((L, n), dtype=np.uint32)
+    sp[0] = np.arange(n, dtype=np.uint32)
+    for j in range(1, L):
+        h = 1 << (j - 1)
+        a, b = sp[j - 1, : n - h], sp[j - 1, h:]
+        sp[j, : n - h] = np.where(weights[a] >= weights[b], a, b)
+        sp[j, n - h:] = sp[j - 1, n - h:]
+    return sp.reshape(-1)
+
+def _key_sections(prefix: str, keys: list[str], eids: list[int], entry_weights: np.ndarray) -> dict:
+    secs, order = sorted_string_sections(f"{prefix}.key", keys)
+    row_eid = np.asarray(eids, dtype=np.uint32)[order] if order else np.zeros(0, dtype=np.uint32)
+    secs[f"{prefix}.eid"] = ("I", row_eid)
+    secs[f"{prefix}.rmq"] = ("I", _rmq_levels(entry_weights[row_eid]) if len(row_eid) else np.zeros(0, np.uint32))
+    return secs
+
+def build_autocomplete(enriched: pd.DataFrame, out_path) -> Path:
+    ent = collect_entries(enriched)
+    texts = ent["text"].tolist()
+    weights = ent["weight"].to_numpy(dtype=np.uint32)
+    kinds = ent["kind"].map(KINDS.index).to_numpy(dtype=np.uint8)
+
+    full_k, full_e, cho_k, cho_e = [], [], [], []
+    for i, t in enumerate(texts):
+        k = surface_key(t)
+        if not k:
+            continue
+        full_k.append(k); full_e.append(i)
+        c = to_chosung(t)
+        if c != k:   # 한글이 없으면 초성 투영 = 전체 키 → 초성 표에는 넣지 않음
+            cho_k.append(c); cho_e.append(i)
+
+    secs = {**string_sections("entry.text", texts),
+            "entry.weight": ("I", weights), "entry.kind": ("B", kinds),
+            **string_sections("kinds", list(KINDS)),
+            **_key_sections("full", full_k, full_e, weights),
+            **_key_sections("cho", cho_k, cho_e, weights)}
+    return write_store(out_path, secs, magic=MAGIC)
+
+# ---------- 조회 ----------
+class _Table:
+    def __init__(self, st: MappedStore, name: str, weights):
+        self.keys = SortedStrings(st, f"{name}.key")
+        self.eid = st[f"{name}.eid"]
+        self.rmq = st[f"{name}.rmq"]
+        self.n = len(self.keys)
+        self.w = weights
+
+    def argmax(self, lo: int, hi: int) -> int:
+        """[lo, hi) 최대 가중치 행(O(1))"""
+        j = (hi - lo).bit_length() - 1
+        a = self.rmq[j * self.n + lo]
+        b = self.rmq[j * self.n + hi - (1 << j)]
+        w, eid = self.w, self.eid
+        return a if w[eid[a]] >= w[eid[b]] else b
+
+def _mixed_match(qk: str, tk: str) -> bool:
+    """qk의 낱자 자음 위치는 초성만, 완성 음절 위치는 글자 그대로 비교"""
+    if len(tk) < len(qk):
+        return False
+    for a, b in zip(qk, tk):
+        if a in _BARE_JAMO:
+            if to_chosung(b) != a:
+                return False
+        elif a != b:
+            return False
+    return True
+
+class Autocomplete:
+    def __init__(self, path):
+        self.store = MappedStore(path, magic=MAGIC)
+        st = self.store
+        self.text = MappedStrings(st, "entry.text")
+        self.weight = st["entry.weight"]
+        self.kind = st["entry.kind"]
+        self.kinds = list(MappedStrings(st, "kinds"))
+        self.full = _Table(st, "full", self.weight)
+        self.cho = _Table(st, "cho", self.weight)
+
+    def __len__(self):
+        return len(self.text)
+
+    def complete(self, prefix: str, k: int = 10, kinds=None) -> list[Completion]:
+        q = (prefix or "").strip()
+        if not q:
+            return []
+        mixed = None
+        if any(ch in _BARE_JAMO for ch in q):
+            tab, key = self.cho, to_chosung(q)
+            qk = surface_key(q)
+            if any(ch not in _BARE_JAMO and ch != c for ch, c in zip(qk, key)):
+                mixed = qk   # 완성 음절이 섞인 입력
+        else:
+            tab, key = self.full, surface_key(q)
+        lo, hi = tab.keys.prefix_range(key)
+        if lo >= hi:
+            return []
+        want = None if kinds is None else {self.kinds.index(x) for x in kinds}
+        eid_of, w = tab.eid, self.weight
+        m = tab.argmax(lo, hi)
+        heap = [(-w[eid_of[m]], m, lo, hi)]
+        out, seen = [], set()
+        while heap and len(out) < k:
+            _, m, a, b = heapq.heappop(heap)
+            e = eid_of[m]
+            if e not in seen and (want is None or self.kind[e] in want) and \
+                    (mixed is None or _mixed_match(mixed, surface_key(self.text[e]))):
+                seen.add(e)
+                out.append(Completion(self.text[e], self.kinds[self.kind[e]], w[e]))
+            for x, y in ((a, m), (m + 1, b)):
+                if x < y:
+                    mm = tab.argmax(x, y)
+                    heapq.heappush(heap, (-w[eid_of[mm]], mm, x, y))
+        return out
+
+def main():
+    ap = argparse.ArgumentParser()
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build")
+    b.add_argument("--enriched", required=True, help="01_applied_price_enriched.csv")
+    b.add_argument("--out", required=True)
+    q = sub.add_parser("query")
+    q.add_argument("--index", required=True)
+    q.add_argument("--k", type=int, default=10)
+    q.add_argument("prefixes", nargs="+")
+    args = ap.parse_args()
+
+    if args.cmd == "build":
+        from build_applied_price_bundle import read_enriched
+        p = build_autocomplete(read_enriched(args.enriched), args.out)
+        print(f"[OK] autocomplete index → {p} ({p.stat().st_size/2**20:.1f} MB)")
+        return
+    t0 = time.perf_counter()
+    ac = Autocomplete(args.index)
+    print(f"[OK] loaded {len(ac):,} entries in {(time.perf_counter()-t0)*1000:.1f} ms")
+    for pre in args.prefixes:
+        t = time.perf_counter()
+        res = ac.complete(pre, args.k)
+        us = (time.perf_counter() - t) * 1e6
+        print(f"{pre}  ({us:.0f} µs)")
+        for c in res:
+            print(f"  {c.weight:>5}  {c.kind:<13} {c.text}")
+
+if __name__ == "__main__":
+    main()
@@ -12,17 +12,32 @@ build_applied_price_bundle.py
   01_applied_price_enriched.csv        ← (적용약가 + ATC + 성분) 기준 테이블
   02_yakjejonghap_for_syn.csv          ← 유의어 사전용 정제 테이블
   03_rules_synonyms.txt                ← synonyms 규칙 (OpenSearch/ES 호환)
+  03_rules_synonyms_weighted.txt       ← 같은 규칙 + 표면형별 boost(`표면형|boost`, delimited_payload)
   03_rules_proper_nouns.txt            ← proper nouns 사전
 
 원칙
 - 기준은 적용약가. ATC/주성분은 선집계 후 좌조인(행수 불변).
+- 증분 빌드: outdir/.build_manifest.json에 단계별 입력/산출 해시 기록,
+  입력이 그대로인 단계는 스킵(중간 집계는 outdir/.cache/*.pkl). --force로 전체 재빌드.
 """
 
 import re, csv, argparse, os, math
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from collections import Counter
 
+from build_graph import BuildGraph
+from run_report import RunReport, stage
+from autocomplete import build_autocomplete
+from compiled_lexicon import LexiconBuilder
+from atc_index import build_atc_index
+from component_index import build_component_index
+from synonym_diff import write_rules_incremental, summary as diff_summary, state_path, diff_path
+from utils_kor import surface_key
+from variants import variants, iter_variants, Budget
+from surface_conflicts import find_conflicts, apply_policy, write_report, POLICIES
+
 # ---------------- 공통 헬퍼 ----------------
 def to_text(x) -> str:
     """NaN/None/숫자 섞임 방지용 안전 캐스팅"""
@@ -373,30 +388,15 @@ def export_names_from_product(raw:str) -> list[str]:
     return res
 
 def generate_variants(surface:str) -> list[str]:
-    """간단 변형: 캅셀→캡슐, 하이픈/공백 제거 버전"""
-    s=to_text(surface)
-    if not s: return []
-    outs = set()
-    outs.add(s)
-    outs.add(s.replace("캅셀","캡슐"))
-    outs.add(s.replace("-",""))
-    outs.add(s.replace(" ",""))
-    outs.add(s.replace("·"," "))
-    return [t for t in outs if t and t!=s]
+    """간단 변형: 캅셀→캡슐, 하이픈/공백 제거 버전 (variants.py `bundle` 프로필)"""
+    return variants(to_text(surface), "bundle")
 
-# ---------------- main pipeline ----------------
-def main():
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--applied", default=r"C:\Jimin\pharmaLex_unity\data\20220901_20250901 적용약가파일_8.28.수정.xlsx")
-    ap.add_argument("--atc",     default=r"C:\Jimin\pharmaLex_unity\data\건강보험심사평가원_ATC코드 매핑 목록_20240630.csv")
-    ap.add_argument("--subs",    default=r"C:\Jimin\pharmaLex_unity\data\건강보험심사평가원_약가마스터_의약품주성분_20241014.csv")
-    ap.add_argument("--outdir",  default=r".\out")
-    args = ap.parse_args()
-
-    outdir = Path(args.outdir); outdir.mkdir(parents=True, exist_ok=True)
-
-    # 1) 적용약가 로드 & 스냅샷(제품코드별 최신 1행)
-    apdf_full = read_excel_all_sheets(args.applied, dtype=str)
+# ---------------- pipeline stages ----------------
+def load_applied_latest(path: str, report: RunReport | None = None) -> pd.DataFrame:
+    """적용약가 로드 → 표준 컬럼명 → 제품코드별 최신 1행"""
+    with stage(report, "applied.load") as st:
+        apdf_full = read_excel_all_sheets(path, dtype=str)
+        st.rows_out = len(apdf_full)
 
     # 컬럼 매핑
     c_prod = pick(apdf_full, ["제품코드","품목기준코드","product_code"]) or "제품코드"
@@ -426,88 +426,133 @@ def main():
     apdf["제품명"]   = apdf["제품명"].map(to_text)
     apdf["주성분코드"] = apdf["주성분코드"].map(to_text)
 
-    # 최신행 선택
-    apdf_latest = choose_latest_per_code(apdf, code_col="제품코드")
-
-    # 2) 보조 매핑 선집계
-    atc_df  = aggregate_atc(read_csv_any(args.atc, dtype=str))
-    subs_df = aggregate_substances(read_csv_any(args.subs, dtype=str))
-
-    # 3) 좌조인(행수 불변)
-    base = apdf_latest.merge(atc_df, on="제품코드", how="left")
-    base = base.merge(subs_df, on="주성분코드", how="left")
+    # 최신행 선택 (+ 제품코드별 약가 이력 행수: 유의어 boost의 이력 빈도)
+    with stage(report, "applied.latest", rows_in=len(apdf)) as st:
+        latest = choose_latest_per_code(apdf, code_col="제품코드")
+        latest["이력건수"] = latest["제품코드"].map(apdf.groupby("제품코드").size()).fillna(1).astype(int)
+        st.rows_out = len(latest)
+    return latest
+
+def build_enriched(apdf_latest: pd.DataFrame, atc_df: pd.DataFrame, subs_df: pd.DataFrame,
+                   report: RunReport | None = None) -> pd.DataFrame:
+    # 좌조인(행수 불변)
+    with stage(report, "enrich.join", rows_in=len(apdf_latest)) as st:
+        base = apdf_latest.merge(atc_df, on="제품코드", how="left")
+        base = base.merge(subs_df, on="주성분코드", how="left")
+        st.rows_out = len(base)
+
+    # 정제 컬럼 생성
+    with stage(report, "enrich.normalize", rows_in=len(base)) as st:
+        base["품명_정제"]   = base["제품명"].map(extract_pumyeong)
+        parsed_comp        = base["제품명"].map(components_from_name)
+        base["성분_정제"]   = base.apply(lambda r: to_text(r.get("성분명_KO","")) if to_text(r.get("성분명_KO","")) else parsed_comp.loc[r.name], axis=1)
+        base["성분명_EN"]   = base.get("성분명_EN","").astype(str)
+        st.rows_out = len(base)
 
-    # 4) 정제 컬럼 생성
-    base["품명_정제"]   = base["제품명"].map(extract_pumyeong)
-    parsed_comp        = base["제품명"].map(components_from_name)
-    base["성분_정제"]   = base.apply(lambda r: to_text(r.get("성분명_KO","")) if to_text(r.get("성분명_KO","")) else parsed_comp.loc[r.name], axis=1)
-    base["성분명_EN"]   = base.get("성분명_EN","").astype(str)
-
-    # 5) 산출 ①: 정제된 테이블
     cols_out = ["제품코드","제품명","품명_정제","주성분코드","성분명_KO","성분명_EN","성분_정제",
-                "ATC코드","ATC코드 명칭","제형","투여경로","규격","단위","상한금액","업체명"]
+                "ATC코드","ATC코드 명칭","제형","투여경로","규격","단위","상한금액","업체명","이력건수"]
     for c in cols_out:
         if c not in base.columns: base[c] = ""
-    enriched = base[cols_out].copy()
-    write_csv(enriched, str(outdir/"01_applied_price_enriched.csv"))
-
-    # 6) 산출 ②: 유의어 사전용 정제 약제종합
-    rows = []
-    for _, r in enriched.iterrows():
-        code = to_text(r["제품코드"])
-        canonical = to_text(r["품명_정제"]) or extract_pumyeong(to_text(r["제품명"])) or to_text(r["제품명"])
-
-        surfaces = set()
-
-        def add_surface(x):
-            s = to_text(x)
-            if s and s != canonical:
-                surfaces.add(s)
-
-        # 기본/브랜드
-        add_surface(r["제품명"])
-        for ename in export_names_from_product(to_text(r["제품명"])):
-            add_surface(ename)
-
-        # 성분
-        add_surface(r.get("성분명_KO", ""))
-        add_surface(r.get("성분_정제", ""))
-        for tok in to_text(r.get("성분명_EN", "")).split("·"):
-            add_surface(tok)
-
-        # 변형판 추가
-        more = set()
-        for s in list(surfaces):
-            for v in generate_variants(s):
-                add_surface(v)
-
-        # 정렬 시 타입충돌 방지 + 안정적 정렬
-        surfaces = sorted({to_text(s) for s in surfaces if to_text(s)}, key=lambda z: z.lower())
-
-        for s in surfaces:
-            rows.append({
-                "lemma_id": code,
-                "canonical": canonical,
-                "surface": s,
-                "surface_type": "auto",
-                "source": "applied/atc/subs/parse",
-                "boost": 1,
-            })
-
-    syn_df = pd.DataFrame(rows)
-    write_csv(syn_df, str(outdir / "02_yakjejonghap_for_syn.csv"))
-
-    # 7) 산출 ③: 규칙 TXT
-    # synonyms.txt
-    syn_lines = []
+    return base[cols_out].copy()
+
+# 표면형 출처(앞일수록 우선: 같은 lemma에 여러 출처로 들어오면 앞의 것 하나만) + 출처별 기본 가중치
+SURFACE_TYPES = ("product_name", "export_name", "ingredient", "ingredient_en", "variant")
+TYPE_WEIGHT = {"product_name": 1.0, "export_name": 0.9, "ingredient": 0.6, "ingredient_en": 0.5, "variant": 0.4}
+VARIANT_BUDGET = 32    # lemma 하나의 변형 표면형 상한
+SYN_COLS = ["lemma_id", "canonical", "surface", "surface_type", "source", "boost",
+            "n_products", "n_companies", "history_rows"]
+
+def surface_boost(surface_type: pd.Series, n_products: pd.Series, n_companies: pd.Series,
+                  history_rows: pd.Series) -> pd.Series:
+    """출처 가중치 × 특이도(공유 업체/제품 수가 많을수록↓) × 이력 빈도(제품당 평균 약가 이력 행수↑)"""
+    spec = 1.0 / ((1.0 + np.log2(n_companies)) * (1.0 + 0.5 * np.log2(n_products)))
+    hist = 1.0 + 0.1 * np.log2((history_rows / n_products).clip(lower=1.0))
+    return (surface_type.map(TYPE_WEIGHT) * spec * hist).clip(0.01, 2.0).round(4)
+
+def build_syn_rows(enriched: pd.DataFrame) -> pd.DataFrame:
+    """유의어 사전용 정제 약제종합(lemma_id × surface) — 출처/공유도/이력 기반 boost를 한 번에 계산"""
+    e = enriched.reset_index(drop=True)
+    n = len(e)
+    col = lambda c: e[c].map(to_text) if c in e else pd.Series([""] * n)
+    name = col("제품명")
+    canonical = col("품명_정제")
+    fallback = name.map(extract_pumyeong)
+    canonical = canonical.where(canonical != "", fallback.where(fallback != "", name))
+    base = pd.DataFrame({"_row": range(n), "lemma_id": col("제품코드"), "canonical": canonical})
+
+    parts = []
+    def add(values: pd.Series, typ: str):
+        t = base.assign(surface=values.to_numpy(), surface_type=typ)
+        parts.append(t.explode("surface") if values.map(type).eq(list).any() else t)
+    # 기본/브랜드 · 수출명 · 성분(KO/정제는 통째, EN은 `·` 토큰)
+    add(name, "product_name")
+    add(name.map(export_names_from_product), "export_name")
+    add(col("성분명_KO"), "ingredient")
+    add(col("성분_정제"), "ingredient")
+    add(col("성분명_EN").str.split("·"), "ingredient_en")
+    direct = pd.concat(parts, ignore_index=True)
+    direct["surface"] = direct["surface"].map(to_text)
+    direct = direct[(direct["surface"] != "") & (direct["surface"] != direct["canonical"])]
+
+    # 변형판(1단계): lemma마다 VARIANT_BUDGET개까지만 지연 생성(대표형과 같은 변형은 엔진에서 제외)
+    by_row = {}
+    for row, x in zip(direct["_row"], direct["surface"]):   # 출처 우선순위 순서 유지
+        by_row.setdefault(row, []).append(x)
+    var_rows, var_surf = [], []
+    for row, surfs in by_row.items():
+        budget, canon = Budget(VARIANT_BUDGET), (canonical.iat[row],)
+        for x in surfs:
+            for v in iter_variants(x, "bundle", exclude=canon, budget=budget):
+                var_rows.append(row); var_surf.append(v)
+    var = base.iloc[var_rows].assign(surface=[to_text(v) for v in var_surf], surface_type="variant")
+    var = var[var["surface"] != ""]
+
+    rows = pd.concat([direct, var], ignore_index=True)
+    rows["_prio"] = rows["surface_type"].map(SURFACE_TYPES.index)
+    rows = rows.sort_values(["_row", "_prio"], kind="mergesort").drop_duplicates(["_row", "surface"])
+
+    # 공유도/이력: surface_key 단위로 제품 수, 업체 수, 약가 이력 행수 합
+    rows["_key"] = rows["surface"].map(surface_key)
+    rows["_company"] = col("업체명").to_numpy()[rows["_row"].to_numpy()]
+    rows["_company"] = rows["_company"].mask(rows["_company"] == "")   # 빈 업체명은 업체로 세지 않음
+    rows["_hist"] = pd.to_numeric(col("이력건수"), errors="coerce").fillna(1).to_numpy()[rows["_row"].to_numpy()]
+    g = rows.groupby("_key")
+    rows["n_products"] = g["lemma_id"].transform("nunique").astype(int)
+    rows["n_companies"] = g["_company"].transform("nunique").clip(lower=1).astype(int)
+    per_lemma = rows.drop_duplicates(["_key", "lemma_id"])
+    rows["history_rows"] = rows["_key"].map(per_lemma.groupby("_key")["_hist"].sum()).astype(int)
+    rows["boost"] = surface_boost(rows["surface_type"], rows["n_products"], rows["n_companies"], rows["history_rows"])
+    rows["source"] = "applied/atc/subs/parse"
+
+    # lemma 순서 유지, lemma 안에서는 소문자 기준 정렬(동률은 원문)
+    rows["_lower"] = rows["surface"].str.lower()
+    rows = rows.sort_values(["_row", "_lower", "surface"], kind="mergesort")
+    return rows[SYN_COLS].reset_index(drop=True)
+
+def write_rules(enriched: pd.DataFrame, syn_df: pd.DataFrame, outdir: Path):
+    # synonyms.txt — lemma_id별 한 줄, 이전 빌드와 diff(03_rules_synonyms.txt.diff.json)
+    syn_lines = {}
     for code, g in syn_df.groupby("lemma_id"):
         canonical = to_text(g["canonical"].iloc[0])
         surfs = sorted({to_text(s) for s in g["surface"].tolist() if to_text(s) and to_text(s) != canonical},
                        key=lambda z: z.lower())
         if not canonical or not surfs:
             continue
-        syn_lines.append(f"{canonical} => {', '.join(surfs)}")
-    Path(outdir / "03_rules_synonyms.txt").write_text("\n".join(syn_lines), encoding="utf-8")
+        syn_lines[code] = f"{canonical} => {', '.join(surfs)}"
+    diff = write_rules_incremental(outdir / "03_rules_synonyms.txt", syn_lines)
+    print(f"[OK] 03_rules_synonyms: {diff_summary(diff)}")
+
+    # 가중치 판: delimited_payload 형식(`표면형|boost`) — 랭킹을 색인 쪽 payload로 처리
+    w = syn_df[["lemma_id", "canonical", "surface", "boost"]].copy()
+    w["canonical"] = w["canonical"].map(to_text)
+    w["surface"] = w["surface"].map(to_text)
+    w = w[(w["surface"] != "") & (w["canonical"] != "") & (w["surface"] != w["canonical"])]
+    w = w.drop_duplicates(["lemma_id", "surface"])
+    w = w.assign(_lower=w["surface"].str.lower()).sort_values(["lemma_id", "_lower"], kind="mergesort")
+    w["item"] = w["surface"] + "|" + w["boost"].map(lambda b: f"{b:g}")
+    g = w.groupby("lemma_id", sort=True).agg(canonical=("canonical", "first"), items=("item", ", ".join))
+    w_lines = (g["canonical"] + " => " + g["items"]).tolist()
+    Path(outdir / "03_rules_synonyms_weighted.txt").write_text("\n".join(w_lines), encoding="utf-8")
 
     # proper nouns (canonical + surface 전부)
     pn = set()
@@ -529,14 +574,154 @@ def main():
     pn_lines = [f"{w}\tNNP" for w in sorted(pn, key=lambda z: z.lower())]
     Path(outdir / "03_rules_proper_nouns.txt").write_text("\n".join(pn_lines), encoding="utf-8")
 
-    # 8) 간단 QA 출력
+def read_enriched(path) -> pd.DataFrame:
+    """01 산출물 재로드(빈칸은 빈 문자열 그대로)"""
+    return pd.read_csv(path, dtype=str, encoding="utf-8-sig", keep_default_na=False, na_values=[])
+
+# ---------------- main pipeline ----------------
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--applied", default=r"C:\Jimin\pharmaLex_unity\data\20220901_20250901 적용약가파일_8.28.수정.xlsx")
+    ap.add_argument("--atc",     default=r"C:\Jimin\pharmaLex_unity\data\건강보험심사평가원_ATC코드 매핑 목록_20240630.csv")
+    ap.add_argument("--subs",    default=r"C:\Jimin\pharmaLex_unity\data\건강보험심사평가원_약가마스터_의약품주성분_20241014.csv")
+    ap.add_argument("--outdir",  default=r".\out")
+    ap.add_argument("--force",   action="store_true", help="manifest 무시하고 전체 재빌드")
+    ap.add_argument("--conflict-policy", choices=POLICIES, default="report",
+                    help="여러 대표명에 걸린 표면형 처리: report(보고서만) / drop / downboost")
+    ap.add_argument("--conflict-max-fanout", type=int, default=20,
+                    help="drop/downboost 기준: 서로 다른 대표명 수가 이 값을 넘는 표면형")
+    args = ap.parse_args()
+
+    outdir = Path(args.outdir); outdir.mkdir(parents=True, exist_ok=True)
+    cache = outdir / ".cache"; cache.mkdir(parents=True, exist_ok=True)
+    rules = Path(__file__).resolve()   # 정규화 규칙 = 이 파일(코드 해시가 rule-set 버전)
+    report = RunReport("build_applied_price_bundle")
+
+    p_applied = cache / "applied_latest.pkl"
+    p_atc     = cache / "atc_agg.pkl"
+    p_subs    = cache / "subs_agg.pkl"
+    p_enr     = outdir / "01_applied_price_enriched.csv"
+    p_syn     = outdir / "02_yakjejonghap_for_syn.csv"
+    p_rules   = outdir / "03_rules_synonyms.txt"
+    p_rules_w = outdir / "03_rules_synonyms_weighted.txt"
+    p_pn      = outdir / "03_rules_proper_nouns.txt"
+    p_conf    = outdir / "04_surface_conflicts.csv"
+    p_ac      = outdir / "autocomplete.idx"
+    p_lex     = outdir / "lexicon_product.plx"
+    p_atcix   = outdir / "atc_index.plx"
+    p_comp    = outdir / "component_index.plx"
+    here      = Path(__file__).resolve().parent
+
+    # 단계 함수: 상류 결과가 ctx에 없으면(스킵된 경우) 산출물에서 다시 읽는다
+    def st_applied(ctx):
+        ctx["applied"] = load_applied_latest(args.applied, report)
+        ctx["applied"].to_pickle(p_applied)
+    def st_atc(ctx):
+        with stage(report, "atc.load") as st:
+            raw = read_csv_any(args.atc, dtype=str); st.rows_out = len(raw)
+        with stage(report, "atc.aggregate", rows_in=len(raw)) as st:
+            ctx["atc"] = aggregate_atc(raw); st.rows_out = len(ctx["atc"])
+        ctx["atc"].to_pickle(p_atc)
+    def st_subs(ctx):
+        with stage(report, "subs.load") as st:
+            raw = read_csv_any(args.subs, dtype=str); st.rows_out = len(raw)
+        with stage(report, "subs.aggregate", rows_in=len(raw)) as st:
+            ctx["subs"] = aggregate_substances(raw); st.rows_out = len(ctx["subs"])
+        ctx["subs"].to_pickle(p_subs)
+    def st_enrich(ctx):
+        with stage(report, "enrich.load_cache"):
+            apdf_latest = ctx.get("applied"); atc_df = ctx.get("atc"); subs_df = ctx.get("subs")
+            if apdf_latest is None: apdf_latest = pd.read_pickle(p_applied)
+            if atc_df is None:      atc_df = pd.read_pickle(p_atc)
+            if subs_df is None:     subs_df = pd.read_pickle(p_subs)
+        ctx["enriched"] = build_enriched(apdf_latest, atc_df, subs_df, report)
+        with stage(report, "write.01_enriched", rows_in=len(ctx["enriched"])):
+            write_csv(ctx["enriched"], str(p_enr))
+    def st_synonyms(ctx):
+        enriched = ctx.get("enriched")
+        if enriched is None: enriched = read_enriched(p_enr)
+        with stage(report, "synonyms.rows", rows_in=len(enriched)) as st:
+            syn_df = build_syn_rows(enriched); st.rows_out = len(syn_df)
+        with stage(report, "synonyms.conflicts", rows_in=len(syn_df)) as st:
+            conf = find_conflicts(syn_df)
+            write_report(conf, p_conf)
+            syn_df, n_hit = apply_policy(syn_df, conf, args.conflict_policy, args.conflict_max_fanout)
+            st.rows_out = len(syn_df)
+        print(f"[OK] surface conflicts: {len(conf):,} (policy={args.conflict_policy}, affected rows={n_hit:,})")
+        with stage(report, "write.02_syn", rows_in=len(syn_df)):
+            write_csv(syn_df, str(p_syn))
+        with stage(report, "write.03_rules", rows_in=len(syn_df)):
+            write_rules(enriched, syn_df, outdir)
+        ctx["syn_df"] = syn_df
+    def st_atc_index(ctx):
+        enriched = ctx.get("enriched")
+        if enriched is None: enriched = read_enriched(p_enr)
+        with stage(report, "write.atc_index", rows_in=len(enriched)):
+            build_atc_index(enriched, p_atcix)
+    def st_component_index(ctx):
+        enriched = ctx.get("enriched")
+        if enriched is None: enriched = read_enriched(p_enr)
+        with stage(report, "write.component_index", rows_in=len(enriched)):
+            build_component_index(enriched, p_comp)
+    def st_lexicon(ctx):
+        syn_df = ctx.get("syn_df")
+        if syn_df is None: syn_df = read_enriched(p_syn)
+        with stage(report, "write.lexicon", rows_in=len(syn_df)):
+            lex = LexiconBuilder()
+            lex.add_syn_rows(syn_df)
+            lex.write(p_lex)
+    def st_autocomplete(ctx):
+        enriched = ctx.get("enriched")
+        if enriched is None: enriched = read_enriched(p_enr)
+        with stage(report, "write.autocomplete", rows_in=len(enriched)):
+            build_autocomplete(enriched, p_ac)
+
+    # ATC CSV만 바뀌면 atc → enrich → synonyms만 다시 돈다(applied/subs 스킵)
+    graph = BuildGraph(outdir / ".build_manifest.json", force=args.force)
+    graph.add("applied_latest", st_applied, inputs=[args.applied, rules], outputs=[p_applied])
+    graph.add("atc_aggregate",  st_atc,     inputs=[args.atc, rules],     outputs=[p_atc])
+    graph.add("subs_aggregate", st_subs,    inputs=[args.subs, rules],    outputs=[p_subs])
+    graph.add("enrich",   st_enrich,   inputs=[p_applied, p_atc, p_subs, rules], outputs=[p_enr],
+              deps=["applied_latest", "atc_aggregate", "subs_aggregate"])
+    graph.add("synonyms", st_synonyms,
+              inputs=[p_enr, rules, here / "synonym_diff.py", here / "surface_conflicts.py", here / "variants.py",
+                      here / "utils_kor.py"],
+              outputs=[p_syn, p_rules, p_rules_w, p_pn, state_path(p_rules), diff_path(p_rules), p_conf],
+              params={"conflict_policy": args.conflict_policy, "conflict_max_fanout": args.conflict_max_fanout},
+              deps=["enrich"])
+    graph.add("autocomplete", st_autocomplete,
+              inputs=[p_enr, here / "autocomplete.py", here / "mmap_store.py", here / "utils_kor.py"],
+              outputs=[p_ac], deps=["enrich"])
+    graph.add("atc_index", st_atc_index,
+              inputs=[p_enr, here / "atc_index.py", here / "mmap_store.py"],
+              outputs=[p_atcix], deps=["enrich"])
+    graph.add("component_index", st_component_index,
+              inputs=[p_enr, here / "component_index.py", here / "mmap_store.py", here / "utils_kor.py"],
+              outputs=[p_comp], deps=["enrich"])
+    graph.add("lexicon", st_lexicon,
+              inputs=[p_syn, here / "compiled_lexicon.py", here / "mmap_store.py", here / "utils_kor.py"],
+              outputs=[p_lex], deps=["synonyms"])
+    ctx = {}
+    graph.run(ctx)
+
+    # 간단 QA 출력
+    enriched = ctx.get("enriched")
+    if enriched is None: enriched = read_enriched(p_enr)
     n_codes = enriched["제품코드"].nunique()
     print(f"[OK] enriched rows: {len(enriched):,} (unique 제품코드={n_codes:,})")
     print(f"[OK] files saved in: {outdir.resolve()}")
     print(" - 01_applied_price_enriched.csv")
     print(" - 02_yakjejonghap_for_syn.csv")
-    print(" - 03_rules_synonyms.txt")
+    print(" - 03_rules_synonyms.txt (+ .state.json / .diff.json)")
+    print(" - 03_rules_synonyms_weighted.txt")
     print(" - 03_rules_proper_nouns.txt")
+    print(" - 04_surface_conflicts.csv")
+    print(" - autocomplete.idx")
+    print(" - lexicon_product.plx")
+    print(" - atc_index.plx")
+    print(" - component_index.plx")
+    report.print_summary()
+    report.write_json(outdir / "run_report_bundle.json")
 
 if __name__ == "__main__":
     main()
@@ -2,18 +2,19 @@
 # build_class_maps.py
 import argparse
 from pathlib import Path
-import pandas as pd
-from utils_kor import ensure_dir, read_korean_csv
+from utils_kor import ensure_dir, read_korean_csv, load_hira_list
 
-def build_class_maps(list_xlsx, submaster_csv, out_dir):
+def build_class_maps(list_xlsx, submaster_csv, out_dir, df_list=None, df_subm=None):
+    """df_list/df_subm를 넘기면 파일을 다시 읽지 않는다(run_all 공유 로드, 읽기 전용으로만 사용)"""
     out_dir = ensure_dir(out_dir)
 
     # 1) 로드
-    df_list = pd.read_excel(list_xlsx, dtype=str).rename(columns=lambda c: c.strip())
-    df_list['제품코드'] = df_list['제품코드'].astype(str).str.replace(r'\D','', regex=True)
-    df_list = df_list[df_list['제품코드'].str.len()==9].copy()
+    if df_list is None:
+        df_list = load_hira_list(list_xlsx)
 
-    df_subm = read_korean_csv(submaster_csv).rename(columns=lambda c: c.strip())
+    if df_subm is None:
+        df_subm = read_korean_csv(submaster_csv)
+    df_subm = df_subm.rename(columns=lambda c: c.strip())
     # 표준 컬럼명으로 치환
     colmap = {}
     if '일반명코드' in df_subm.columns: colmap['일반명코드'] = '주성분코드'
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+build_graph.py — 콘텐츠 해시 기반 증분 빌드 그래프
+
+각 단계(Stage)는 입력(원천 파일, 규칙 코드 .py, 이전 단계 산출물)과 파라미터(CLI 옵션 등),
+산출물 경로를 선언한다. 실행 후 입력 해시로 만든 key와 산출물 해시를 manifest(JSON)에
+기록하고, 다음 실행 때 key가 같고 산출물이 그대로면 해당 단계를 건너뛴다.
+
+  - 이전 단계 산출물도 '입력 파일'로 선언 → 상류가 다시 돌아도 결과가 같으면 하류는 스킵
+  - 규칙 변경은 규칙이 들어 있는 .py 파일을 입력으로 넣어서 감지(rule-set 버전 = 코드 해시)
+  - 파일 해시는 (size, mtime_ns)가 같으면 manifest에 저장된 값을 재사용(대용량 xlsx 재해시 방지)
+
+사용 예:
+  g = BuildGraph(out_dir / ".build_manifest.json", force=args.force)
+  g.add("atc", stage_atc, inputs=[atc_csv, __file__], outputs=[cache/"atc.pkl"])
+  g.add("enrich", stage_enrich, inputs=[cache/"atc.pkl", ...], outputs=[...], deps=["atc"])
+  g.run()
+"""
+
+import json, hashlib
+from pathlib import Path
+
+MANIFEST_VERSION = 1
+
+def file_sha256(path, chunk: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            b = f.read(chunk)
+            if not b:
+                break
+            h.update(b)
+    return h.hexdigest()
+
+class Stage:
+    def __init__(self, name, fn, inputs=(), outputs=(), params=None, deps=()):
+        self.name = name
+        self.fn = fn
+        self.inputs = [Path(p) for p in inputs]
+        self.outputs = [Path(p) for p in outputs]
+        self.params = dict(params or {})
+        self.deps = list(deps)
+
+class BuildGraph:
+    def __init__(self, manifest_path, force: bool = False):
+        self.manifest_path = Path(manifest_path)
+        self.force = force
+        self.stages: list[Stage] = []
+        self._by_name: dict[str, Stage] = {}
+        self.manifest = {"version": MANIFEST_VERSION, "files": {}, "stages": {}}
+        if self.manifest_path.exists():
+            try:
+                m = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+                if m.get("version") == MANIFEST_VERSION:
+                    self.manifest = m
+            except (OSError, ValueError):
+                pass   # 손상된 manifest → 전체 재빌드
+
+    # ---------- 등록 ----------
+    def add(self, name, fn, inputs=(), outputs=(), params=None, deps=()) -> Stage:
+        if name in self._by_name:
+            raise ValueError(f"duplicate stage: {name}")
+        for d in deps:
+            if d not in self._by_name:
+                raise ValueError(f"stage '{name}' depends on unknown/later stage '{d}'")
+        st = Stage(name, fn, inputs, outputs, params, deps)
+        self.stages.append(st)
+        self._by_name[name] = st
+        return st
+
+    # ---------- 해시 ----------
+    def hash_file(self, path: Path) -> str | None:
+        path = Path(path)
+        if not path.exists():
+            return None
+        stt = path.stat()
+        key = str(path.resolve())
+        memo = self.manifest["files"].get(key)
+        if memo and memo["size"] == stt.st_size and memo["mtime_ns"] == stt.st_mtime_ns:
+            return memo["sha256"]
+        digest = file_sha256(path)
+        self.manifest["files"][key] = {"size": stt.st_size, "mtime_ns": stt.st_mtime_ns, "sha256": digest}
+        return digest
+
+    def stage_key(self, st: Stage) -> str:
+        payload = {
+            "params": st.params,
+            "inputs": {str(p.resolve()): self.hash_file(p) for p in st.inputs},
+            "outputs": sorted(str(p.resolve()) for p in st.outputs),
+        }
+        blob = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    # ---------- 판정/기록 ----------
+    def is_stale(self, st: Stage, ran: set | None = None) -> bool:
+        """force / 기록 없음 / 입력 변경 / 산출물 누락·변조 / 상류가 이번 실행에서 바뀜"""
+        if self.force:
+            return True
+        rec = self.manifest["stages"].get(st.name)
+        if not rec or rec.get("key") != self.stage_key(st):
+            return True
+        for p in st.outputs:
+            if rec.get("outputs", {}).get(str(p.resolve())) != self.hash_file(p):
+                return True
+        # 상류 산출물이 입력으로 선언되지 않은 경우(메모리 전달)까지 보수적으로 처리
+        if ran:
+            undeclared = [d for d in st.deps if d in ran and not
+                          set(self._by_name[d].outputs) & set(st.inputs)]
+            if undeclared:
+                return True
+        return False
+
+    def record(self, st: Stage):
+        self.manifest["stages"][st.name] = {
+            "key": self.stage_key(st),
+            "outputs": {str(p.resolve()): self.hash_file(p) for p in st.outputs},
+        }
+        self.save()
+
+    def save(self):
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.manifest_path.with_suffix(self.manifest_path.suffix + ".tmp")
+        tmp.write_text(json.dumps(self.manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+        tmp.replace(self.manifest_path)
+
+    # ---------- 실행 ----------
+    def run(self, ctx: dict | None = None) -> dict:
+        """등록 순서대로 실행(상류 먼저 등록). 반환: {stage: 'ran'|'skipped'}"""
+        ctx = {} if ctx is None else ctx
+        status, ran = {}, set()
+        for st in self.stages:
+            if self.is_stale(st, ran):
+                print(f"[RUN] {st.name}")
+                st.fn(ctx)
+                self.record(st)
+                status[st.name] = "ran"
+                ran.add(st.name)
+            else:
+                print(f"[SKIP] {st.name} (입력 변경 없음)")
+                status[st.name] = "skipped"
+        return status
@@ -16,6 +16,7 @@ build_snapshot_yakje.py
 출력:
   --out-csv   CSV
   --out-xlsx  XLSX (검수용)
+  --out-atc-index  ATC 계층 인덱스 .plx (선택, atc_index.py로 조회)
 
 사용 예:
   python build_snapshot_yakje.py \
@@ -28,6 +29,9 @@ build_snapshot_yakje.py
 import re, csv, argparse, pandas as pd
 from pathlib import Path
 
+from run_report import RunReport
+from atc_index import build_atc_index
+
 # ---------- 텍스트 정규화(괄호/단위/포장/비율 처리) ----------
 BRMAP = str.maketrans({
     "（":"(", "［":"(", "｛":"(", "{":"(", "[":"(", "【":"(", "〔":"(",
@@ -193,14 +197,19 @@ def main():
     ap.add_argument("--atc", required=True, help="ATC 매핑 csv (cp949 등)")
     ap.add_argument("--out-csv", required=True)
     ap.add_argument("--out-xlsx", required=True)
+    ap.add_argument("--out-atc-index", default="", help="ATC 계층 인덱스(.plx) 저장 경로(선택)")
     args=ap.parse_args()
+    report=RunReport("build_snapshot_yakje")
 
     # 1) 스냅샷 로드 + 헤더/품목 분리 + 헤더 전파
+    rec=report.start("load.snapshot")
     snap = pd.read_excel(args.snapshot, dtype=str)
+    report.finish(rec, rows_out=len(snap))
     needed = ["연번","투여","분류","주성분코드","제품코드","제품명","업체명","규격","단위","상한금액","전일","비고"]
     for c in needed:
         if c not in snap.columns:
             raise SystemExit(f"[ERR] 스냅샷에 '{c}' 컬럼 없음. 실제: {list(snap.columns)}")
+    rec=report.start("header_propagation", rows_in=len(snap))
     rows=[]; ctx=None
     for _,r in snap.iterrows():
         code=str(r["제품코드"])
@@ -212,11 +221,13 @@ def main():
             # 헤더 갱신
             ctx = norm_spaces(unify_brackets(code))
     snap2 = pd.DataFrame(rows)
+    report.finish(rec, rows_out=len(snap2))
     # 기대 행수 체크(파일명 표기와 일치해야 함)
     print(f"[INFO] snapshot parsed → {len(snap2):,} rows (품목)")
 
     # 2) ATC 매핑(제품코드 조인, 중복은 병합)
     # 인코딩 탐색
+    rec=report.start("load.atc")
     atc=None
     for enc in ("utf-8-sig","cp949","euc-kr","utf-16","latin1"):
         try:
@@ -229,30 +240,38 @@ def main():
     for c in ["제품코드","ATC코드","ATC코드 명칭"]:
         if c not in atc.columns:
             raise SystemExit(f"[ERR] ATC csv '{c}' 없음. 실제: {list(atc.columns)}")
+    report.finish(rec, rows_out=len(atc))
 
+    rec=report.start("atc.aggregate_join", rows_in=len(atc))
     atc_g = atc.groupby("제품코드", as_index=False).agg({
         "ATC코드": merge_tokens,
         "ATC코드 명칭": merge_tokens
     })
     df = snap2.merge(atc_g, on="제품코드", how="left")
+    report.finish(rec, rows_out=len(df))
 
     # 3) 텍스트 정제(품명/성분)
+    rec=report.start("normalize", rows_in=len(df))
     df["품명_정제"] = df["제품명"].fillna("").map(extract_pumyeong)
     # 성분은 제품명 기반 + (비었을 때) 헤더 컨텍스트에서 보강
     comp_from_name = df["제품명"].fillna("").map(components_from_name)
     comp_from_hdr  = df["header_ctx"].fillna("").map(components_from_name)
     df["성분_정제"] = comp_from_name
     df.loc[df["성분_정제"].eq(""), "성분_정제"] = comp_from_hdr
+    report.finish(rec, rows_out=len(df))
 
     # 4) 품목별 단일행 보장(혹시라도 ATC 조인에서 중복이 생겼을 때 안전장치)
+    rec=report.start("dedupe", rows_in=len(df))
     df = df.groupby("제품코드", as_index=False).agg({
         "연번":"first","투여":"first","분류":"first","주성분코드":"first","제품명":"first",
         "업체명":"first","규격":"first","단위":"first","상한금액":"first","전일":"first","비고":"first","header_ctx":"first",
         "ATC코드":merge_tokens,"ATC코드 명칭":merge_tokens,
         "품명_정제":"first","성분_정제":merge_tokens
     })
+    report.finish(rec, rows_out=len(df))
 
     # 5) QA
+    rec=report.start("qa", rows_in=len(df))
     def has_num_unit(s):
         return bool(re.search(rf'\d+(?:\.\d+)?\s*{unit_regex()}', str(s) or "", flags=re.IGNORECASE))
     bad_pum = df["품명_정제"].map(has_num_unit).sum()
@@ -260,17 +279,29 @@ def main():
     empty_name = df["제품명"].isna().sum() + (df["제품명"].astype(str).str.strip()=="").sum()
 
     print(f"[QA] 최종 행수: {len(df):,} (스냅샷 품목 기대와 같아야 함)")
+    report.finish(rec)
     print(f"[QA] 제품명 빈값: {empty_name:,}  | 품명_정제에 숫자+단위 잔존: {bad_pum:,}  | 성분_정제에 숫자+단위 잔존: {bad_comp:,}")
 
     # 6) 저장
     out_csv, out_xlsx = Path(args.out_csv), Path(args.out_xlsx)
     out_csv.parent.mkdir(parents=True, exist_ok=True)
+    rec=report.start("write.csv", rows_in=len(df))
     df.to_csv(out_csv, index=False, encoding="utf-8-sig", quoting=csv.QUOTE_ALL)
+    report.finish(rec)
+    rec=report.start("write.xlsx", rows_in=len(df))
     try:
         with pd.ExcelWriter(out_xlsx, engine="openpyxl") as w:
             df.astype(str).to_excel(w, index=False, sheet_name="snapshot")
         print(f"[OK] saved → {out_csv} / {out_xlsx}")
     except Exception as e:
         print(f"[OK] saved → {out_csv}  | [WARN] XLSX 실패: {e} (pip install openpyxl)")
+    report.finish(rec)
+    if args.out_atc_index:
+        rec=report.start("write.atc_index", rows_in=len(df))
+        build_atc_index(df, args.out_atc_index)
+        report.finish(rec)
+        print(f"[OK] atc index → {args.out_atc_index}")
+    report.print_summary()
+    report.write_json(out_csv.with_name(out_csv.stem + ".run_report.json"))
 if __name__=="__main__":
     main()
@@ -1,21 +1,31 @@
 # -*- coding: utf-8 -*-
 # build_synonyms.py
+#  - 주성분 클러스터 간 공유 표면형(충돌)은 surface_conflicts_substance.csv로 보고하고,
+#    --conflict-policy drop이면 서로 다른 대표명이 --conflict-max-fanout개를 넘는 표면형을
+#    모든 산출물(CSV/JSONL, opensearch 규칙, lexicon)의 유의어에서 뺀다.
+#    downboost는 번들(02/03_weighted)처럼 가중치 컬럼이 있는 산출물용이라 여기서는 보고서만 쓴다.
 import argparse, json, re
 from collections import defaultdict, Counter
 from pathlib import Path
 import pandas as pd
 
-from utils_kor import ensure_dir, read_korean_csv, norm_text, extract_paren_terms_refined
+from utils_kor import ensure_dir, read_korean_csv, load_hira_list, norm_text, extract_paren_terms_refined
+from compiled_lexicon import LexiconBuilder
+from synonym_diff import write_rules_incremental, summary as diff_summary
+from surface_conflicts import find_conflicts, apply_policy, write_report, POLICIES
 
-def build_synonyms(list_xlsx, atc_csv, out_dir):
+def build_synonyms(list_xlsx, atc_csv, out_dir, df_list=None, df_atc=None,
+                   conflict_policy="report", conflict_max_fanout=20):
+    """df_list/df_atc를 넘기면 파일을 다시 읽지 않는다(run_all 공유 로드, 읽기 전용으로만 사용)"""
     out_dir = ensure_dir(out_dir)
 
     # 1) 로드
-    df_list = pd.read_excel(list_xlsx, dtype=str).rename(columns=lambda c: c.strip())
-    df_list['제품코드'] = df_list['제품코드'].astype(str).str.replace(r'\D','', regex=True)
-    df_list = df_list[df_list['제품코드'].str.len()==9].copy()
+    if df_list is None:
+        df_list = load_hira_list(list_xlsx)
 
-    df_atc = read_korean_csv(atc_csv).rename(columns=lambda c: c.strip())
+    if df_atc is None:
+        df_atc = read_korean_csv(atc_csv)
+    df_atc = df_atc.rename(columns=lambda c: c.strip())
     atc_small = df_atc[['제품코드','ATC코드','ATC코드 명칭']].dropna().astype(str).drop_duplicates()
 
     # 2) 결합 (제품코드 기준)
@@ -79,6 +89,28 @@ def build_synonyms(list_xlsx, atc_csv, out_dir):
 
     syn_df = pd.DataFrame(records).sort_values(by=['preferred_label_ko','preferred_label_en','substance_code'])
 
+    # 4-1) 주성분 클러스터 간 공유 표면형(충돌) 보고서 + 정책 적용(drop이면 이후 모든 산출물에서 제외)
+    sub_rows = syn_df[['substance_code','preferred_label_ko','preferred_label_en','synonyms']].explode('synonyms')
+    sub_rows = pd.DataFrame({
+        'lemma_id': sub_rows['substance_code'],
+        'canonical': sub_rows['preferred_label_ko'].where(sub_rows['preferred_label_ko'].fillna('').astype(str) != '',
+                                                         sub_rows['preferred_label_en']),
+        'surface': sub_rows['synonyms'],
+    }).dropna(subset=['surface'])
+    conf = find_conflicts(sub_rows)
+    write_report(conf, Path(out_dir)/"surface_conflicts_substance.csv")
+    n_hit = 0
+    if conflict_policy == "drop":
+        kept, n_hit = apply_policy(sub_rows, conf, "drop", conflict_max_fanout)
+        kept = set(zip(kept['lemma_id'], kept['surface']))
+        before = syn_df['synonyms'].map(len)
+        syn_df['synonyms'] = [[x for x in L if (code, x) in kept]
+                              for code, L in zip(syn_df['substance_code'], syn_df['synonyms'])]
+        syn_df['synonym_count'] = syn_df['synonym_count'] - (before - syn_df['synonyms'].map(len))
+    elif conflict_policy == "downboost":
+        print("[SKIP] conflict policy downboost: 주성분 산출물에는 가중치가 없어 보고서만 기록")
+    print(f"[OK] surface conflicts(substance): {len(conf):,} (policy={conflict_policy}, affected rows={n_hit:,})")
+
     # 5) 산출물
     # 5-1) 마스터 CSV/JSONL
     out_csv  = Path(out_dir) / "synonyms_by_substance_code.csv"
@@ -102,7 +134,8 @@ def build_synonyms(list_xlsx, atc_csv, out_dir):
     def pick_canonical(row):
         return row["preferred_label_ko"] or row["preferred_label_en"]
 
-    lines = []
+    # 주성분코드별 한 줄 → 코드 순 안정 정렬 + 이전 빌드와 diff(.state.json/.diff.json)
+    lines = {}
     for _, row in syn_df.iterrows():
         canon = pick_canonical(row)
         if not canon:
@@ -110,11 +143,10 @@ def build_synonyms(list_xlsx, atc_csv, out_dir):
         syns = [s for s in set(row["synonyms"]) if s and s != canon]
         if not syns:
             continue
-        line = ", ".join(sorted(syns)[:50]) + " => " + canon
-        lines.append(line)
+        lines[row["substance_code"]] = ", ".join(sorted(syns)[:50]) + " => " + canon
 
-    with open(Path(out_dir)/"opensearch_synonyms_substance.txt","w",encoding="utf-8") as f:
-        f.write("\n".join(lines))
+    diff = write_rules_incremental(Path(out_dir)/"opensearch_synonyms_substance.txt", lines)
+    print(f"[OK] opensearch_synonyms_substance: {diff_summary(diff)}")
 
     # 5-3) 고유명사 사전(표면형)
     unique_terms = set()
@@ -140,6 +172,19 @@ def build_synonyms(list_xlsx, atc_csv, out_dir):
     atc_map = atc_small.drop_duplicates()
     atc_map.to_csv(Path(out_dir)/"code_to_label_atc.csv", index=False, encoding="utf-8-sig")
 
+    # 5-5) 컴파일된 사전(mmap 로드용): 주성분코드/제품코드/ATC코드 ↔ 표면형
+    lex = LexiconBuilder()
+    for row in syn_df.itertuples(index=False):
+        lex.add(row.substance_code, "substance", row.preferred_label_ko, label=True)   # 빈 값이면 영문이 대표
+        lex.add(row.substance_code, "substance", row.preferred_label_en, label=True)
+        for s in row.synonyms:
+            lex.add(row.substance_code, "substance", s)
+    for code, name in prod_map[['제품코드','제품명']].itertuples(index=False):
+        lex.add(code, "product", name, label=True)
+    for code, name in atc_map[['ATC코드','ATC코드 명칭']].itertuples(index=False):
+        lex.add(code, "atc", name, label=True)
+    lex.write(Path(out_dir)/"lexicon_substance.plx")
+
     # 콘솔 요약
     print(f"[OK] clusters(substance): {syn_df['substance_code'].nunique():,}")
     print(f"[OK] outputs @ {out_dir}")
@@ -149,5 +194,10 @@ if __name__ == "__main__":
     ap.add_argument("--list_xlsx", required=True, help="HIRA 9자리 제품코드 포함 약제목록 엑셀")
     ap.add_argument("--atc_csv",   required=True, help="ATC 매핑 CSV (제품코드, ATC코드, ATC코드 명칭)")
     ap.add_argument("--out_dir",   default="out", help="결과물 저장 폴더")
+    ap.add_argument("--conflict-policy", choices=POLICIES, default="report",
+                    help="여러 대표명에 걸린 표면형 처리: report(보고서만) / drop / downboost(여기서는 보고서만)")
+    ap.add_argument("--conflict-max-fanout", type=int, default=20,
+                    help="drop 기준: 서로 다른 대표명 수가 이 값을 넘는 표면형")
     args = ap.parse_args()
-    build_synonyms(args.list_xlsx, args.atc_csv, args.out_dir)
+    build_synonyms(args.list_xlsx, args.atc_csv, args.out_dir,
+                   conflict_policy=args.conflict_policy, conflict_max_fanout=args.conflict_max_fanout)
@@ -19,6 +19,8 @@ import pandas as pd
 from pathlib import Path
 from collections import Counter
 
+from run_report import RunReport
+
 # ---------- 유틸: 안전 로더 ----------
 def read_smart(path, dtype=str):
     p=str(path)
@@ -243,15 +245,19 @@ def main():
     args=ap.parse_args()
 
     keep_percent=args.keep_percent
+    report=RunReport("build_yakje_total")
 
     # 0) 읽기
+    rec=report.start("load")
     dfs=[]
     if args.src_master: dfs.append(("master", read_smart(args.src_master)))
     if args.src_price:  dfs.append(("price",  read_smart(args.src_price)))
     if args.src_prod:   dfs.append(("prod",   read_smart(args.src_prod)))
     if not dfs: raise SystemExit("[ERR] 최소 하나의 소스가 필요합니다.")
+    report.finish(rec, rows_out=sum(len(df) for _,df in dfs))
 
     # 1) 표준 스키마 변환
+    rec=report.start("standardize", rows_in=sum(len(df) for _,df in dfs))
     rows_before=0
     buckets=[]
     for tag,df in dfs:
@@ -290,8 +296,10 @@ def main():
         base[col]=base[col].astype(str).fillna("").map(lambda x: norm_spaces(unify_brackets(x)))
     # item_code가 비면 product_code로 대체(최소 하나는 갖게)
     base["item_code"] = base.apply(lambda r: r["item_code"] if not is_blank(r["item_code"]) else r["product_code"], axis=1)
+    report.finish(rec, rows_out=len(base))
 
     # 3) 제품명 보강(display_name + 출처 라벨)
+    rec=report.start("display_name", rows_in=len(base))
     def derive_display(r):
         # ① 소스에서 제품명
         for s in ["master","price","prod"]:
@@ -330,8 +338,10 @@ def main():
 
     picked = base.groupby("item_code", dropna=False).apply(lambda g: pd.Series(group_pick_name(g), index=["display_name","name_source"])).reset_index()
     base = base.merge(picked, on="item_code", how="left")
+    report.finish(rec, rows_out=len(picked))
 
     # 4) 최종 표기명: display_name이 비면 BLOCK → 보고
+    rec=report.start("normalize", rows_in=len(base))
     base["display_name"] = base["display_name"].fillna("")
     # 품명_정제/성분/영문 성분 생성(대표행 기준으로)
     rep = base.groupby("item_code", as_index=False).agg({
@@ -353,8 +363,10 @@ def main():
     rep = rep.merge(gen_rep, on="substance_code", how="left")
     rep["성분_정제"] = rep.apply(lambda r: (r["성분_정제"] if r["성분_정제"] else r["gen_norm"]), axis=1).fillna("")
     rep.drop(columns=["gen_norm"], inplace=True)
+    report.finish(rec, rows_out=len(rep))
 
     # 티씰류 다성분 병합: group-by 인자 사용
+    rec=report.start("group_merge", rows_in=len(rep))
     key = args.group_by or "품목기준코드"
     if key not in rep.columns:
         # key가 item_code 별칭인 경우 맞추기
@@ -378,6 +390,7 @@ def main():
         "품명_정제":"first", "성분_정제":merge_tokens, "성분_EN":merge_tokens,
         "product_name_raw":"first","general_name_raw":"first"
     })
+    report.finish(rec, rows_out=len(rep2))
 
     # QA
     outdir=Path(args.out_csv).parent
@@ -387,10 +400,11 @@ def main():
     missing.to_csv(outdir/"QA_missing_display_name.csv", index=False, encoding="utf-8-sig")
     # 행수 검증
     print(f"[QA] 입력 총행수(소스 합): {rows_before:,}  | 통합 후: {len(rep2):,}")
-    if args.expect-rows and len(rep2)!=args.expect_rows:
+    if args.expect_rows and len(rep2)!=args.expect_rows:
         print(f"[WARN] 출력 행수 {len(rep2):,} != 기대 {args.expect_rows:,}")
 
     # 저장
+    rec=report.start("write", rows_in=len(rep2))
     rep2.to_csv(args.out_csv, index=False, encoding="utf-8-sig", quoting=csv.QUOTE_ALL)
     try:
         with pd.ExcelWriter(args.out_xlsx, engine="openpyxl") as w:
@@ -398,8 +412,11 @@ def main():
         print(f"[OK] saved CSV → {args.out_csv} | XLSX → {args.out_xlsx}")
     except Exception as e:
         print(f"[OK] saved CSV → {args.out_csv} | [WARN] XLSX 실패: {e} (pip install openpyxl)")
+    report.finish(rec)
     # 요약
     print(rep2[["item_code","display_name","name_source","품명_정제","성분_정제","성분_EN"]].head(10).to_string(index=False))
+    report.print_summary()
+    report.write_json(outdir/"run_report_yakje_total.json")
 
 if __name__=="__main__":
     main()
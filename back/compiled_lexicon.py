@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+"""
+compiled_lexicon.py — 코드↔표면형 관계를 바이너리로 컴파일(mmap 로드, 역직렬화 없음)
+
+텍스트 사전(`2_주성분코드매핑_perfect.txt` `codes => names`, `5_주성분별약품그룹_perfect.txt` `대표: 브랜드`,
+synonyms_by_substance_code.jsonl, 02_yakjejonghap_for_syn.csv …)을 시작할 때마다 파싱해 dict-of-sets를
+만드는 대신, 빌더가 한 번 컴파일해 두고 소비자는 mmap으로 바로 조회한다(fork 워커끼리 페이지 공유).
+
+섹션(mmap_store 형식)
+  code.pool/off     정렬된 코드 문자열             code.kind   코드 종류 번호(kinds 표)
+  code.label        코드 → 대표 표면형 id(없으면 0xFFFFFFFF)
+  surf.pool/off     표면형 원문(id 순)
+  key.pool/off      정렬된 surface_key(중복 없음)
+  key2code.ptr/idx  키 → 코드 id 목록(CSR)          code2surf.ptr/idx  코드 → 표면형 id 목록(CSR)
+  kinds.pool/off    종류 이름
+
+  b = LexiconBuilder(); b.add("644501090", "product", "타이레놀정500밀리그람", label=True); b.write("lexicon.plx")
+  lx = CompiledLexicon("lexicon.plx")
+  lx.codes_for("타이레놀 정 500밀리그람")   # [("644501090", "product"), ...]
+  lx.surfaces_for("644501090"); lx.label("644501090")
+
+CLI:
+  python compiled_lexicon.py compile --code_map 2_주성분코드매핑_perfect.txt --groups 5_주성분별약품그룹_perfect.txt \\
+      --jsonl out/synonyms_by_substance_code.jsonl --syn_csv outdir/02_yakjejonghap_for_syn.csv --out lexicon.plx
+  python compiled_lexicon.py query --lexicon lexicon.plx 타이레놀 644501090
+"""
+
+import csv, json, time, argparse
+from array import array
+from pathlib import Path
+
+from utils_kor import surface_key
+from mmap_store import write_store, MappedStore, MappedStrings, SortedStrings, string_sections, sorted_string_sections
+
+MAGIC = b"PLXLEXI1"
+NO_LABEL = 0xFFFFFFFF
+_NULLS = {"", "nan", "none", "null"}
+
+def _clean(x) -> str:
+    s = "" if x is None else str(x).strip()
+    return "" if s.lower() in _NULLS else s
+
+# ---------- 빌드 ----------
+class LexiconBuilder:
+    def __init__(self):
+        self._surf_id: dict[str, int] = {}
+        self._surfs: list[str] = []
+        self._code: dict[str, list] = {}    # code → [kind, label_sid, [sid, ...], set(sid)]
+
+    def _sid(self, s: str) -> int:
+        i = self._surf_id.get(s)
+        if i is None:
+            i = self._surf_id[s] = len(self._surfs)
+            self._surfs.append(s)
+        return i
+
+    def add(self, code, kind: str, surface, label: bool = False):
+        code, surface = _clean(code), _clean(surface)
+        if not code:
+            return
+        rec = self._code.get(code)
+        if rec is None:
+            rec = self._code[code] = [kind, NO_LABEL, [], set()]
+        if not surface:
+            return
+        sid = self._sid(surface)
+        if sid not in rec[3]:
+            rec[3].add(sid); rec[2].append(sid)
+        if label and rec[1] == NO_LABEL:
+            rec[1] = sid
+
+    def __len__(self):
+        return len(self._code)
+
+    # ---------- 텍스트 산출물 파서 ----------
+    def add_code_mapping(self, path, kind: str = "substance"):
+        """2_주성분코드매핑: `c1, c2 => name1, name2, ...` (첫 이름이 대표)"""
+        for line in Path(path).read_text(encoding="utf-8-sig").splitlines():
+            if "=>" not in line:
+                continue
+            codes, names = line.split("=>", 1)
+            names = [n.strip() for n in names.split(", ") if n.strip()]
+            for c in codes.split(","):
+                for j, n in enumerate(names):
+                    self.add(c, kind, n, label=(j == 0))
+
+    def add_groups(self, path, kind: str = "group"):
+        """5_주성분별약품그룹: `대표성분: 브랜드, ...` → 코드 = 대표성분 표기"""
+        for line in Path(path).read_text(encoding="utf-8-sig").splitlines():
+            if ": " not in line:
+                continue
+            rep, brands = line.split(": ", 1)
+            rep = rep.strip()
+            self.add(rep, kind, rep, label=True)
+            for b in brands.split(", "):
+                self.add(rep, kind, b)
+
+    def add_substance_jsonl(self, path):
+        """synonyms_by_substance_code.jsonl"""
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                d = json.loads(line)
+                code = d.get("substance_code")
+                lab = _clean(d.get("preferred_label_ko")) or _clean(d.get("preferred_label_en"))
+                self.add(code, "substance", lab, label=True)
+                self.add(code, "substance", d.get("preferred_label_en"))
+                for s in d.get("synonyms") or []:
+                    self.add(code, "substance", s)
+
+    def add_syn_rows(self, rows):
+        """02_yakjejonghap_for_syn.csv 행(dict 반복자 또는 DataFrame): lemma_id ↔ canonical/surface"""
+        if hasattr(rows, "to_dict"):
+            rows = rows.to_dict("records")
+        for r in rows:
+            code = r.get("lemma_id")
+            self.add(code, "product", r.get("canonical"), label=True)
+            self.add(code, "product", r.get("surface"))
+
+    def add_csv(self, path, code_col: str, label_col: str, kind: str):
+        """code_to_label_*.csv류: code_col ↔ label_col"""
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            for r in csv.DictReader(f):
+                self.add(r.get(code_col), kind, r.get(label_col), label=True)
+
+    # ---------- 쓰기 ----------
+    def write(self, path) -> Path:
+        codes = list(self._code)
+        code_secs, order = sorted_string_sections("code", codes)
+        codes = [codes[i] for i in order]
+        kinds = sorted({self._code[c][0] for c in codes})
+        kind_no = {k: i for i, k in enumerate(kinds)}
+
+        # 표면형 키 → 코드 id(정렬 순 번호)
+        key_codes: dict[str, list] = {}
+        c2s_ptr, c2s_idx = array("Q", [0]), array("I")
+        code_kind, code_label = array("B"), array("I")
+        for cid, c in enumerate(codes):
+            kind, lab, sids, _ = self._code[c]
+            code_kind.append(kind_no[kind]); code_label.append(lab)
+            c2s_idx.extend(sids); c2s_ptr.append(len(c2s_idx))
+            for k in {surface_key(self._surfs[s]) for s in sids} | {surface_key(c)}:
+                if k:
+                    lst = key_codes.setdefault(k, [])
+                    if not lst or lst[-1] != cid:
+                        lst.append(cid)
+        keys = list(key_codes)
+        key_secs, korder = sorted_string_sections("key", keys)
+        k2c_ptr, k2c_idx = array("Q", [0]), array("I")
+        for i in korder:
+            k2c_idx.extend(key_codes[keys[i]]); k2c_ptr.append(len(k2c_idx))
+
+        secs = {**code_secs, "code.kind": ("B", code_kind), "code.label": ("I", code_label),
+                **string_sections("surf", self._surfs), **key_secs,
+                "key2code.ptr": ("Q", k2c_ptr), "key2code.idx": ("I", k2c_idx),
+                "code2surf.ptr": ("Q", c2s_ptr), "code2surf.idx": ("I", c2s_idx),
+                **string_sections("kinds", kinds)}
+        return write_store(path, secs, magic=MAGIC)
+
+# ---------- 조회 ----------
+class CompiledLexicon:
+    def __init__(self, path):
+        self.store = st = MappedStore(path, magic=MAGIC)
+        self.codes = SortedStrings(st, "code")
+        self.keys = SortedStrings(st, "key")
+        self.surfs = MappedStrings(st, "surf")
+        self.kinds = list(MappedStrings(st, "kinds"))
+        self._kind, self._label = st["code.kind"], st["code.label"]
+        self._k2c_ptr, self._k2c = st["key2code.ptr"], st["key2code.idx"]
+        self._c2s_ptr, self._c2s = st["code2surf.ptr"], st["code2surf.idx"]
+
+    def __len__(self):
+        return len(self.codes)
+
+    def codes_for(self, surface) -> list[tuple[str, str]]:
+        """표면형(또는 코드 자체) → [(code, kind)] — surface_key로 정규화해 찾음"""
+        i = self.keys.find(surface_key(surface))
+        if i < 0:
+            return []
+        codes, kind, kinds = self.codes, self._kind, self.kinds
+        return [(codes[c], kinds[kind[c]]) for c in self._k2c[self._k2c_ptr[i]:self._k2c_ptr[i + 1]]]
+
+    def _cid(self, code) -> int:
+        return self.codes.find(_clean(code))
+
+    def surfaces_for(self, code) -> list[str]:
+        c = self._cid(code)
+        if c < 0:
+            return []
+        surfs = self.surfs
+        return [surfs[s] for s in self._c2s[self._c2s_ptr[c]:self._c2s_ptr[c + 1]]]
+
+    def label(self, code) -> str | None:
+        c = self._cid(code)
+        if c < 0 or self._label[c] == NO_LABEL:
+            return None
+        return self.surfs[self._label[c]]
+
+    def kind(self, code) -> str | None:
+        c = self._cid(code)
+        return self.kinds[self._kind[c]] if c >= 0 else None
+
+    def stats(self) -> dict:
+        return {"codes": len(self.codes), "surfaces": len(self.surfs), "keys": len(self.keys),
+                "kinds": self.kinds}
+
+def main():
+    ap = argparse.ArgumentParser()
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    c = sub.add_parser("compile")
+    c.add_argument("--code_map", action="append", default=[], help="2_주성분코드매핑 형식(`codes => names`)")
+    c.add_argument("--groups",   action="append", default=[], help="5_주성분별약품그룹 형식(`대표: 브랜드`)")
+    c.add_argument("--jsonl",    action="append", default=[], help="synonyms_by_substance_code.jsonl")
+    c.add_argument("--syn_csv",  action="append", default=[], help="02_yakjejonghap_for_syn.csv")
+    c.add_argument("--product_csv", default="", help="code_to_label_product_hira9.csv")
+    c.add_argument("--atc_csv",     default="", help="code_to_label_atc.csv")
+    c.add_argument("--out", required=True)
+    q = sub.add_parser("query")
+    q.add_argument("--lexicon", required=True)
+    q.add_argument("terms", nargs="+")
+    args = ap.parse_args()
+
+    if args.cmd == "compile":
+        t0 = time.perf_counter()
+        b = LexiconBuilder()
+        for p in args.code_map: b.add_code_mapping(p)
+        for p in args.groups:   b.add_groups(p)
+        for p in args.jsonl:    b.add_substance_jsonl(p)
+        for p in args.syn_csv:
+            with open(p, encoding="utf-8-sig", newline="") as f:
+                b.add_syn_rows(csv.DictReader(f))
+        if args.product_csv: b.add_csv(args.product_csv, "제품코드", "제품명", "product")
+        if args.atc_csv:     b.add_csv(args.atc_csv, "ATC코드", "ATC코드 명칭", "atc")
+        p = b.write(args.out)
+        print(f"[OK] lexicon → {p} ({len(b):,} codes, {p.stat().st_size/2**20:.1f} MB, {time.perf_counter()-t0:.1f}s)")
+        return
+
+    t0 = time.perf_counter()
+    lx = CompiledLexicon(args.lexicon)
+    print(f"[OK] loaded in {(time.perf_counter()-t0)*1000:.1f} ms: {lx.stats()}")
+    for t in args.terms:
+        if lx.kind(t):
+            surfs = lx.surfaces_for(t)
+            print(f"{t}\t{lx.kind(t)}\tlabel={lx.label(t)}\t{len(surfs)} surfaces: {', '.join(surfs[:8])}")
+        hits = lx.codes_for(t)
+        if hits:
+            print(f"{t}\t→ " + ", ".join(f"{k}:{c}" for c, k in hits[:10]))
+        elif not lx.kind(t):
+            print(f"{t}\t-")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+component_index.py — 복합제 성분 조합 질의용 비트맵 역색인
+
+`성분_정제` / `성분명_KO` / `성분명_EN`의 `·` 구분 성분을 surface_key로 정규화한 토큰마다
+제품 행 비트맵(numpy uint64 비트셋, 제품 28k개 기준 토큰당 3.5KB)을 만든다.
+
+  - all_of(["암로디핀", "발사르탄"])      두 성분을 모두 포함하는 제품(AND)
+  - any_of([...])                        하나라도 포함(OR)
+  - exact(["암로디핀", "발사르탄"])       정확히 그 성분 조합(AND + 성분 수 일치)
+  - prefix=True(기본)면 질의어로 시작하는 토큰을 모두 같은 성분으로 본다(암로디핀 → 암로디핀베실산염 …)
+
+비트맵 행렬은 mmap_store 파일의 한 섹션(토큰 × 워드)이라 로드 시 복사 없이 numpy view로 쓴다.
+pyroaring 같은 압축 비트맵은 쓰지 않았다: 제품 수 3만 규모에서는 밀집 비트셋 AND/OR가 더 빠르고 의존성도 없다.
+
+  build_component_index(enriched_df, "component_index.plx")
+  ci = ComponentIndex("component_index.plx")
+  ci.all_of(["amlodipine", "valsartan"])    # ['제품코드', ...]
+  ci.exact(["암로디핀", "발사르탄"], codes=False)   # 행 번호 numpy 배열
+
+CLI:
+  python component_index.py build --enriched out/01_applied_price_enriched.csv --out out/component_index.plx
+  python component_index.py query --index out/component_index.plx --all 암로디핀 발사르탄
+"""
+
+import re, time, argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils_kor import surface_key
+from mmap_store import write_store, MappedStore, MappedStrings, SortedStrings, string_sections, sorted_string_sections
+
+MAGIC = b"PLXCOMP1"
+COMPONENT_COLS = ("성분_정제", "성분명_KO", "성분명_EN")
+# 성분이 아니라 수식어/포장으로 딸려 나오는 토큰(성분 수 계산에서 제외)
+IGNORE_TOKENS = {"유전자재조합", "단클론항체"}
+_DOSE_ONLY = re.compile(r'^\d[\d.,/]*\D{0,2}$')
+
+def component_tokens(*values) -> set[str]:
+    out = set()
+    for v in values:
+        if not isinstance(v, str):
+            continue
+        for t in v.split("·"):
+            k = surface_key(t)
+            if k and k not in ("nan", "none") and k not in IGNORE_TOKENS and not _DOSE_ONLY.match(k):
+                out.add(k)
+    return out
+
+def build_component_index(df: pd.DataFrame, out_path) -> Path:
+    cols = [c for c in COMPONENT_COLS if c in df.columns]
+    products = df["제품코드"].astype(str).str.strip().tolist()
+    n = len(products)
+    n_words = max(1, (n + 63) // 64)
+
+    postings: dict[str, list] = {}
+    comp_count = np.zeros(n, dtype=np.uint8)
+    # 같은 성분의 KO/EN 표기가 둘 다 있으면 성분 수가 부풀지 않도록 성분_정제(없으면 KO) 기준으로 셈
+    count_col = next((c for c in ("성분_정제", "성분명_KO") if c in df.columns), None)
+    for row, vals in enumerate(zip(*(df[c].tolist() for c in cols))):
+        for t in component_tokens(*vals):
+            postings.setdefault(t, []).append(row)
+        if count_col:
+            comp_count[row] = min(255, len(component_tokens(vals[cols.index(count_col)])))
+
+    tokens = list(postings)
+    secs, order = sorted_string_sections("token", tokens)
+    bits = np.zeros((len(tokens), n_words), dtype=np.uint64)
+    for r, i in enumerate(order):
+        rows = np.asarray(postings[tokens[i]], dtype=np.int64)
+        np.bitwise_or.at(bits[r], rows >> 6, np.left_shift(np.uint64(1), (rows & 63).astype(np.uint64)))
+    secs.update({
+        "bits": ("Q", bits.reshape(-1)),
+        "count": ("B", comp_count),
+        "meta": ("Q", np.array([n, n_words], dtype=np.uint64)),
+        **string_sections("product", products),
+    })
+    return write_store(out_path, secs, magic=MAGIC)
+
+class ComponentIndex:
+    def __init__(self, path):
+        self.store = st = MappedStore(path, magic=MAGIC)
+        self.tokens = SortedStrings(st, "token")
+        self.product_codes = MappedStrings(st, "product")
+        self.n, self.n_words = (int(x) for x in st["meta"])
+        self.bits = np.frombuffer(st["bits"], dtype=np.uint64).reshape(len(self.tokens), self.n_words)
+        self.count = np.frombuffer(st["count"], dtype=np.uint8)
+        self._count_bits = {}
+
+    # ---------- 비트맵 ----------
+    def term_bits(self, term: str, prefix: bool = True) -> np.ndarray:
+        """질의어 하나 → 비트맵(prefix면 해당 접두어 토큰 전체 OR)"""
+        k = surface_key(term)
+        if not k:
+            return np.zeros(self.n_words, dtype=np.uint64)
+        if prefix:
+            lo, hi = self.tokens.prefix_range(k)
+        else:
+            lo = self.tokens.find(k); hi = lo + 1 if lo >= 0 else lo
+        if lo < 0 or lo >= hi:
+            return np.zeros(self.n_words, dtype=np.uint64)
+        if hi - lo == 1:
+            return self.bits[lo]
+        return np.bitwise_or.reduce(self.bits[lo:hi], axis=0)
+
+    def _count_mask(self, k: int) -> np.ndarray:
+        m = self._count_bits.get(k)
+        if m is None:
+            m = np.packbits(np.pad(self.count == k, (0, self.n_words * 64 - self.n)), bitorder="little").view(np.uint64)
+            self._count_bits[k] = m
+        return m
+
+    def rows(self, bits: np.ndarray) -> np.ndarray:
+        """비트맵 → 행 번호(오름차순)"""
+        return np.flatnonzero(np.unpackbits(bits.view(np.uint8), bitorder="little")[: self.n])
+
+    def _out(self, bits, codes: bool):
+        r = self.rows(bits)
+        if not codes:
+            return r
+        pc = self.product_codes
+        return [pc[int(i)] for i in r]
+
+    # ---------- 질의 ----------
+    def all_of(self, terms, prefix: bool = True, codes: bool = True):
+        terms = list(terms)
+        if not terms:
+            return [] if codes else np.zeros(0, dtype=np.int64)
+        acc = self.term_bits(terms[0], prefix).copy()
+        for t in terms[1:]:
+            acc &= self.term_bits(t, prefix)
+        return self._out(acc, codes)
+
+    def any_of(self, terms, prefix: bool = True, codes: bool = True):
+        acc = np.zeros(self.n_words, dtype=np.uint64)
+        for t in terms:
+            acc |= self.term_bits(t, prefix)
+        return self._out(acc, codes)
+
+    def exact(self, terms, prefix: bool = True, codes: bool = True):
+        """질의 성분을 모두 포함하고 성분 수가 질의 수와 같은 제품"""
+        terms = list(dict.fromkeys(terms))
+        if not terms:
+            return [] if codes else np.zeros(0, dtype=np.int64)
+        acc = self.term_bits(terms[0], prefix).copy()
+        for t in terms[1:]:
+            acc &= self.term_bits(t, prefix)
+        acc &= self._count_mask(len(terms))
+        return self._out(acc, codes)
+
+def main():
+    ap = argparse.ArgumentParser()
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build")
+    b.add_argument("--enriched", required=True, help="01_applied_price_enriched.csv 또는 스냅샷 CSV")
+    b.add_argument("--out", required=True)
+    q = sub.add_parser("query")
+    q.add_argument("--index", required=True)
+    g = q.add_mutually_exclusive_group(required=True)
+    g.add_argument("--all", nargs="+", help="모두 포함(AND)")
+    g.add_argument("--any", nargs="+", help="하나라도 포함(OR)")
+    g.add_argument("--exact", nargs="+", help="정확히 이 조합")
+    q.add_argument("--no-prefix", action="store_true", help="토큰 완전 일치만")
+    q.add_argument("--limit", type=int, default=20)
+    args = ap.parse_args()
+
+    if args.cmd == "build":
+        from build_applied_price_bundle import read_enriched
+        p = build_component_index(read_enriched(args.enriched), args.out)
+        print(f"[OK] component index → {p} ({p.stat().st_size/2**20:.1f} MB)")
+        return
+    ci = ComponentIndex(args.index)
+    fn, terms = ((ci.all_of, args.all) if args.all else (ci.any_of, args.any) if args.any else (ci.exact, args.exact))
+    t = time.perf_counter()
+    res = fn(terms, prefix=not args.no_prefix)
+    us = (time.perf_counter() - t) * 1e6
+    print(f"[OK] {len(res):,} products ({us:.0f} µs): {', '.join(res[:args.limit])}")
+
+if __name__ == "__main__":
+    main()
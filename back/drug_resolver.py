@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+drug_resolver.py — 유의어 산출물 기반 인프로세스 표면형 → 코드 해석기
+
+OpenSearch에 올리던 산출물을 그대로 읽어 해시 인덱스로 만든다(배치 작업에서 검색 클러스터 호출 불필요).
+
+  kind        code           출처
+  product     제품코드(9)     code_to_label_product_hira9.csv (제품명), 02_yakjejonghap_for_syn.csv (lemma_id)
+  substance   주성분코드       synonyms_by_substance_code.jsonl (없으면 opensearch_synonyms_substance.txt
+                             + code_to_label_substance.csv 대표라벨 → 코드)
+  atc         ATC코드         code_to_label_atc.csv (ATC코드 명칭)
+
+조회 키는 utils_kor.surface_key(norm_text + 괄호 통일 + 공백 제거 + 소문자)로 빌더 정규화와 맞춘다.
+원문 표면형과 키를 같은 dict에 넣어 두므로, 산출물에 있던 그대로의 문자열은 키 계산 없이 바로 찾는다.
+한 표면형이 여러 코드에 걸리면 등록 순서(product → substance → atc)대로 모두 보관하고 resolve()는 첫 번째.
+
+  r = DrugResolver.from_dirs(syn_dir="out", bundle_dir="outdir")
+  r.resolve("타이레놀정500밀리그램")       # Entry(kind='product', code='...', canonical='...') | None
+  r.resolve_all("아세트아미노펜")          # [Entry, ...]
+  r.resolve_many(names)                   # 배치(반복 표면형은 1회만 계산)
+
+CLI:
+  python drug_resolver.py --syn_dir out --bundle_dir outdir 타이레놀 아스피린
+  python drug_resolver.py --syn_dir out --in queries.txt --out resolved.csv
+"""
+
+import csv, json, argparse
+from collections import namedtuple
+from pathlib import Path
+
+from utils_kor import surface_key
+
+Entry = namedtuple("Entry", "kind code canonical")
+
+_NULLS = {"", "nan", "none", "null"}
+
+def _clean(x) -> str:
+    s = "" if x is None else str(x).strip()
+    return "" if s.lower() in _NULLS else s
+
+def _read_csv_rows(path):
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        yield from csv.DictReader(f)
+
+class DrugResolver:
+    def __init__(self):
+        self._index: dict[str, list] = {}    # 원문 표면형/키 → [Entry, ...] (읽기 전용으로 반환)
+        self._entries: dict[Entry, Entry] = {}   # 동일 Entry 객체 공유(메모리)
+
+    def __len__(self):
+        return len(self._index)
+
+    # ---------- 등록 ----------
+    def add(self, surface, kind: str, code, canonical=""):
+        surface = _clean(surface)
+        if not surface:
+            return
+        e = Entry(kind, _clean(code), _clean(canonical) or surface)
+        e = self._entries.setdefault(e, e)
+        k = surface_key(surface)
+        cur = self._index.get(k)
+        if cur is None:
+            cur = self._index[k] = []
+        if e not in cur:
+            cur.append(e)
+        # 원문 fast path: 키와 같은 리스트 객체를 공유(뒤에 후보가 추가돼도 함께 보임)
+        if surface != k:
+            self._index[surface] = cur
+
+    def add_products(self, path):
+        """code_to_label_product_hira9.csv: 제품명 → 제품코드 (제품코드 자체도 등록)"""
+        for r in _read_csv_rows(path):
+            code, name = _clean(r.get("제품코드")), _clean(r.get("제품명"))
+            if not code:
+                continue
+            self.add(name, "product", code, name)
+            self.add(code, "product", code, name)
+
+    def add_syn_rows(self, rows):
+        """02_yakjejonghap_for_syn.csv 행(dict 반복자 또는 DataFrame): surface/canonical → lemma_id(제품코드)"""
+        if hasattr(rows, "to_dict"):
+            rows = rows.to_dict("records")
+        for r in rows:
+            code, cano, surf = _clean(r.get("lemma_id")), _clean(r.get("canonical")), _clean(r.get("surface"))
+            if not code:
+                continue
+            self.add(cano, "product", code, cano)
+            self.add(surf, "product", code, cano)
+
+    def add_rules_synonyms(self, path):
+        """03_rules_synonyms.txt(`canonical => surf, ...`) — 코드 정보가 없어 02가 없을 때만 사용"""
+        for line in Path(path).read_text(encoding="utf-8").splitlines():
+            if "=>" not in line:
+                continue
+            cano, surfs = (x.strip() for x in line.split("=>", 1))
+            for s in [cano] + surfs.split(", "):
+                self.add(s, "product", "", cano)
+
+    def add_substances_jsonl(self, path):
+        """synonyms_by_substance_code.jsonl: synonyms/대표라벨 → 주성분코드"""
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                d = json.loads(line)
+                code = _clean(d.get("substance_code"))
+                cano = _clean(d.get("preferred_label_ko")) or _clean(d.get("preferred_label_en"))
+                for s in [code, cano, _clean(d.get("preferred_label_en"))] + list(d.get("synonyms") or []):
+                    self.add(s, "substance", code, cano)
+
+    def add_substances_opensearch(self, syn_txt, code_to_label_csv):
+        """opensearch_synonyms_substance.txt(`syn, ... => canon`) + 대표라벨 → 주성분코드"""
+        label2code = {}
+        for r in _read_csv_rows(code_to_label_csv):
+            code, lab = _clean(r.get("substance_code")), _clean(r.get("representative_label"))
+            if code and lab:
+                label2code.setdefault(lab, code)
+                self.add(code, "substance", code, lab)
+        for line in Path(syn_txt).read_text(encoding="utf-8").splitlines():
+            if "=>" not in line:
+                continue
+            syns, cano = line.rsplit("=>", 1)
+            cano = cano.strip()
+            code = label2code.get(cano, "")
+            for s in [cano] + syns.split(", "):
+                self.add(s, "substance", code, cano)
+
+    def add_atc(self, path):
+        """code_to_label_atc.csv: ATC코드 명칭/ATC코드 → ATC코드"""
+        for r in _read_csv_rows(path):
+            code, name = _clean(r.get("ATC코드")), _clean(r.get("ATC코드 명칭"))
+            if not code:
+                continue
+            self.add(code, "atc", code, name or code)
+            self.add(name, "atc", code, name)
+
+    @classmethod
+    def from_dirs(cls, syn_dir=None, bundle_dir=None) -> "DrugResolver":
+        """syn_dir: build_synonyms 산출 폴더, bundle_dir: build_applied_price_bundle 산출 폴더(둘 중 있는 것만)"""
+        r = cls()
+        if syn_dir:
+            syn_dir = Path(syn_dir)
+            if (syn_dir / "code_to_label_product_hira9.csv").exists():
+                r.add_products(syn_dir / "code_to_label_product_hira9.csv")
+        if bundle_dir:
+            bundle_dir = Path(bundle_dir)
+            if (bundle_dir / "02_yakjejonghap_for_syn.csv").exists():
+                r.add_syn_rows(_read_csv_rows(bundle_dir / "02_yakjejonghap_for_syn.csv"))
+            elif (bundle_dir / "03_rules_synonyms.txt").exists():
+                r.add_rules_synonyms(bundle_dir / "03_rules_synonyms.txt")
+        if syn_dir:
+            if (syn_dir / "synonyms_by_substance_code.jsonl").exists():
+                r.add_substances_jsonl(syn_dir / "synonyms_by_substance_code.jsonl")
+            elif (syn_dir / "opensearch_synonyms_substance.txt").exists():
+                r.add_substances_opensearch(syn_dir / "opensearch_synonyms_substance.txt",
+                                            syn_dir / "code_to_label_substance.csv")
+            if (syn_dir / "code_to_label_atc.csv").exists():
+                r.add_atc(syn_dir / "code_to_label_atc.csv")
+        if not len(r):
+            raise FileNotFoundError(f"no resolver artifacts under syn_dir={syn_dir} bundle_dir={bundle_dir}")
+        return r
+
+    # ---------- 조회 ----------
+    def resolve_all(self, surface) -> list:
+        idx = self._index
+        hit = idx.get(surface)
+        if hit is None:
+            hit = idx.get(surface_key(surface), ())
+        return hit
+
+    def resolve(self, surface) -> Entry | None:
+        hit = self.resolve_all(surface)
+        return hit[0] if hit else None
+
+    def resolve_many(self, surfaces, all_candidates: bool = False) -> list:
+        """배치 조회. 원문 hit → 키 hit 순, 원문에 없던 입력은 결과를 memo해 키 계산 1회"""
+        get = self._index.get
+        key = surface_key
+        memo = {}
+        memo_get = memo.get
+        hits = []
+        append = hits.append
+        for s in surfaces:
+            hit = get(s)
+            if hit is None:
+                hit = memo_get(s)
+                if hit is None:
+                    hit = memo[s] = get(key(s), ())
+            append(hit)
+        if all_candidates:
+            return hits
+        return [h[0] if h else None for h in hits]
+
+    def stats(self) -> dict:
+        kinds = {}
+        for e in self._entries:
+            kinds[e.kind] = kinds.get(e.kind, 0) + 1
+        return {"index_keys": len(self._index), "entries": len(self._entries), **kinds}
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--syn_dir",    default="", help="build_synonyms 산출 폴더")
+    ap.add_argument("--bundle_dir", default="", help="build_applied_price_bundle 산출 폴더")
+    ap.add_argument("--in",  dest="inp", default="", help="한 줄에 하나씩 조회할 표면형 파일")
+    ap.add_argument("--out", default="", help="결과 CSV(--in 사용 시)")
+    ap.add_argument("--all", action="store_true", help="후보 전부 출력")
+    ap.add_argument("surfaces", nargs="*")
+    args = ap.parse_args()
+
+    r = DrugResolver.from_dirs(args.syn_dir or None, args.bundle_dir or None)
+    print(f"[OK] resolver: {r.stats()}")
+
+    queries = list(args.surfaces)
+    if args.inp:
+        queries += [l.rstrip("\n") for l in open(args.inp, encoding="utf-8-sig") if l.strip()]
+    res = r.resolve_many(queries, all_candidates=True)
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8-sig", newline="") as f:
+            w = csv.writer(f)
+            w.writerow(["surface", "kind", "code", "canonical", "n_candidates"])
+            for q, hit in zip(queries, res):
+                e = hit[0] if hit else Entry("", "", "")
+                w.writerow([q, e.kind, e.code, e.canonical, len(hit)])
+        hits = sum(1 for h in res if h)
+        print(f"[OK] {hits:,}/{len(queries):,} resolved → {args.out}")
+        return
+    for q, hit in zip(queries, res):
+        if not hit:
+            print(f"{q}\t-")
+        for e in (hit if args.all else hit[:1]):
+            print(f"{q}\t{e.kind}\t{e.code}\t{e.canonical}")
+
+if __name__ == "__main__":
+    main()
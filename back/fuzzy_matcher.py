@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+"""
+fuzzy_matcher.py — 자모 단위 오타 허용 약품명 매칭(SymSpell식 삭제 인덱스)
+
+`아시클로버` → `아시클로비르`, `캅셀` → `캡슐`처럼 음절 한두 개에서 자모 몇 개만 틀린 입력을
+OpenSearch fuzzy 질의 없이 인프로세스에서 찾는다.
+
+  - 음절을 초성/중성/종성 호환 자모로 분해(str.translate 1회)한 뒤 편집거리(OSA, 인접 전치 포함)를 잰다
+  - 어휘 자모열 앞 prefix_len 글자에 대해 최대 index_dist개 삭제 변형을 전부 인덱싱(SymSpell prefix 방식)
+    → 질의도 같은 삭제 변형으로 후보를 모은 뒤 전체 문자열 거리로 확인
+    (prefix 안의 오타가 index_dist를 넘으면 후보에 못 들어오므로 lookup의 허용 거리는 index_dist로 상한)
+  - 후보 확인은 길이 차 → 글자 집합 지문(jamo_mask) 하한 → 공통 접두/접미를 뗀 띠 DP 순.
+    거리 2 이내에서 k개가 차면 거리 3 탐색은 생략(거리 우선 순위라 결과 동일)
+  - 어휘: 고유명사 사전, DrugResolver 대표명/표면형, 그리고 variants.py의 bundle·korean 프로필
+    변형(변형은 원래 어휘로 돌려줌)
+
+  fm = FuzzyMatcher.from_sources(lexicons=[...], syn_dir="out", bundle_dir="outdir")
+  fm.lookup("아시클로버", k=5)   # [Candidate(term, dist, weight, entries), ...] 거리↑, 가중치↓ 순
+
+허용 거리(default_max_dist): 자모 6개 미만 1, 10개 미만 2, 그 이상 3. `아시클로버`(11자모) → `아시클로비르`는
+`ㅓ→ㅣ` 치환 + `ㄹㅡ` 삽입으로 거리 3이라, 기본 index_dist=3으로 prefix 안 오타 3개까지 후보에 들어온다.
+아래 예시는 `python -m doctest fuzzy_matcher.py`로 확인한다.
+
+  >>> fm = FuzzyMatcher()
+  >>> fm.add("아시클로비르"); fm.add("세파클러캡슐")
+  >>> [(c.term, c.dist) for c in fm.lookup("아시클로버")]
+  [('아시클로비르', 3)]
+  >>> [(c.term, c.dist) for c in fm.lookup("세파클러캅셀")]
+  [('세파클러캡슐', 2)]
+
+CLI:
+  python fuzzy_matcher.py --lexicon 1_고유명사사전_perfect.txt --syn_dir out 아시클로버 타이레롤
+"""
+
+import time, argparse
+from collections import namedtuple
+
+from utils_kor import surface_key, to_jamo
+from variants import variants
+
+Candidate = namedtuple("Candidate", "term dist weight entries")
+
+def osa_distance(a: str, b: str, max_dist: int) -> int:
+    """제한 편집거리(삽입/삭제/치환/인접 전치). |i-j| <= max_dist 띠만 계산, 초과면 max_dist+1"""
+    if a == b:
+        return 0
+    la, lb = len(a), len(b)
+    if abs(la - lb) > max_dist:
+        return max_dist + 1
+    # 공통 접두/접미는 거리에 기여하지 않으므로 떼고 가운데만 DP(같은 브랜드·다른 함량 후보가 대부분)
+    n = min(la, lb)
+    s = 0
+    while s < n and a[s] == b[s]:
+        s += 1
+    e = 0
+    while e < n - s and a[la - 1 - e] == b[lb - 1 - e]:
+        e += 1
+    if s or e:
+        a, b = a[s:la - e], b[s:lb - e]
+        la, lb = la - s - e, lb - s - e
+        if not la or not lb:
+            return la + lb if la + lb <= max_dist else max_dist + 1
+    if la > lb:
+        a, b, la, lb = b, a, lb, la
+    big = max_dist + 1
+    prev2 = None
+    prev = [j if j <= max_dist else big for j in range(lb + 1)]
+    for i in range(1, la + 1):
+        ca = a[i - 1]
+        lo, hi = max(1, i - max_dist), min(lb, i + max_dist)
+        cur = [big] * (lb + 1)
+        if i <= max_dist:
+            cur[0] = i
+        row_min = big
+        for j in range(lo, hi + 1):
+            cb = b[j - 1]
+            v = prev[j - 1] if ca == cb else prev[j - 1] + 1
+            if prev[j] + 1 < v: v = prev[j] + 1
+            if cur[j - 1] + 1 < v: v = cur[j - 1] + 1
+            if prev2 is not None and j > 1 and ca == b[j - 2] and a[i - 2] == cb and prev2[j - 2] + 1 < v:
+                v = prev2[j - 2] + 1
+            cur[j] = v
+            if v < row_min:
+                row_min = v
+        if row_min > max_dist:
+            return big
+        prev2, prev = prev, cur
+    return prev[lb] if prev[lb] <= max_dist else big
+
+def jamo_mask(s: str) -> int:
+    """글자 집합 64비트 지문. 한쪽에만 있는 글자 하나마다 편집이 최소 1번 필요하므로
+    popcount(mq & ~mt), popcount(mt & ~mq)는 편집거리의 하한(비트 충돌은 하한을 낮출 뿐)"""
+    m = 0
+    for ch in s:
+        m |= 1 << (ord(ch) & 63)
+    return m
+
+def _deletes(s: str, d: int) -> set:
+    out = {s}
+    frontier = {s}
+    for _ in range(d):
+        nxt = set()
+        for w in frontier:
+            if len(w) <= 1:
+                continue
+            for i in range(len(w)):
+                nxt.add(w[:i] + w[i + 1:])
+        out |= nxt
+        frontier = nxt
+    return out
+
+def default_max_dist(n_jamo: int) -> int:
+    """짧은 입력은 오탐이 많아 허용 거리를 줄인다"""
+    return 1 if n_jamo < 6 else 2 if n_jamo < 10 else 3
+
+class FuzzyMatcher:
+    def __init__(self, prefix_len: int = 8, index_dist: int = 3, min_len: int = 2, max_len: int = 40):
+        self.prefix_len, self.index_dist = prefix_len, index_dist
+        self.min_len, self.max_len = min_len, max_len
+        self._jamo_to_id: dict[str, int] = {}
+        self._jamo: list[str] = []          # id → 자모열
+        self._term: list[str] = []          # id → 돌려줄 어휘(변형이면 원래 어휘)
+        self._weight: list[int] = []
+        self._mask: list[int] = []          # id → jamo_mask
+        self._prefix_ids: dict[str, list] = {}   # 자모 prefix → [id]
+        self._deletes: dict[str, list] = {}      # prefix 삭제 변형 → [prefix]
+        self.resolver = None
+
+    def __len__(self):
+        return len(self._jamo)
+
+    # ---------- 등록 ----------
+    def add(self, term: str, weight: int = 1, seeds: bool = True):
+        term = (term or "").strip()
+        if not (self.min_len <= len(term) <= self.max_len) or surface_key(term).isdigit():
+            return
+        self._add_surface(term, term, weight)
+        if seeds:
+            for v in self.seed_variants(term):
+                self._add_surface(v, term, weight)
+
+    @staticmethod
+    def seed_variants(term: str) -> set:
+        return set(variants(term, ("bundle", "korean")))
+
+    def _add_surface(self, surface: str, term: str, weight: int):
+        j = to_jamo(surface)
+        if not j:
+            return
+        i = self._jamo_to_id.get(j)
+        if i is not None:
+            self._weight[i] = max(self._weight[i], weight)
+            return
+        i = self._jamo_to_id[j] = len(self._jamo)
+        self._jamo.append(j); self._term.append(term); self._weight.append(weight)
+        self._mask.append(jamo_mask(j))
+        p = j[:self.prefix_len]
+        ids = self._prefix_ids.get(p)
+        if ids is None:
+            self._prefix_ids[p] = [i]
+            for d in _deletes(p, self.index_dist):
+                self._deletes.setdefault(d, []).append(p)
+        else:
+            ids.append(i)
+
+    def add_resolver(self, resolver):
+        """대표명(가중치 = 같은 대표명을 가진 코드 수) + 원문 표면형"""
+        self.resolver = resolver
+        counts = {}
+        for e in resolver._entries:
+            counts[e.canonical] = counts.get(e.canonical, 0) + 1
+        for cano, n in counts.items():
+            self.add(cano, weight=n)
+        for surface in resolver._index:
+            self.add(surface, seeds=False)
+
+    # ---------- 조회 ----------
+    def lookup(self, query: str, k: int = 5, max_dist: int | None = None) -> list[Candidate]:
+        q = to_jamo(query)
+        if not q:
+            return []
+        # 후보는 index_dist 삭제 인덱스에서만 나오므로 그 이상의 거리는 보장 못 함 → 상한
+        max_dist = min(default_max_dist(len(q)) if max_dist is None else max_dist, self.index_dist)
+        # 거리 2 이내에서 이미 k개를 찾았으면 거리 3 후보는 순위(거리 우선)에 들 수 없으므로 넓히지 않는다
+        best = self._search(q, min(max_dist, 2))
+        if max_dist > 2 and len(best) < k:
+            best = self._search(q, max_dist)
+        ranked = sorted(best.items(), key=lambda kv: (kv[1][0], -kv[1][1], len(kv[0]), kv[0]))[:k]
+        res = self.resolver
+        return [Candidate(t, d, w, tuple(res.resolve_all(t)) if res else ()) for t, (d, w) in ranked]
+
+    def _search(self, q: str, max_dist: int) -> dict:
+        """어휘 → (거리, 가중치). 거리 max_dist 이내 전부"""
+        seen_p, best = set(), {}
+        jamo, term, weight, mask = self._jamo, self._term, self._weight, self._mask
+        lq, mq = len(q), jamo_mask(q)
+        for d in _deletes(q[:self.prefix_len], max_dist):   # 거리 d 이내는 양쪽 d개 삭제로 충분(인덱스는 더 깊어도 됨)
+            for p in self._deletes.get(d, ()):
+                if p in seen_p:
+                    continue
+                seen_p.add(p)
+                for i in self._prefix_ids[p]:
+                    # 길이 차/글자 집합 차 하한으로 거르고 남은 것만 편집거리 계산
+                    if abs(len(jamo[i]) - lq) > max_dist:
+                        continue
+                    mt = mask[i]
+                    if (mq & ~mt).bit_count() > max_dist or (mt & ~mq).bit_count() > max_dist:
+                        continue
+                    dist = osa_distance(q, jamo[i], max_dist)
+                    if dist > max_dist:
+                        continue
+                    t = term[i]
+                    cur = best.get(t)
+                    if cur is None or dist < cur[0]:
+                        best[t] = (dist, weight[i])
+        return best
+
+    def stats(self) -> dict:
+        return {"surfaces": len(self._jamo), "prefixes": len(self._prefix_ids), "delete_keys": len(self._deletes)}
+
+    @classmethod
+    def from_sources(cls, lexicons=(), syn_dir=None, bundle_dir=None, **kw) -> "FuzzyMatcher":
+        from mention_extractor import read_lexicon
+        fm = cls(**kw)
+        if syn_dir or bundle_dir:
+            from drug_resolver import DrugResolver
+            fm.add_resolver(DrugResolver.from_dirs(syn_dir, bundle_dir))
+        for p in lexicons:
+            for w in read_lexicon(p):
+                fm.add(w)
+        return fm
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--lexicon", action="append", default=[], help="고유명사 사전(여러 번 지정 가능)")
+    ap.add_argument("--syn_dir",    default="", help="build_synonyms 산출 폴더")
+    ap.add_argument("--bundle_dir", default="", help="build_applied_price_bundle 산출 폴더")
+    ap.add_argument("--k", type=int, default=5)
+    ap.add_argument("--max_dist", type=int, default=None, help="자모 편집거리 상한(기본: 입력 길이별 1~3)")
+    ap.add_argument("queries", nargs="+")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    fm = FuzzyMatcher.from_sources(args.lexicon, args.syn_dir or None, args.bundle_dir or None)
+    print(f"[OK] index {fm.stats()} in {time.perf_counter() - t0:.1f}s")
+    for q in args.queries:
+        t = time.perf_counter()
+        cands = fm.lookup(q, args.k, args.max_dist)
+        ms = (time.perf_counter() - t) * 1000
+        print(f"{q}  ({ms:.2f} ms)")
+        for c in cands:
+            codes = ", ".join(f"{e.kind}:{e.code}" for e in c.entries[:3])
+            print(f"  d={c.dist}  w={c.weight:<4} {c.term}  {codes}")
+
+if __name__ == "__main__":
+    main()
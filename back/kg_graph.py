@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+"""
+kg_graph.py — 분류(class3)↔주성분↔제품↔ATC 관계 그래프(CSR 인접 배열, .npz 저장)
+
+build_class_maps / build_synonyms / 번들 산출물의 엣지를 한 번 읽어, 노드 종류별 정수 ID와
+관계별 정방향·역방향 CSR(ptr/idx)로 만든다. 소비자는 pandas merge 대신 ID 배열 단위로 이웃을 펼친다.
+
+  노드 종류  class3 / substance / product / atc (종류마다 정렬된 코드 표 → ID = 표 위치)
+  관계       (class3 → substance)  kg_edges_class3_has_substance.csv
+             (product → class3)    class3_to_product_map.csv  분류
+             (product → substance) class3_to_product_map.csv  주성분코드 (+ 번들 enriched)
+             (product → atc)       code_to_label_atc.csv      (+ 번들 enriched ATC코드)
+  관계는 종류 쌍으로 식별하고, 반대 방향은 역 CSR로 같은 비용에 따라간다.
+
+  kg = KnowledgeGraph.from_outputs("out", enriched_csv="outdir/01_applied_price_enriched.csv")
+  kg.save("out/kg_graph.npz"); kg = KnowledgeGraph.load("out/kg_graph.npz")
+  sub = kg.neighbors("class3", kg.ids("class3", ["112"]), "substance")      # ID 배열(중복 제거)
+  kg.path("class3", ["112"], ["substance", "product", "atc"])               # 경로 DataFrame
+  kg.khop("substance", kg.ids("substance", ["130830ASY"]), k=2)             # {종류: ID 배열}
+
+CLI:
+  python kg_graph.py build --out_dir out [--enriched outdir/01_applied_price_enriched.csv] --out out/kg_graph.npz
+  python kg_graph.py path --graph out/kg_graph.npz --start class3 112 --via substance product atc
+  python kg_graph.py khop --graph out/kg_graph.npz --start substance 130830ASY --k 2
+"""
+
+import time, argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+NODE_TYPES = ("class3", "substance", "product", "atc")
+RELATIONS = (("class3", "substance"), ("product", "class3"), ("product", "substance"), ("product", "atc"))
+_NULLS = {"", "nan", "none", "null"}
+# 종류별 코드 형식(약제목록 일부 시트는 제품코드 칸에 영문 품명이 들어 있어 걸러냄)
+_VALID = {"product": r'\d+'}
+
+def _read(path) -> pd.DataFrame:
+    """빌더 산출물(utf-8-sig) 읽기"""
+    return pd.read_csv(path, dtype=str, encoding="utf-8-sig")
+
+def _clean_codes(s: pd.Series) -> pd.Series:
+    s = s.astype(str).str.strip()
+    return s.where(~s.str.lower().isin(_NULLS), "")
+
+def _split_tokens(s: pd.Series) -> pd.Series:
+    """merge_tokens 결과(`·`/`,`/`|` 구분) → 토큰 목록"""
+    return s.fillna("").astype(str).str.split(r'\s*[·,|]\s*', regex=True)
+
+def _csr(src: np.ndarray, dst: np.ndarray, n_src: int) -> tuple[np.ndarray, np.ndarray]:
+    """(src, dst) 쌍 → ptr(int64, n_src+1), idx(int32) — 행 내부는 dst 오름차순"""
+    order = np.lexsort((dst, src))
+    ptr = np.zeros(n_src + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n_src), out=ptr[1:])
+    return ptr, dst[order].astype(np.int32)
+
+def _expand(ptr: np.ndarray, idx: np.ndarray, src: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """src ID 배열의 이웃을 한 번에 펼침 → (src 배열 내 위치, 이웃 ID)"""
+    starts, lens = ptr[src], ptr[src + 1] - ptr[src]
+    pos = np.repeat(np.arange(len(src)), lens)
+    offs = np.arange(int(lens.sum())) - np.repeat(np.cumsum(lens) - lens, lens) + np.repeat(starts, lens)
+    return pos, idx[offs]
+
+# ---------- 빌드 ----------
+class GraphBuilder:
+    def __init__(self):
+        self._edges = {rel: [] for rel in RELATIONS}
+
+    def add_edges(self, src_type: str, dst_type: str, src, dst):
+        if (src_type, dst_type) not in self._edges:
+            raise ValueError(f"unknown relation: {src_type} → {dst_type}")
+        e = pd.DataFrame({"s": _clean_codes(pd.Series(src)).to_numpy(),
+                          "d": _clean_codes(pd.Series(dst)).to_numpy()})
+        keep = (e["s"] != "") & (e["d"] != "")
+        for col, t in (("s", src_type), ("d", dst_type)):
+            if t in _VALID:
+                keep &= e[col].str.fullmatch(_VALID[t])
+        self._edges[(src_type, dst_type)].append(e[keep])
+
+    # ---------- 산출물 로더 ----------
+    def add_class3_substance(self, path):
+        """kg_edges_class3_has_substance.csv (class3_code, substance_code)"""
+        df = _read(path)
+        self.add_edges("class3", "substance", df["class3_code"], df["substance_code"])
+
+    def add_class3_product_map(self, path):
+        """class3_to_product_map.csv (분류, 제품코드, …, 주성분코드)"""
+        df = _read(path)
+        self.add_edges("product", "class3", df["제품코드"], df["분류"])
+        if "주성분코드" in df:
+            self.add_edges("product", "substance", df["제품코드"], df["주성분코드"])
+
+    def add_product_atc(self, path):
+        """code_to_label_atc.csv (제품코드, ATC코드, ATC코드 명칭)"""
+        df = _read(path)
+        self.add_edges("product", "atc", df["제품코드"], df["ATC코드"])
+
+    def add_enriched(self, df: pd.DataFrame):
+        """번들 01_applied_price_enriched.csv: 제품코드 ↔ 주성분코드 / ATC코드(`·` 병합)"""
+        prod = df["제품코드"]
+        if "주성분코드" in df:
+            self.add_edges("product", "substance", prod, df["주성분코드"])
+        if "ATC코드" in df:
+            ex = pd.DataFrame({"p": prod, "a": _split_tokens(df["ATC코드"])}).explode("a")
+            self.add_edges("product", "atc", ex["p"], ex["a"])
+
+    def build(self) -> "KnowledgeGraph":
+        edges = {rel: (pd.concat(parts, ignore_index=True).drop_duplicates() if parts
+                       else pd.DataFrame({"s": [], "d": []}, dtype=str))
+                 for rel, parts in self._edges.items()}
+        codes = {t: set() for t in NODE_TYPES}
+        for (a, b), e in edges.items():
+            codes[a].update(e["s"]); codes[b].update(e["d"])
+        tables = {t: np.array(sorted(codes[t]), dtype=str) for t in NODE_TYPES}
+        arrays = {f"{t}.codes": tables[t] for t in NODE_TYPES}
+        for (a, b), e in edges.items():
+            s = np.searchsorted(tables[a], e["s"].to_numpy(dtype=str))
+            d = np.searchsorted(tables[b], e["d"].to_numpy(dtype=str))
+            arrays[f"{a}>{b}.ptr"], arrays[f"{a}>{b}.idx"] = _csr(s, d, len(tables[a]))
+            arrays[f"{b}<{a}.ptr"], arrays[f"{b}<{a}.idx"] = _csr(d, s, len(tables[b]))
+        return KnowledgeGraph(arrays)
+
+# ---------- 조회 ----------
+class KnowledgeGraph:
+    def __init__(self, arrays: dict):
+        self.arrays = arrays
+        self.codes_of = {t: arrays[f"{t}.codes"] for t in NODE_TYPES}
+        self._adj = {}
+        for a, b in RELATIONS:
+            self._adj[(a, b)] = (arrays[f"{a}>{b}.ptr"], arrays[f"{a}>{b}.idx"])
+            self._adj[(b, a)] = (arrays[f"{b}<{a}.ptr"], arrays[f"{b}<{a}.idx"])
+
+    @classmethod
+    def from_outputs(cls, out_dir, enriched_csv=None) -> "KnowledgeGraph":
+        """run_all 출력 폴더(+ 선택: 번들 enriched CSV)에서 있는 파일만 읽어 빌드"""
+        out_dir = Path(out_dir)
+        b = GraphBuilder()
+        for name, fn in (("kg_edges_class3_has_substance.csv", b.add_class3_substance),
+                         ("class3_to_product_map.csv", b.add_class3_product_map),
+                         ("code_to_label_atc.csv", b.add_product_atc)):
+            p = out_dir / name
+            if p.exists():
+                fn(p)
+            else:
+                print(f"[SKIP] {p} 없음")
+        if enriched_csv:
+            b.add_enriched(_read(enriched_csv))
+        return b.build()
+
+    def save(self, path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(path, **self.arrays)
+        return path
+
+    @classmethod
+    def load(cls, path) -> "KnowledgeGraph":
+        with np.load(path, allow_pickle=False) as z:
+            return cls({k: z[k] for k in z.files})
+
+    # ---------- ID ↔ 코드 ----------
+    def ids(self, node_type: str, codes) -> np.ndarray:
+        """코드 목록 → ID 배열(없는 코드는 빠짐)"""
+        table = self.codes_of[node_type]
+        q = np.asarray([str(c).strip() for c in codes], dtype=str)
+        if not len(table) or not len(q):
+            return np.zeros(0, dtype=np.int64)
+        pos = np.minimum(np.searchsorted(table, q), len(table) - 1)
+        return pos[table[pos] == q]
+
+    def codes(self, node_type: str, ids) -> np.ndarray:
+        return self.codes_of[node_type][np.asarray(ids, dtype=np.int64)]
+
+    def degree(self, src_type: str, dst_type: str) -> np.ndarray:
+        return np.diff(self._adj[(src_type, dst_type)][0])
+
+    # ---------- 순회 ----------
+    def expand(self, src_type: str, ids, dst_type: str) -> tuple[np.ndarray, np.ndarray]:
+        """ids의 dst_type 이웃 쌍 → (ids 내 위치, 이웃 ID). 관계가 없으면 KeyError"""
+        ptr, idx = self._adj[(src_type, dst_type)]
+        return _expand(ptr, idx, np.asarray(ids, dtype=np.int64))
+
+    def neighbors(self, src_type: str, ids, dst_type: str) -> np.ndarray:
+        return np.unique(self.expand(src_type, ids, dst_type)[1])
+
+    def khop(self, node_type: str, ids, k: int = 2) -> dict[str, np.ndarray]:
+        """모든 관계를 따라 k단계 안에 닿는 노드(시작 노드 포함) {종류: ID 배열}"""
+        seen = {t: np.zeros(len(self.codes_of[t]), dtype=bool) for t in NODE_TYPES}
+        seen[node_type][np.asarray(ids, dtype=np.int64)] = True
+        frontier = {node_type: np.unique(np.asarray(ids, dtype=np.int64))}
+        for _ in range(k):
+            nxt = {}
+            for a, f in frontier.items():
+                for (x, b) in self._adj:
+                    if x != a or not len(f):
+                        continue
+                    nb = self.neighbors(a, f, b)
+                    nb = nb[~seen[b][nb]]
+                    seen[b][nb] = True
+                    nxt[b] = np.union1d(nxt.get(b, nb[:0]), nb)
+            frontier = {t: v for t, v in nxt.items() if len(v)}
+            if not frontier:
+                break
+        return {t: np.flatnonzero(m) for t, m in seen.items() if m.any()}
+
+    def path(self, start_type: str, start_codes, via, codes: bool = True) -> pd.DataFrame:
+        """start → via[0] → via[1] … 경로를 모두 펼친 표(열 = 종류, 같은 종류가 반복되면 접미 번호)"""
+        types = [start_type, *via]
+        cols = [t if types.index(t) == i else f"{t}_{i}" for i, t in enumerate(types)]
+        cur = np.unique(self.ids(start_type, start_codes))
+        table = [cur]
+        for a, b in zip(types, types[1:]):
+            pos, nb = self.expand(a, table[-1], b)
+            table = [c[pos] for c in table] + [nb]
+        if codes:
+            return pd.DataFrame({c: self.codes(t, col) for c, t, col in zip(cols, types, table)})
+        return pd.DataFrame(dict(zip(cols, table)))
+
+    def stats(self) -> dict:
+        d = {f"n_{t}": len(v) for t, v in self.codes_of.items()}
+        d.update({f"{a}>{b}": len(self._adj[(a, b)][1]) for a, b in RELATIONS})
+        return d
+
+def main():
+    ap = argparse.ArgumentParser()
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build")
+    b.add_argument("--out_dir", required=True, help="run_all 출력 폴더(kg_edges_*, class3_to_product_map, code_to_label_atc)")
+    b.add_argument("--enriched", default="", help="번들 01_applied_price_enriched.csv(선택)")
+    b.add_argument("--out", required=True, help="저장할 .npz")
+    for name in ("path", "khop"):
+        q = sub.add_parser(name)
+        q.add_argument("--graph", required=True)
+        q.add_argument("--start", nargs="+", required=True, metavar=("TYPE", "CODE"), help="시작 종류와 코드들")
+        q.add_argument("--limit", type=int, default=20)
+        if name == "path":
+            q.add_argument("--via", nargs="+", required=True, choices=NODE_TYPES)
+        else:
+            q.add_argument("--k", type=int, default=2)
+    args = ap.parse_args()
+
+    if args.cmd == "build":
+        t0 = time.perf_counter()
+        kg = KnowledgeGraph.from_outputs(args.out_dir, args.enriched or None)
+        p = kg.save(args.out)
+        print(f"[OK] graph → {p} ({p.stat().st_size/2**20:.1f} MB, {time.perf_counter()-t0:.1f}s): {kg.stats()}")
+        return
+
+    t0 = time.perf_counter()
+    kg = KnowledgeGraph.load(args.graph)
+    print(f"[OK] loaded in {(time.perf_counter()-t0)*1000:.1f} ms")
+    st, start = args.start[0], args.start[1:]
+    if st not in NODE_TYPES:
+        ap.error(f"start type must be one of {NODE_TYPES}")
+    t = time.perf_counter()
+    if args.cmd == "path":
+        df = kg.path(st, start, args.via)
+        print(f"[OK] {len(df):,} paths ({(time.perf_counter()-t)*1000:.2f} ms)")
+        print(df.head(args.limit).to_string(index=False))
+    else:
+        res = kg.khop(st, kg.ids(st, start), args.k)
+        print(f"[OK] {args.k}-hop ({(time.perf_counter()-t)*1000:.2f} ms)")
+        for typ, ids in res.items():
+            print(f"  {typ:<10} {len(ids):>6,}  {', '.join(kg.codes(typ, ids[:args.limit]))}")
+
+if __name__ == "__main__":
+    main()
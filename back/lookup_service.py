@@ -0,0 +1,400 @@
+# -*- coding: utf-8 -*-
+"""
+lookup_service.py — 코드 해석 / 동의어 확장 / 자동완성 / 제품·시점 약가 조회 로컬 HTTP 서비스(asyncio, 표준 라이브러리)
+
+번들·스냅샷·build_synonyms 산출물을 시작 시 한 번만 읽고(plx/idx는 mmap), 앱마다 CSV를 다시 읽지 않게 한다.
+
+  GET  /resolve?q=타이레놀&all=1          POST /resolve       {"q": [...], "all": false}
+  GET  /expand?q=아세트아미노펜            POST /expand        {"q": [...]}
+  GET  /autocomplete?q=ㅇㅅㅋ&k=10&kinds=brand,ingredient
+                                          POST /autocomplete  {"q": [...], "k": 10}
+  GET  /product?q=644501090&as_of=2025-08-15
+                                          POST /product       {"q": [...], "as_of": "2025-08-15"}
+  GET  /metrics   엔드포인트별 지연 히스토그램(Prometheus 텍스트) + 캐시 적중
+  GET  /health    적재 산출물 요약
+
+  - 배치(POST): 한 요청 안의 중복 질의는 1회만 계산, 항목 단위로 LRU 캐시 조회
+  - LRU 캐시: (엔드포인트, 질의, 옵션) → 결과 객체(기본 50,000항목)
+  - 시점 약가: --prices 날짜=CSV 를 여러 번 주면 as_of 이하 가장 최근 스냅샷 행을 돌려줌
+    (날짜를 생략하면 파일명의 YYYYMMDD / YYYY.M.D. 에서 읽음). as_of 없으면 번들 enriched(최신)
+
+실행:
+  python lookup_service.py --syn_dir out --bundle_dir outdir \\
+      --prices "out/약제종합_SNAPSHOT_20250801.csv" --prices 2025-09-01=outdir/01_applied_price_enriched.csv
+  python ../bench/load_service.py --url http://127.0.0.1:8765 --endpoint resolve --concurrency 32
+"""
+
+import re, csv, json, time, asyncio, argparse
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from pathlib import Path
+from urllib.parse import urlsplit, parse_qs
+
+from drug_resolver import DrugResolver
+from compiled_lexicon import CompiledLexicon
+from autocomplete import Autocomplete, KINDS
+
+LATENCY_BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 1000)
+MAX_BATCH = 10_000
+_DATE_RX = re.compile(r'(20\d{2})[.\-_]?(\d{1,2})[.\-_]?(\d{1,2})')
+
+class BadRequest(ValueError):
+    pass
+
+# ---------- 캐시 / 지표 ----------
+class LRUCache:
+    def __init__(self, maxsize: int = 50_000):
+        self.maxsize = maxsize
+        self._d = OrderedDict()
+        self.hits = self.misses = 0
+
+    _MISS = object()
+
+    def get(self, key):
+        v = self._d.get(key, self._MISS)
+        if v is self._MISS:
+            self.misses += 1
+            return self._MISS
+        self._d.move_to_end(key)
+        self.hits += 1
+        return v
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        self._d[key] = value
+        self._d.move_to_end(key)
+        if len(self._d) > self.maxsize:
+            self._d.popitem(last=False)
+
+    def __len__(self):
+        return len(self._d)
+
+class LatencyHistogram:
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)   # 마지막 = +Inf
+        self.sum_ms = 0.0
+        self.n = 0
+
+    def observe(self, ms: float):
+        self.counts[bisect_left(self.buckets, ms)] += 1   # le 의미: ms <= 경계
+        self.sum_ms += ms
+        self.n += 1
+
+    def prometheus(self, name: str, labels: str) -> list[str]:
+        out, acc = [], 0
+        for b, c in zip(self.buckets, self.counts):
+            acc += c
+            out.append(f'{name}_bucket{{{labels},le="{b / 1000:g}"}} {acc}')
+        out.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.n}')
+        out.append(f"{name}_sum{{{labels}}} {self.sum_ms / 1000:.6f}")
+        out.append(f"{name}_count{{{labels}}} {self.n}")
+        return out
+
+# ---------- 시점 약가 ----------
+def date_from_name(path) -> str | None:
+    m = _DATE_RX.search(Path(path).name)
+    return f"{m.group(1)}-{int(m.group(2)):02d}-{int(m.group(3)):02d}" if m else None
+
+def _read_rows(path) -> dict:
+    """제품코드 → 행(dict). 같은 코드가 여러 번이면 첫 행"""
+    out = {}
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        for r in csv.DictReader(f):
+            code = (r.get("제품코드") or "").strip()
+            if code and code not in out:
+                out[code] = r
+    return out
+
+class PriceHistory:
+    """날짜별 스냅샷(제품코드 → 행). lookup(code, as_of)는 as_of 이하 가장 최근 스냅샷에서 찾음"""
+    def __init__(self):
+        self.dates: list[str] = []
+        self.tables: list[dict] = []
+        self.current: dict = {}
+
+    def add(self, date: str, path):
+        rows = _read_rows(path)
+        i = bisect_right(self.dates, date)
+        self.dates.insert(i, date); self.tables.insert(i, rows)
+        return len(rows)
+
+    def set_current(self, path):
+        self.current = _read_rows(path)
+        return len(self.current)
+
+    def lookup(self, code: str, as_of: str | None = None):
+        """→ (스냅샷 날짜 | "current", 행) | (None, None). as_of 시점에 목록에 없던 제품은 더 이전 스냅샷으로 내려가지 않음"""
+        if as_of is None:
+            if code in self.current:
+                return "current", self.current[code]
+            if self.tables:
+                return self.dates[-1], self.tables[-1].get(code)
+            return None, None
+        i = bisect_right(self.dates, as_of) - 1
+        if i < 0:
+            return None, None
+        return self.dates[i], self.tables[i].get(code)
+
+    def history(self, code: str) -> list[dict]:
+        return [{"date": d, "상한금액": t[code].get("상한금액")} for d, t in zip(self.dates, self.tables) if code in t]
+
+# ---------- 서비스 ----------
+class LookupService:
+    def __init__(self, resolver=None, lexicons=(), autocomplete=None, prices=None, cache_size: int = 50_000):
+        self.resolver = resolver
+        self.lexicons = list(lexicons)
+        self.ac = autocomplete
+        self.prices = prices or PriceHistory()
+        self.cache = LRUCache(cache_size)
+        self.latency: dict[str, LatencyHistogram] = {}
+        self.items: dict[str, int] = {}
+        self.errors = 0
+        self.ops = {"resolve": self.resolve, "expand": self.expand,
+                    "autocomplete": self.complete, "product": self.product}
+
+    @classmethod
+    def from_dirs(cls, syn_dir=None, bundle_dir=None, prices=(), cache_size: int = 50_000) -> "LookupService":
+        resolver = DrugResolver.from_dirs(syn_dir, bundle_dir)
+        lexicons, ac, ph = [], None, PriceHistory()
+        for d, name in ((bundle_dir, "lexicon_product.plx"), (syn_dir, "lexicon_substance.plx")):
+            if d and (Path(d) / name).exists():
+                lexicons.append(CompiledLexicon(Path(d) / name))
+        if bundle_dir and (Path(bundle_dir) / "autocomplete.idx").exists():
+            ac = Autocomplete(Path(bundle_dir) / "autocomplete.idx")
+        if bundle_dir and (Path(bundle_dir) / "01_applied_price_enriched.csv").exists():
+            ph.set_current(Path(bundle_dir) / "01_applied_price_enriched.csv")
+        for spec in prices:
+            m = re.match(r'(\d{4}-\d{2}-\d{2})=(.+)$', spec)
+            date, path = (m.group(1), m.group(2)) if m else (date_from_name(spec), spec)
+            if not date:
+                raise ValueError(f"--prices {spec}: 날짜를 알 수 없음(날짜=경로 형식으로 지정)")
+            ph.add(date, path)
+        return cls(resolver, lexicons, ac, ph, cache_size)
+
+    # ---------- 연산(항목 1개) ----------
+    def resolve(self, q: str, all_candidates: bool = False):
+        if self.resolver is None:
+            raise BadRequest("resolver not loaded")
+        hit = self.resolver.resolve_all(q)
+        return [e._asdict() for e in (hit if all_candidates else hit[:1])]
+
+    def expand(self, q: str):
+        """표면형 → 코드(해석기 + 컴파일 사전) → 그 코드들의 모든 표면형"""
+        codes = {}
+        if self.resolver is not None:
+            for e in self.resolver.resolve_all(q):
+                codes.setdefault(e.code, e.kind)
+        for lx in self.lexicons:
+            for c, k in lx.codes_for(q):
+                codes.setdefault(c, k)
+        syn = {}
+        for c in codes:
+            for lx in self.lexicons:
+                for s in lx.surfaces_for(c):
+                    syn.setdefault(s, None)
+        return {"codes": [{"code": c, "kind": k} for c, k in codes.items()], "synonyms": list(syn)}
+
+    def complete(self, q: str, k: int = 10, kinds=None):
+        if self.ac is None:
+            raise BadRequest("autocomplete index not loaded")
+        if kinds and not set(kinds) <= set(KINDS):
+            raise BadRequest(f"kinds must be among {KINDS}")
+        return [c._asdict() for c in self.ac.complete(q, int(k), kinds)]
+
+    def product(self, q: str, as_of: str | None = None):
+        date, row = self.prices.lookup(q.strip(), as_of)
+        if row is None:
+            return None
+        return {"snapshot": date, "row": row, "history": self.prices.history(q.strip())}
+
+    # ---------- 캐시 + 배치 ----------
+    def call(self, op: str, queries: list, opts: dict) -> list:
+        fn = self.ops[op]
+        okey = tuple(sorted((k, tuple(v) if isinstance(v, list) else v) for k, v in opts.items()))
+        cache, miss = self.cache, LRUCache._MISS
+        memo, out = {}, []
+        for q in queries:
+            if not isinstance(q, str):
+                raise BadRequest("queries must be strings")
+            if q in memo:
+                out.append(memo[q]); continue
+            key = (op, q, okey)
+            v = cache.get(key)
+            if v is miss:
+                v = fn(q, **opts)
+                cache.put(key, v)
+            memo[q] = v
+            out.append(v)
+        self.items[op] = self.items.get(op, 0) + len(queries)
+        return out
+
+    def observe(self, route: str, ms: float):
+        h = self.latency.get(route)
+        if h is None:
+            h = self.latency[route] = LatencyHistogram()
+        h.observe(ms)
+
+    def metrics_text(self) -> str:
+        lines = ["# TYPE lookup_request_seconds histogram"]
+        for route, h in sorted(self.latency.items()):
+            ep, mode = route.split(":")
+            lines += h.prometheus("lookup_request_seconds", f'endpoint="{ep}",mode="{mode}"')
+        lines.append("# TYPE lookup_items_total counter")
+        lines += [f'lookup_items_total{{endpoint="{k}"}} {v}' for k, v in sorted(self.items.items())]
+        lines += ["# TYPE lookup_cache_hits_total counter", f"lookup_cache_hits_total {self.cache.hits}",
+                  "# TYPE lookup_cache_misses_total counter", f"lookup_cache_misses_total {self.cache.misses}",
+                  "# TYPE lookup_cache_entries gauge", f"lookup_cache_entries {len(self.cache)}",
+                  "# TYPE lookup_errors_total counter", f"lookup_errors_total {self.errors}"]
+        return "\n".join(lines) + "\n"
+
+    def health(self) -> dict:
+        return {"resolver": self.resolver.stats() if self.resolver is not None else None,
+                "lexicons": [lx.stats() for lx in self.lexicons],
+                "autocomplete_entries": len(self.ac) if self.ac is not None else 0,
+                "products_current": len(self.prices.current),
+                "price_snapshots": {d: len(t) for d, t in zip(self.prices.dates, self.prices.tables)},
+                "cache": {"entries": len(self.cache), "hits": self.cache.hits, "misses": self.cache.misses}}
+
+    # ---------- HTTP ----------
+    def _opts(self, op: str, src: dict) -> dict:
+        """쿼리스트링/JSON 본문 → 연산 옵션(연산별 허용 키만)"""
+        if op == "resolve":
+            v = src.get("all", False)
+            return {"all_candidates": v in (True, "1", "true", "yes")}
+        if op == "autocomplete":
+            kinds = src.get("kinds")
+            if isinstance(kinds, str):
+                kinds = [x for x in kinds.split(",") if x]
+            try:
+                k = int(src.get("k", 10))
+            except (TypeError, ValueError):
+                raise BadRequest("k must be an integer")
+            return {"k": max(1, min(k, 100)), "kinds": kinds or None}
+        if op == "product":
+            as_of = src.get("as_of") or None
+            if as_of is not None and not re.fullmatch(r'\d{4}-\d{2}-\d{2}', str(as_of)):
+                raise BadRequest("as_of must be YYYY-MM-DD")
+            return {"as_of": as_of}
+        return {}
+
+    def handle(self, method: str, target: str, body: bytes) -> tuple[int, str, bytes]:
+        """→ (status, content-type, 본문)"""
+        u = urlsplit(target)
+        op = u.path.strip("/")
+        if method == "GET" and op == "metrics":
+            return 200, "text/plain; version=0.0.4", self.metrics_text().encode()
+        if method == "GET" and op == "health":
+            return 200, "application/json", _json(self.health())
+        if op not in self.ops:
+            return 404, "application/json", _json({"error": f"unknown endpoint /{op}"})
+        t0 = time.perf_counter()
+        try:
+            if method == "GET":
+                qs = {k: v[-1] for k, v in parse_qs(u.query).items()}
+                if "q" not in qs:
+                    raise BadRequest("missing q")
+                res = {"q": qs["q"], "result": self.call(op, [qs["q"]], self._opts(op, qs))[0]}
+                mode = "single"
+            elif method == "POST":
+                try:
+                    req = json.loads(body or b"{}")
+                except ValueError:
+                    raise BadRequest("invalid JSON body")
+                qs = req.get("q") if isinstance(req, dict) else None
+                if not isinstance(qs, list):
+                    raise BadRequest('POST body must be {"q": [...]}')
+                if len(qs) > MAX_BATCH:
+                    raise BadRequest(f"batch too large (max {MAX_BATCH})")
+                res = {"results": self.call(op, qs, self._opts(op, req))}
+                mode = "batch"
+            else:
+                return 405, "application/json", _json({"error": "method not allowed"})
+        except BadRequest as e:
+            self.errors += 1
+            return 400, "application/json", _json({"error": str(e)})
+        self.observe(f"{op}:{mode}", (time.perf_counter() - t0) * 1000)
+        return 200, "application/json", _json(res)
+
+def _json(obj) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error"}
+
+async def _serve_conn(svc: LookupService, reader, writer, max_body: int):
+    """HTTP/1.1 keep-alive 연결 하나(요청 순서대로 처리)"""
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            try:
+                method, target, version = line.decode("latin-1").split()
+            except ValueError:
+                break
+            headers = {}
+            while True:
+                h = await reader.readline()
+                if h in (b"\r\n", b"\n", b""):
+                    break
+                k, _, v = h.decode("latin-1").partition(":")
+                headers[k.strip().lower()] = v.strip()
+            try:
+                n = int(headers.get("content-length") or 0)
+            except ValueError:
+                n = -1
+            if n < 0:   # 숫자가 아니거나 음수 — 본문 경계를 알 수 없으므로 응답 후 연결 종료
+                status, ctype, out = 400, "application/json", _json({"error": "invalid content-length"})
+                keep = False
+            elif n > max_body:
+                status, ctype, out = 413, "application/json", _json({"error": "body too large"})
+                keep = False
+            else:
+                body = await reader.readexactly(n) if n else b""
+                try:
+                    status, ctype, out = svc.handle(method.upper(), target, body)
+                except Exception as e:   # 연결은 유지, 오류만 보고
+                    svc.errors += 1
+                    status, ctype, out = 500, "application/json", _json({"error": repr(e)})
+                conn = headers.get("connection", "").lower()
+                keep = conn != "close" and (version == "HTTP/1.1" or conn == "keep-alive")
+            writer.write(f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                         f"Content-Type: {ctype}; charset=utf-8\r\nContent-Length: {len(out)}\r\n"
+                         f"Connection: {'keep-alive' if keep else 'close'}\r\n\r\n".encode("latin-1") + out)
+            await writer.drain()
+            if not keep:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+async def serve(svc: LookupService, host: str, port: int, max_body: int = 8 << 20):
+    server = await asyncio.start_server(lambda r, w: _serve_conn(svc, r, w, max_body), host, port)
+    print(f"[OK] listening on http://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--syn_dir",    default="", help="build_synonyms 산출 폴더(lexicon_substance.plx 등)")
+    ap.add_argument("--bundle_dir", default="", help="build_applied_price_bundle 산출 폴더")
+    ap.add_argument("--prices", action="append", default=[],
+                    help="시점 약가용 스냅샷 CSV([YYYY-MM-DD=]경로, 여러 번)")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--cache_size", type=int, default=50_000, help="LRU 응답 캐시 항목 수(0이면 끔)")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    svc = LookupService.from_dirs(args.syn_dir or None, args.bundle_dir or None, args.prices, args.cache_size)
+    print(f"[OK] loaded in {time.perf_counter()-t0:.1f}s: {json.dumps(svc.health(), ensure_ascii=False)}")
+    try:
+        asyncio.run(serve(svc, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
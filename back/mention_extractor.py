@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""
+mention_extractor.py — 처방 메모/청구 메모 등 자유 텍스트에서 약품·성분·업체 언급 태깅(Aho-Corasick)
+
+어휘(수천~수만 개)마다 정규식/`in` 검사를 돌리는 대신, 전체 어휘로 다중 패턴 오토마톤을 한 번 만들고
+문서마다 한 번 선형 스캔한다. 겹치는 후보는 leftmost-longest로 골라 겹치지 않는 언급만 돌려준다.
+
+어휘 출처(있는 것만)
+  --lexicon    1_고유명사사전_perfect.txt(한 줄 1개), 03_rules_proper_nouns.txt(`word\\tNNP`),
+               proper_nouns_dictionary.txt(build_synonyms)
+  --syn_dir / --bundle_dir
+               drug_resolver.DrugResolver 표면형(원문 + surface_key 형) + 업체명(code_to_label_product_hira9.csv)
+               → 언급마다 해석된 코드(kind, code, canonical)를 붙인다
+
+매칭 규칙
+  - 대소문자/괄호 종류 무시(글자 단위 1:1 치환이라 span은 원문 기준 그대로)
+  - 영숫자로 시작/끝나는 어휘는 앞뒤가 영숫자면 버림(`U`, `mg` 같은 부분 일치 방지)
+  - 너무 짧은/긴 어휘 제외(--min_len/--max_len)
+
+  ex = MentionExtractor.from_sources(lexicons=[...], syn_dir="out", bundle_dir="outdir")
+  ex.extract("타이레놀정 500mg 1T bid, 아스피린 중단")   # [Mention(start, end, text, term, kind, entries), ...]
+  for doc_id, mentions in ex.extract_stream(docs): ...
+
+CLI:
+  python mention_extractor.py --lexicon 1_고유명사사전_perfect.txt --syn_dir out --in memos.txt --out mentions.jsonl
+"""
+
+import csv, json, argparse
+from collections import namedtuple
+from pathlib import Path
+
+from utils_kor import _KEY_MAP
+
+Mention = namedtuple("Mention", "start end text term kind entries")
+
+# 글자 수를 바꾸지 않는 치환만(span 보존): 괄호 통일 + 공백류 → ' '
+_FOLD_MAP = {k: v for k, v in _KEY_MAP.items() if v is not None and len(v) == 1}
+_FOLD_MAP.update({ord(c): " " for c in "\t\r\n　 "})
+_FOLD = str.maketrans(_FOLD_MAP)
+
+def fold(s: str) -> str:
+    t = s.translate(_FOLD)
+    low = t.lower()
+    return low if len(low) == len(t) else t   # 드물게 lower()로 길이가 바뀌는 문자(İ 등)는 대소문자 유지
+
+def _isalnum_ascii(ch: str) -> bool:
+    return ch.isascii() and ch.isalnum()
+
+def read_lexicon(path) -> list[str]:
+    """한 줄 1개(탭 뒤 품사 태그는 무시), BOM/빈 줄 제거"""
+    out = []
+    for line in Path(path).read_text(encoding="utf-8-sig").splitlines():
+        w = line.split("\t", 1)[0].strip()
+        if w:
+            out.append(w)
+    return out
+
+class MentionExtractor:
+    def __init__(self, min_len: int = 2, max_len: int = 40):
+        self.min_len, self.max_len = min_len, max_len
+        self._goto: list[dict] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[tuple] = [()]       # 노드에서 끝나는 패턴 길이(긴 것부터, suffix 링크 출력 포함)
+        self._terms: dict[str, list] = {}   # fold(패턴) → [원문 term, kind, entries]
+        self._built = False
+        self.resolver = None
+
+    # ---------- 어휘 등록 ----------
+    def add(self, term: str, kind: str = "term", entries=()):
+        term = (term or "").strip()
+        if not (self.min_len <= len(term) <= self.max_len):
+            return
+        pat = fold(term)
+        if pat.isdigit():
+            return   # 숫자만(제품코드 등)은 자유 텍스트 태깅 대상 아님
+        cur = self._terms.get(pat)
+        if cur is None:
+            self._terms[pat] = [term, kind, tuple(entries)]
+            self._built = False
+        else:
+            if cur[1] == "term" and kind != "term":
+                cur[1] = kind
+            if entries:
+                cur[2] = cur[2] + tuple(e for e in entries if e not in cur[2])
+
+    def add_resolver(self, resolver, companies=()):
+        """DrugResolver 인덱스의 모든 표면형 + 업체명.
+        인덱스에는 원문과 surface_key 형(공백 제거/소문자/괄호 통일)이 함께 있으므로 둘 다 패턴으로 들어간다 —
+        `타이레놀정500mg`처럼 띄어쓰기 없이 쓴 메모도 잡힌다. 같은 항목 리스트를 공유해 entries는 같다"""
+        self.resolver = resolver
+        for surface, entries in resolver._index.items():
+            self.add(surface, entries[0].kind if entries else "term", entries)
+        for c in companies:
+            self.add(c, "company")
+
+    def build(self):
+        """trie + 실패 링크(BFS). 출력은 실패 링크 쪽 출력까지 합쳐 둔다"""
+        goto, fail, out = [{}], [0], [()]
+        for pat in self._terms:
+            node = 0
+            for ch in pat:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({}); fail.append(0); out.append(())
+                node = nxt
+            out[node] = (len(pat),)
+        queue = list(goto[0].values())
+        head = 0
+        while head < len(queue):
+            node = queue[head]; head += 1
+            for ch, nxt in goto[node].items():
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fn = goto[f].get(ch, 0)
+                fail[nxt] = fn if fn != nxt else 0
+                if out[fail[nxt]]:
+                    out[nxt] = tuple(sorted(set(out[nxt]) | set(out[fail[nxt]]), reverse=True))
+                queue.append(nxt)
+        self._goto, self._fail, self._out = goto, fail, out
+        self._built = True
+        return self
+
+    # ---------- 추출 ----------
+    def _candidates(self, folded: str):
+        """(start, length) 전부 — 한 번의 선형 스캔"""
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        cands = []
+        for i, ch in enumerate(folded):
+            g = goto[node]
+            while node and ch not in g:
+                node = fail[node]
+                g = goto[node]
+            node = g.get(ch, 0)
+            o = out[node]
+            if o:
+                for L in o:
+                    cands.append((i - L + 1, L))
+        return cands
+
+    def extract(self, text: str) -> list[Mention]:
+        if not self._built:
+            self.build()
+        if not text:
+            return []
+        folded = fold(text)
+        cands = self._candidates(folded)
+        if not cands:
+            return []
+        cands.sort(key=lambda c: (c[0], -c[1]))
+        n = len(text)
+        mentions, pos = [], 0
+        terms = self._terms
+        for s, L in cands:
+            if s < pos:
+                continue
+            e = s + L
+            # 영숫자 경계
+            if _isalnum_ascii(folded[s]) and s > 0 and _isalnum_ascii(folded[s - 1]):
+                continue
+            if _isalnum_ascii(folded[e - 1]) and e < n and _isalnum_ascii(folded[e]):
+                continue
+            term, kind, entries = terms[folded[s:e]]
+            mentions.append(Mention(s, e, text[s:e], term, kind, entries))
+            pos = e
+        return mentions
+
+    def extract_stream(self, docs):
+        """docs: 문자열 또는 (doc_id, text) 반복자 → (doc_id, [Mention]) 제너레이터"""
+        if not self._built:
+            self.build()
+        for i, d in enumerate(docs):
+            doc_id, text = d if isinstance(d, tuple) else (i, d)
+            yield doc_id, self.extract(text)
+
+    def stats(self) -> dict:
+        if not self._built:
+            self.build()
+        return {"terms": len(self._terms), "nodes": len(self._goto)}
+
+    @classmethod
+    def from_sources(cls, lexicons=(), syn_dir=None, bundle_dir=None, min_len=2, max_len=40) -> "MentionExtractor":
+        ex = cls(min_len=min_len, max_len=max_len)
+        if syn_dir or bundle_dir:
+            from drug_resolver import DrugResolver
+            companies = []
+            prod = Path(syn_dir) / "code_to_label_product_hira9.csv" if syn_dir else None
+            if prod and prod.exists():
+                with open(prod, encoding="utf-8-sig", newline="") as f:
+                    companies = sorted({(r.get("업체명") or "").strip() for r in csv.DictReader(f)} - {""})
+            ex.add_resolver(DrugResolver.from_dirs(syn_dir, bundle_dir), companies)
+        for p in lexicons:
+            for w in read_lexicon(p):
+                ex.add(w)
+        return ex.build()
+
+def mention_to_dict(m: Mention) -> dict:
+    return {"start": m.start, "end": m.end, "text": m.text, "term": m.term, "kind": m.kind,
+            "codes": [{"kind": e.kind, "code": e.code, "canonical": e.canonical} for e in m.entries]}
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--lexicon", action="append", default=[], help="고유명사 사전(여러 번 지정 가능)")
+    ap.add_argument("--syn_dir",    default="", help="build_synonyms 산출 폴더(코드 해석 + 업체명)")
+    ap.add_argument("--bundle_dir", default="", help="build_applied_price_bundle 산출 폴더")
+    ap.add_argument("--in",  dest="inp", required=True, help="한 줄 1문서 텍스트 또는 CSV(--text_col)")
+    ap.add_argument("--text_col", default="", help="CSV 입력 시 텍스트 컬럼명")
+    ap.add_argument("--id_col",   default="", help="CSV 입력 시 문서 ID 컬럼명")
+    ap.add_argument("--out", required=True, help="JSONL 출력(문서당 1줄)")
+    ap.add_argument("--min_len", type=int, default=2)
+    ap.add_argument("--max_len", type=int, default=40)
+    args = ap.parse_args()
+
+    ex = MentionExtractor.from_sources(args.lexicon, args.syn_dir or None, args.bundle_dir or None,
+                                       args.min_len, args.max_len)
+    print(f"[OK] automaton: {ex.stats()}")
+
+    def docs():
+        with open(args.inp, encoding="utf-8-sig", newline="") as f:
+            if args.text_col:
+                for i, r in enumerate(csv.DictReader(f)):
+                    yield (r.get(args.id_col) if args.id_col else i), r.get(args.text_col) or ""
+            else:
+                for i, line in enumerate(f):
+                    yield i, line.rstrip("\r\n")
+
+    n_docs = n_mentions = 0
+    with open(args.out, "w", encoding="utf-8") as fo:
+        for doc_id, mentions in ex.extract_stream(docs()):
+            fo.write(json.dumps({"id": doc_id, "mentions": [mention_to_dict(m) for m in mentions]},
+                                ensure_ascii=False) + "\n")
+            n_docs += 1; n_mentions += len(mentions)
+    print(f"[OK] docs={n_docs:,} mentions={n_mentions:,} → {args.out}")
+
+if __name__ == "__main__":
+    main()
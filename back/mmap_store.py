@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+mmap_store.py — 이름 붙은 배열 섹션 묶음 파일(mmap 로드, 역직렬화 없음)
+
+자동완성 인덱스, 컴파일된 사전처럼 "시작할 때 텍스트를 파싱해 dict를 만드는" 비용을 없애기 위한 공용 컨테이너.
+섹션은 바이트열(문자열 풀) 또는 고정폭 정수/실수 배열이고, 로더는 mmap 위에 memoryview만 얹는다
+→ fork된 워커끼리 페이지 캐시를 공유하고, 시작은 파일 크기와 무관하게 ms 단위.
+
+파일 레이아웃(little-endian)
+  magic(8) | n_sections u32 | reserved u32
+  섹션 표 n × [name 32B(NUL 패딩) | typecode 1B | pad 7B | offset u64 | nbytes u64]
+  데이터(섹션마다 8바이트 정렬)
+
+  write_store(path, {"keys.pool": b"...", "keys.off": ("Q", offsets), "w": ("I", weights)})
+  st = MappedStore(path)
+  st["w"][3]                           # memoryview('I')
+  keys = SortedStrings(st, "keys")     # 정렬 문자열 표: find(), prefix_range()
+
+문자열 표는 <name>.pool(UTF-8 연결) + <name>.off(Q, n+1) 두 섹션. 정렬은 UTF-8 바이트 순(= 코드포인트 순).
+"""
+
+import io, os, sys, mmap, struct
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+
+MAGIC = b"PLXSTOR1"
+_HEAD = struct.Struct("<8sII")
+_ENTRY = struct.Struct("<32sc7xQQ")
+_TYPES = {"B": 1, "I": 4, "Q": 8, "i": 4, "q": 8, "d": 8}
+
+def _as_bytes(typecode: str, data) -> bytes:
+    if typecode == "B" and isinstance(data, (bytes, bytearray, memoryview)):
+        return bytes(data)
+    if hasattr(data, "dtype"):   # numpy 배열
+        return data.astype("<" + {"B": "u1", "I": "u4", "Q": "u8", "i": "i4", "q": "i8", "d": "f8"}[typecode],
+                            copy=False).tobytes()
+    arr = data if isinstance(data, array) and data.typecode == typecode else array(typecode, data)
+    if sys.byteorder != "little":
+        arr = array(typecode, arr); arr.byteswap()
+    return arr.tobytes()
+
+def write_store(path, sections: dict, magic: bytes = MAGIC) -> Path:
+    """sections: {name: bytes | (typecode, 배열/반복자)}. 임시 파일에 쓴 뒤 교체(읽는 중인 mmap 보호)"""
+    path = Path(path)
+    items = []
+    for name, val in sections.items():
+        tc, data = ("B", val) if isinstance(val, (bytes, bytearray, memoryview)) else val
+        if tc not in _TYPES:
+            raise ValueError(f"unsupported typecode {tc!r} for section {name}")
+        nb = name.encode("utf-8")
+        if len(nb) > 32:
+            raise ValueError(f"section name too long: {name}")
+        items.append((nb, tc, _as_bytes(tc, data)))
+    off = _HEAD.size + _ENTRY.size * len(items)
+    table, layout = [], []
+    for nb, tc, blob in items:
+        off = (off + 7) & ~7
+        table.append(_ENTRY.pack(nb, tc.encode(), off, len(blob)))
+        layout.append((off, blob))
+        off += len(blob)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(_HEAD.pack(magic, len(items), 0))
+        f.write(b"".join(table))
+        for o, blob in layout:
+            f.write(b"\0" * (o - f.tell()))
+            f.write(blob)
+    os.replace(tmp, path)
+    return path
+
+class MappedStore:
+    def __init__(self, path, magic: bytes = MAGIC):
+        if sys.byteorder != "little":
+            raise ValueError("mmap_store files are little-endian only")
+        self.path = Path(path)
+        self._f = open(self.path, "rb")
+        self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        mg, n, _ = _HEAD.unpack_from(self._mm, 0)
+        if mg != magic:
+            raise ValueError(f"{self.path}: bad magic {mg!r} (expected {magic!r})")
+        self._buf = memoryview(self._mm)
+        self._sections = {}
+        for k in range(n):
+            nb, tc, off, size = _ENTRY.unpack_from(self._mm, _HEAD.size + k * _ENTRY.size)
+            name = nb.rstrip(b"\0").decode("utf-8")
+            tc = tc.decode()
+            view = self._buf[off:off + size]
+            self._sections[name] = view if tc == "B" else view.cast(tc)
+
+    def __contains__(self, name):
+        return name in self._sections
+
+    def __getitem__(self, name) -> memoryview:
+        return self._sections[name]
+
+    def names(self) -> list[str]:
+        return list(self._sections)
+
+    def close(self):
+        """내보낸 memoryview가 살아 있으면 mmap은 GC 때 닫힌다"""
+        for v in self._sections.values():
+            v.release()
+        self._sections.clear()
+        self._buf.release()
+        try:
+            self._mm.close()
+        except BufferError:
+            pass
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# ---------- 문자열 표 ----------
+def pack_strings(strings) -> tuple[bytes, array]:
+    """[str] → (UTF-8 풀, 오프셋 Q[n+1])"""
+    buf = io.BytesIO()
+    offs = array("Q", [0])
+    for s in strings:
+        buf.write(s.encode("utf-8"))
+        offs.append(buf.tell())
+    return buf.getvalue(), offs
+
+def string_sections(name: str, strings) -> dict:
+    pool, offs = pack_strings(strings)
+    return {f"{name}.pool": pool, f"{name}.off": ("Q", offs)}
+
+class MappedStrings:
+    """<name>.pool/<name>.off 섹션을 리스트처럼(필요한 항목만 디코드)"""
+    def __init__(self, store: MappedStore, name: str):
+        self._pool = store[f"{name}.pool"]
+        self._off = store[f"{name}.off"]
+        self._n = len(self._off) - 1
+
+    def __len__(self):
+        return self._n
+
+    def raw(self, i: int) -> bytes:
+        return self._pool[self._off[i]:self._off[i + 1]].tobytes()
+
+    def __getitem__(self, i: int) -> str:
+        if i < 0:
+            i += self._n
+        if not 0 <= i < self._n:
+            raise IndexError(i)
+        return self._pool[self._off[i]:self._off[i + 1]].tobytes().decode("utf-8")
+
+class _RawSeq:
+    """bisect용: i번째 항목을 bytes로"""
+    __slots__ = ("raw", "n")
+    def __init__(self, strings: MappedStrings):
+        self.raw, self.n = strings.raw, len(strings)
+    def __len__(self):
+        return self.n
+    def __getitem__(self, i):
+        return self.raw(i)
+
+class SortedStrings(MappedStrings):
+    """UTF-8 바이트 순으로 정렬된 문자열 표(이진 탐색)"""
+    def __init__(self, store: MappedStore, name: str):
+        super().__init__(store, name)
+        self._seq = _RawSeq(self)
+
+    def find(self, key: str) -> int:
+        b = key.encode("utf-8")
+        i = bisect_left(self._seq, b)
+        return i if i < self._n and self.raw(i) == b else -1
+
+    def prefix_range(self, prefix: str) -> tuple[int, int]:
+        """prefix로 시작하는 항목의 [lo, hi). UTF-8에는 0xFF 바이트가 없어 prefix+0xFF가 상한"""
+        b = prefix.encode("utf-8")
+        return bisect_left(self._seq, b), bisect_left(self._seq, b + b"\xff")
+
+def sorted_string_sections(name: str, strings) -> tuple[dict, list[int]]:
+    """정렬(UTF-8 바이트 순) 후 섹션 생성. 반환: (섹션, 정렬 순서 — 원래 인덱스 목록)"""
+    enc = [s.encode("utf-8") for s in strings]
+    order = sorted(range(len(enc)), key=enc.__getitem__)
+    buf = b"".join(enc[i] for i in order)
+    offs = array("Q", [0])
+    acc = 0
+    for i in order:
+        acc += len(enc[i]); offs.append(acc)
+    return {f"{name}.pool": buf, f"{name}.off": ("Q", offs)}, order
@@ -1,19 +1,44 @@
 # -*- coding: utf-8 -*-
 # run_all.py
+#  - 입력 파일은 한 번씩만 로드(공유 DataFrame, 읽기 전용)해서 각 단계 함수에 넘긴다.
+#  - 서로 의존하지 않는 단계(동치어 사전 / 분류 교차표)는 스레드 풀에서 동시에 실행.
+#  - build_graph manifest로 입력(원천 파일 + 규칙 코드)이 바뀐 단계만 다시 실행하고,
+#    다시 실행할 단계가 쓰는 입력만 로드한다. (--force: 전체 재빌드)
 import sys
-import subprocess
-import shutil
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import yaml
 
+from utils_kor import read_korean_csv, load_hira_list
+from build_graph import BuildGraph
+from run_report import RunReport
+from build_synonyms import build_synonyms
+from build_class_maps import build_class_maps
+from surface_conflicts import POLICIES
+
 HERE = Path(__file__).resolve().parent
 
-def run(cmd: list[str]):
-    print("[RUN]", " ".join([str(x) for x in cmd]))
-    subprocess.check_call(cmd)
+def load_sources(loaders: dict, workers: int = 3) -> dict:
+    """{key: (loader, path)} → {key: DataFrame}. 엑셀/CSV 파싱을 겹쳐서 실행(CSV 파서는 엑셀 파싱 동안 병행 가능)"""
+    if not loaders:
+        return {}
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(loaders)))) as ex:
+        futs = {k: ex.submit(fn, path) for k, (fn, path) in loaders.items()}
+        return {k: f.result() for k, f in futs.items()}
 
 def main():
-    cfg_path = HERE / "config.yaml"
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--config",  default=str(HERE / "config.yaml"))
+    ap.add_argument("--workers", type=int, default=2, help="동시 실행 단계 수(1이면 순차 실행)")
+    ap.add_argument("--force",   action="store_true", help="manifest 무시하고 전체 재빌드")
+    ap.add_argument("--conflict-policy", choices=POLICIES, default="report",
+                    help="build_synonyms 충돌 표면형 처리: report / drop / downboost(주성분 산출물에서는 보고서만)")
+    ap.add_argument("--conflict-max-fanout", type=int, default=20,
+                    help="drop 기준: 서로 다른 대표명 수가 이 값을 넘는 표면형")
+    args = ap.parse_args()
+
+    cfg_path = Path(args.config)
     if not cfg_path.exists():
         print(f"[ERR] config.yaml not found: {cfg_path}")
         sys.exit(1)
@@ -35,24 +60,71 @@ def main():
             print(f"[ERR] file missing: {p}")
             sys.exit(2)
 
-    # 1) 동치어 사전 생성
-    run([
-        sys.executable, str(HERE / "build_synonyms.py"),
-        "--list_xlsx", str(list_xlsx),
-        "--atc_csv",   str(atc_csv),
-        "--out_dir",   str(out_dir),
-    ])
-
-    # 2) 분류↔주성분/제품 교차표
-    run([
-        sys.executable, str(HERE / "build_class_maps.py"),
-        "--list_xlsx",     str(list_xlsx),
-        "--submaster_csv", str(subm_csv),
-        "--out_dir",       str(out_dir),
-    ])
+    report = RunReport("run_all")
+
+    # 0) 단계 선언(입력/산출물) → 바뀐 단계만 실행
+    src = {}
+    graph = BuildGraph(out_dir / ".build_manifest.json", force=args.force)
+    graph.add("build_synonyms",
+              lambda ctx: build_synonyms(list_xlsx, atc_csv, out_dir, df_list=src["list"], df_atc=src["atc"],
+                                         conflict_policy=args.conflict_policy,
+                                         conflict_max_fanout=args.conflict_max_fanout),
+              inputs=[list_xlsx, atc_csv, HERE / "build_synonyms.py", HERE / "utils_kor.py",
+                      HERE / "compiled_lexicon.py", HERE / "mmap_store.py", HERE / "synonym_diff.py",
+                      HERE / "surface_conflicts.py"],
+              outputs=[out_dir / n for n in (
+                  "synonyms_by_substance_code.csv", "synonyms_by_substance_code.jsonl",
+                  "opensearch_synonyms_substance.txt", "opensearch_synonyms_substance.txt.state.json",
+                  "opensearch_synonyms_substance.txt.diff.json", "proper_nouns_dictionary.txt",
+                  "code_to_label_substance.csv", "code_to_label_product_hira9.csv", "code_to_label_atc.csv",
+                  "lexicon_substance.plx", "surface_conflicts_substance.csv")],
+              params={"conflict_policy": args.conflict_policy, "conflict_max_fanout": args.conflict_max_fanout})
+    graph.add("build_class_maps",
+              lambda ctx: build_class_maps(list_xlsx, subm_csv, out_dir, df_list=src["list"], df_subm=src["subm"]),
+              inputs=[list_xlsx, subm_csv, HERE / "build_class_maps.py", HERE / "utils_kor.py"],
+              outputs=[out_dir / n for n in (
+                  "class3_to_substance_crosswalk.csv", "class3_to_product_map.csv",
+                  "kg_edges_class3_has_substance.csv")])
+    needs = {"build_synonyms": ("list", "atc"), "build_class_maps": ("list", "subm")}
+    loaders = {"list": (load_hira_list, list_xlsx),
+               "atc":  (read_korean_csv, atc_csv),
+               "subm": (read_korean_csv, subm_csv)}
+
+    stale = [st for st in graph.stages if graph.is_stale(st)]
+    for st in graph.stages:
+        if st not in stale:
+            print(f"[SKIP] {st.name} (입력 변경 없음)")
+    if not stale:
+        print("\n[OK] 변경 없음 — 기존 산출물 유지")
+        print(f"     출력 폴더: {out_dir.resolve()}")
+        return
+
+    # 1) 공용 로드(필요한 파일만, 파일당 1회)
+    keys = sorted({k for st in stale for k in needs[st.name]})
+    print("[RUN] load sources:", ", ".join(keys))
+    with report.stage("load_sources") as st:
+        src.update(load_sources({k: loaders[k] for k in keys}))
+        st.rows_out = sum(len(src[k]) for k in keys)
+    print("[OK] " + " | ".join(f"{k} {len(src[k]):,}" for k in keys))
+
+    # 2) 동치어 사전 / 분류↔주성분/제품 교차표 — 상호 독립 → 동시 실행
+    def timed(st):
+        with report.stage(st.name, rows_in=len(src["list"])):   # 기준: 약제목록 행수
+            st.fn({})
+
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as ex:
+        futures = []
+        for st in stale:
+            print("[RUN]", st.name)
+            futures.append((st, ex.submit(timed, st)))
+        for st, fut in futures:
+            fut.result()     # 단계 예외는 여기서 그대로 전파
+            graph.record(st) # manifest 기록은 메인 스레드에서만
 
     print("\n[OK] 모든 산출물이 생성되었습니다.")
     print(f"     출력 폴더: {out_dir.resolve()}")
+    report.print_summary()
+    report.write_json(out_dir / "run_report_run_all.json")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+run_report.py — 빌더 공용 단계별 계측(시간/CPU/메모리/행수)
+
+  report = RunReport("build_applied_price_bundle")
+  with report.stage("load.applied") as st:
+      df = read_excel_all_sheets(path)
+      st.rows_out = len(df)
+  rec = report.start("normalize", rows_in=len(df)); ...; report.finish(rec, rows_out=len(out))
+  report.print_summary()
+  report.write_json(outdir / "run_report.json")
+
+기록 항목(단계별)
+  wall_s       경과 시간
+  cpu_s        프로세스 CPU 시간(user+sys, 모든 스레드 합산 — 동시 실행 단계끼리는 겹쳐 보임)
+  peak_rss_mb  단계 실행 중 관측된 최대 RSS(백그라운드 샘플링, 측정 불가 환경이면 None)
+  rows_in / rows_out / rows_per_s
+
+RSS 측정: Linux는 /proc/self/statm, 그 외는 psutil(있으면). 둘 다 없으면 getrusage 최고치만.
+함수 인자로 report=None을 허용하려면 stage(report, name) 헬퍼를 쓴다(None이면 기록 안 함).
+"""
+
+import os, sys, json, time, threading, platform
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import psutil                       # 선택 의존성
+except ImportError:                     # pragma: no cover
+    psutil = None
+
+try:
+    import resource                     # Windows에는 없음
+except ImportError:                     # pragma: no cover
+    resource = None
+
+_PAGE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+_STATM = Path("/proc/self/statm")
+
+def current_rss_mb() -> float | None:
+    if _STATM.exists():
+        try:
+            return int(_STATM.read_text().split()[1]) * _PAGE / 2**20
+        except (OSError, ValueError, IndexError):
+            pass
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / 2**20
+    return None
+
+def max_rss_mb() -> float | None:
+    """프로세스 생애 최고 RSS(getrusage). macOS는 bytes, Linux는 KB 단위."""
+    if resource is None:
+        return None
+    r = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return r / 2**20 if sys.platform == "darwin" else r / 2**10
+
+class _RssSampler(threading.Thread):
+    def __init__(self, interval: float):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak = current_rss_mb()
+        self._stop_ev = threading.Event()
+    def run(self):
+        while not self._stop_ev.wait(self.interval):
+            v = current_rss_mb()
+            if v is not None and (self.peak is None or v > self.peak):
+                self.peak = v
+    def stop(self) -> float | None:
+        self._stop_ev.set()
+        self.join()
+        v = current_rss_mb()
+        if v is not None and (self.peak is None or v > self.peak):
+            self.peak = v
+        return self.peak
+
+class StageRecord:
+    FIELDS = ("name", "wall_s", "cpu_s", "peak_rss_mb", "rows_in", "rows_out", "note")
+    __slots__ = FIELDS + ("_t0", "_c0", "_sampler")
+    def __init__(self, name, rows_in=None):
+        self.name = name
+        self.wall_s = self.cpu_s = 0.0
+        self.peak_rss_mb = None
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.note = ""
+        self._t0 = self._c0 = 0.0
+        self._sampler = None
+    @property
+    def rows_per_s(self) -> float | None:
+        n = self.rows_in if self.rows_in is not None else self.rows_out
+        if n is None or self.wall_s <= 0:
+            return None
+        return n / self.wall_s
+    def to_dict(self) -> dict:
+        d = {k: getattr(self, k) for k in self.FIELDS}
+        d["rows_per_s"] = self.rows_per_s
+        return d
+
+class RunReport:
+    def __init__(self, run_name: str, sample_interval: float = 0.05):
+        self.run_name = run_name
+        self.sample_interval = sample_interval
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self.stages: list[StageRecord] = []
+        self._lock = threading.Lock()
+        self._t0 = time.perf_counter()
+        self._c0 = time.process_time()
+
+    def start(self, name: str, rows_in=None) -> StageRecord:
+        """긴 main()을 들여쓰기 없이 구간 계측할 때: rec = start(...); ...; finish(rec, rows_out=...)"""
+        rec = StageRecord(name, rows_in)
+        if current_rss_mb() is not None:
+            rec._sampler = _RssSampler(self.sample_interval)
+            rec._sampler.start()
+        rec._t0, rec._c0 = time.perf_counter(), time.process_time()
+        return rec
+
+    def finish(self, rec: StageRecord, rows_out=None) -> StageRecord:
+        rec.wall_s = time.perf_counter() - rec._t0
+        rec.cpu_s = time.process_time() - rec._c0
+        rec.peak_rss_mb = rec._sampler.stop() if rec._sampler else max_rss_mb()
+        rec._sampler = None
+        if rows_out is not None:
+            rec.rows_out = rows_out
+        with self._lock:
+            self.stages.append(rec)
+        return rec
+
+    @contextmanager
+    def stage(self, name: str, rows_in=None):
+        rec = self.start(name, rows_in)
+        try:
+            yield rec
+        finally:
+            self.finish(rec)
+
+    # ---------- 출력 ----------
+    def totals(self) -> dict:
+        return {
+            "wall_s": time.perf_counter() - self._t0,
+            "cpu_s": time.process_time() - self._c0,
+            "max_rss_mb": max_rss_mb() or max((s.peak_rss_mb or 0 for s in self.stages), default=None),
+        }
+
+    def print_summary(self):
+        def f(v, fmt):
+            return format(v, fmt) if v is not None else "-"
+        print(f"\n[PERF] {self.run_name}")
+        print(f"  {'stage':<28}{'wall(s)':>9}{'cpu(s)':>9}{'peakMB':>9}{'rows_in':>11}{'rows_out':>11}{'rows/s':>11}")
+        for s in self.stages:
+            print(f"  {s.name:<28}{f(s.wall_s,'.2f'):>9}{f(s.cpu_s,'.2f'):>9}{f(s.peak_rss_mb,'.0f'):>9}"
+                  f"{f(s.rows_in,','):>11}{f(s.rows_out,','):>11}{f(s.rows_per_s,',.0f'):>11}")
+        t = self.totals()
+        print(f"  {'TOTAL':<28}{f(t['wall_s'],'.2f'):>9}{f(t['cpu_s'],'.2f'):>9}{f(t['max_rss_mb'],'.0f'):>9}")
+
+    def to_dict(self) -> dict:
+        return {
+            "run": self.run_name,
+            "started_at": self.started_at,
+            "host": {"python": platform.python_version(), "platform": platform.platform(), "pid": os.getpid()},
+            "stages": [s.to_dict() for s in self.stages],
+            "total": self.totals(),
+        }
+
+    def write_json(self, path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"[PERF] run report → {path}")
+        return path
+
+class _NullRecord:
+    rows_in = rows_out = note = None
+    def __setattr__(self, k, v):
+        pass
+
+@contextmanager
+def stage(report: RunReport | None, name: str, rows_in=None):
+    """report가 None이면 아무것도 기록하지 않는 stage()"""
+    if report is None:
+        yield _NullRecord()
+    else:
+        with report.stage(name, rows_in) as rec:
+            yield rec
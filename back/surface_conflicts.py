@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+surface_conflicts.py — 여러 lemma/주성분 클러스터에 걸린 표면형(충돌) 색인 + 정책 적용
+
+같은 표면형(surface_key 기준: 짧은 영문 성분 토큰, `캅셀→캡슐` 변형 등)이 여러 lemma_id 밑에 있으면
+OpenSearch가 질의를 서로 무관한 제품들로 확장한다. 행을 한 번 훑어 키 → lemma 다중 맵을 만들고
+(해시 groupby, 표면형 수에 선형), 충돌마다 확장 비용 점수를 매긴다.
+
+  n_lemmas      이 표면형을 가진 lemma(제품코드/주성분코드) 수 = 질의 확장 fan-out
+  n_canonicals  서로 다른 대표명 수(같은 브랜드의 규격 차이는 1로 묶임)
+  score         (n_canonicals - 1) × n_lemmas — 무관한 대표명으로 퍼지는 확장 비용
+
+정책(apply_policy)
+  report     보고서만(기본)
+  drop       n_canonicals > max_fanout 인 표면형 행 삭제
+  downboost  같은 조건의 행 boost × 1/n_canonicals
+
+  conf = find_conflicts(syn_df)                        # lemma_id / canonical / surface 컬럼
+  syn_df, n = apply_policy(syn_df, conf, "downboost", max_fanout=20)
+  write_report(conf, "outdir/04_surface_conflicts.csv")
+
+CLI:
+  python surface_conflicts.py --syn outdir/02_yakjejonghap_for_syn.csv --out outdir/04_surface_conflicts.csv
+  python surface_conflicts.py --jsonl out/synonyms_by_substance_code.jsonl --out out/surface_conflicts_substance.csv
+"""
+
+import json, argparse
+
+import pandas as pd
+
+from utils_kor import surface_key
+
+POLICIES = ("report", "drop", "downboost")
+SAMPLE = 5
+
+def find_conflicts(df: pd.DataFrame, lemma_col: str = "lemma_id", canon_col: str = "canonical",
+                   surface_col: str = "surface") -> pd.DataFrame:
+    """lemma 2개 이상에 걸린 표면형 키 → 점수순 DataFrame(key, surface, n_lemmas, n_canonicals, score, 예시)"""
+    t = pd.DataFrame({"key": df[surface_col].astype(str).map(surface_key),
+                      "surface": df[surface_col].astype(str),
+                      "lemma": df[lemma_col].astype(str),
+                      "canonical": df[canon_col].astype(str)})
+    t = t[t["key"] != ""]
+    g = t.groupby("key", sort=False)
+    stat = pd.DataFrame({"surface": g["surface"].first(),
+                         "n_lemmas": g["lemma"].nunique(),
+                         "n_canonicals": g["canonical"].nunique()})
+    stat = stat[stat["n_lemmas"] > 1]
+    stat["score"] = (stat["n_canonicals"] - 1) * stat["n_lemmas"]
+    # 예시는 충돌 키에 대해서만 모음
+    sub = t[t["key"].isin(stat.index)].drop_duplicates(["key", "canonical"])
+    ex = sub.groupby("key", sort=False).agg(
+        canonicals=("canonical", lambda s: " | ".join(s.iloc[:SAMPLE])),
+        lemmas=("lemma", lambda s: " | ".join(s.iloc[:SAMPLE])))
+    out = stat.join(ex).reset_index()
+    return out.sort_values(["score", "n_lemmas", "key"], ascending=[False, False, True], kind="mergesort") \
+              .reset_index(drop=True)
+
+def apply_policy(df: pd.DataFrame, conflicts: pd.DataFrame, policy: str = "report", max_fanout: int = 20,
+                 surface_col: str = "surface", boost_col: str = "boost") -> tuple[pd.DataFrame, int]:
+    """→ (적용 후 df, 영향받은 행 수). 기준: n_canonicals > max_fanout"""
+    if policy not in POLICIES:
+        raise ValueError(f"unknown conflict policy: {policy}")
+    if policy == "report" or conflicts.empty:
+        return df, 0
+    hot = conflicts.loc[conflicts["n_canonicals"] > max_fanout, ["key", "n_canonicals"]]
+    if hot.empty:
+        return df, 0
+    fan = df[surface_col].astype(str).map(surface_key).map(hot.set_index("key")["n_canonicals"])
+    hit = fan.notna()
+    if policy == "drop":
+        return df[~hit].reset_index(drop=True), int(hit.sum())
+    df = df.copy()
+    base = pd.to_numeric(df[boost_col], errors="coerce").fillna(1.0) if boost_col in df else 1.0
+    df[boost_col] = (base * (1.0 / fan.where(hit, 1.0))).round(4)
+    return df, int(hit.sum())
+
+def write_report(conflicts: pd.DataFrame, path):
+    conflicts.to_csv(path, index=False, encoding="utf-8-sig")
+
+def substance_rows(jsonl_path) -> pd.DataFrame:
+    """synonyms_by_substance_code.jsonl → (lemma_id=주성분코드, canonical=대표명, surface) 행"""
+    rows = []
+    with open(jsonl_path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            d = json.loads(line)
+            canon = d.get("preferred_label_ko") or d.get("preferred_label_en") or d.get("substance_code")
+            for s in d.get("synonyms") or []:
+                rows.append((d.get("substance_code"), canon, s))
+    return pd.DataFrame(rows, columns=["lemma_id", "canonical", "surface"])
+
+def main():
+    ap = argparse.ArgumentParser()
+    src = ap.add_mutually_exclusive_group(required=True)
+    src.add_argument("--syn", help="02_yakjejonghap_for_syn.csv")
+    src.add_argument("--jsonl", help="synonyms_by_substance_code.jsonl")
+    ap.add_argument("--out", required=True, help="충돌 보고서 CSV")
+    ap.add_argument("--top", type=int, default=15)
+    args = ap.parse_args()
+
+    df = (pd.read_csv(args.syn, dtype=str, encoding="utf-8-sig", keep_default_na=False) if args.syn
+          else substance_rows(args.jsonl))
+    conf = find_conflicts(df)
+    write_report(conf, args.out)
+    print(f"[OK] {len(conf):,} conflicting surfaces "
+          f"({int((conf['n_canonicals'] > 1).sum()):,} across different canonicals) → {args.out}")
+    for r in conf.head(args.top).itertuples(index=False):
+        print(f"  {r.score:>7,}  lemmas={r.n_lemmas:<5} canonicals={r.n_canonicals:<5} {r.surface}")
+
+if __name__ == "__main__":
+    main()
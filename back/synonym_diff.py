@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+synonym_diff.py — 동의어 규칙 파일 증분 쓰기(이전 빌드 상태 보관 + 변경분 diff)
+
+규칙 파일(03_rules_synonyms.txt, opensearch_synonyms_substance.txt)을 매번 통째로 다시 쓰면
+배포 쪽은 무엇이 바뀌었는지 몰라 분석기 리로드 + 전체 재색인을 하게 된다.
+내보내기 쪽에서 규칙을 키(lemma_id / 주성분코드)별 한 줄로 넘기면
+
+  <파일>              키 순으로 안정 정렬된 전체 파일(내용이 같으면 다시 쓰지 않음 → mtime 유지)
+  <파일>.state.json   {키: 줄} — 다음 빌드의 비교 기준
+  <파일>.diff.json    {"baseline", "empty", "counts", "added", "removed", "changed"}
+
+을 남긴다. 규칙 생성이 결정적이므로 바뀌지 않은 키의 줄은 바이트 단위로 같다.
+상태 파일이 없으면(첫 빌드) baseline=true — 배포는 전체 리로드로 처리.
+
+  diff = write_rules_incremental("outdir/03_rules_synonyms.txt", {lemma_id: line, ...})
+  if diff["empty"]: ...   # 리로드/재색인 생략
+
+CLI(두 상태 파일 비교):
+  python synonym_diff.py old.state.json new.state.json
+"""
+
+import os, json, argparse
+from pathlib import Path
+
+def state_path(path) -> Path:
+    p = Path(path)
+    return p.with_name(p.name + ".state.json")
+
+def diff_path(path) -> Path:
+    p = Path(path)
+    return p.with_name(p.name + ".diff.json")
+
+def load_state(path) -> dict | None:
+    p = Path(path)
+    if not p.exists():
+        return None
+    with open(p, encoding="utf-8") as f:
+        return json.load(f)
+
+def diff_rules(old: dict | None, new: dict) -> dict:
+    """old/new: {키: 줄}. 목록은 키 순 정렬"""
+    base = old is None
+    old = old or {}
+    added = [{"key": k, "line": new[k]} for k in sorted(new.keys() - old.keys())]
+    removed = [{"key": k, "line": old[k]} for k in sorted(old.keys() - new.keys())]
+    changed = [{"key": k, "old": old[k], "new": new[k]}
+               for k in sorted(new.keys() & old.keys()) if old[k] != new[k]]
+    return {"baseline": base, "empty": not (base or added or removed or changed),
+            "counts": {"total": len(new), "added": len(added), "removed": len(removed), "changed": len(changed)},
+            "added": added, "removed": removed, "changed": changed}
+
+def _write_text(path: Path, text: str):
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+def write_rules_incremental(path, rules: dict) -> dict:
+    """rules: {키: 규칙 한 줄}. 빈 줄은 제외. 반환: diff(dict) — .diff.json에도 저장"""
+    path = Path(path)
+    rules = {str(k): v for k, v in rules.items() if v}
+    d = diff_rules(load_state(state_path(path)), rules)
+    text = "\n".join(rules[k] for k in sorted(rules))
+    if not path.exists() or path.read_text(encoding="utf-8") != text:
+        _write_text(path, text)
+    _write_text(state_path(path), json.dumps(rules, ensure_ascii=False, sort_keys=True, indent=0))
+    _write_text(diff_path(path), json.dumps(d, ensure_ascii=False, indent=1))
+    return d
+
+def summary(d: dict) -> str:
+    c = d["counts"]
+    if d["baseline"]:
+        return f"baseline ({c['total']:,} rules, 이전 상태 없음)"
+    if d["empty"]:
+        return f"no change ({c['total']:,} rules)"
+    return f"+{c['added']:,} -{c['removed']:,} ~{c['changed']:,} / {c['total']:,} rules"
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("old_state")
+    ap.add_argument("new_state")
+    ap.add_argument("--out", default="", help="diff JSON 저장 경로")
+    args = ap.parse_args()
+    d = diff_rules(load_state(args.old_state), load_state(args.new_state) or {})
+    print(f"[OK] {summary(d)}")
+    for e in d["changed"][:10]:
+        print(f"  ~ {e['key']}\n    - {e['old'][:100]}\n    + {e['new'][:100]}")
+    if args.out:
+        Path(args.out).write_text(json.dumps(d, ensure_ascii=False, indent=1), encoding="utf-8")
+
+if __name__ == "__main__":
+    main()
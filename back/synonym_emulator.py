@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""
+synonym_emulator.py — OpenSearch synonym_graph 필터 오프라인 에뮬레이터(확장 비용 측정)
+
+opensearch_synonyms_substance.txt(`표면형, ... => 대표`)·03_rules_synonyms.txt(`대표 => 표면형, ...`)를
+synonym_graph(format=solr)와 같은 방식으로 파싱해 규칙 맵을 만들고, 질의 로그를 흘려 보내
+확장 fan-out / 토큰 그래프 크기 / 경로 수를 잰다. 라이브 클러스터 없이 캡·부스트를 조정하기 위한 도구.
+
+파싱(Solr 형식)
+  - `#` 주석, 빈 줄 무시. `\\,` `\\=>` 이스케이프 허용
+  - `a, b => c, d`  명시 매핑: a, b 각각 → c, d (원래 토큰은 대체)
+  - `a, b, c`       동치: expand=true면 모두 → 모두, false면 모두 → a
+  - 같은 좌변이 여러 줄에 나오면 출력은 합쳐진다(SynonymMap dedup)
+  - 항목은 분석기(tokenizer + lowercase)로 토큰열이 되고, 토큰이 0개면 클러스터에서 로드 오류
+    (괄호 안 쉼표로 잘린 `2-데옥시-...(18F` 같은 항목은 `unbalanced`로 따로 센다)
+
+질의 확장: 토큰열에서 왼쪽부터 가장 긴 좌변을 찾고(SynonymGraphFilter와 같은 greedy longest match),
+  fan-out     = 매칭 하나가 내는 대안 수
+  graph_tokens = 출력 토큰 그래프의 간선 수(대안별 토큰 수 합 + 매칭 안 된 토큰)
+  paths       = 질의 전체 경로 수(매칭마다 fan-out 곱, phrase 질의 비용의 상한)
+
+  em = SynonymEmulator.from_files(["out/opensearch_synonyms_substance.txt"], tokenizer="standard")
+  em.expand("아세트아미노펜 500mg")   # Expansion(tokens, matches, graph_tokens, paths, max_fanout)
+  em.report(queries)                  # 백분위 요약 dict
+
+CLI:
+  python synonym_emulator.py --rules outdir/03_rules_synonyms.txt --queries queries.txt --caps 10,20,50
+  python synonym_emulator.py --rules out/opensearch_synonyms_substance.txt --json synonym_cost.json
+"""
+
+import re, json, time, argparse
+from collections import namedtuple
+from pathlib import Path
+
+Expansion = namedtuple("Expansion", "tokens matches graph_tokens paths max_fanout")
+PATHS_CAP = 10 ** 12   # 경로 수는 곱이라 폭주 → 상한에서 멈춤
+
+_STANDARD = re.compile(r'[^\W_]+(?:[.,][^\W_]+)*')
+
+def make_tokenizer(kind: str = "standard", lowercase: bool = True):
+    """standard ≈ UAX#29 단어 경계(숫자 내부 ./, 유지), whitespace, keyword(항목 통째)"""
+    if kind == "standard":
+        split = _STANDARD.findall
+    elif kind == "whitespace":
+        split = str.split
+    elif kind == "keyword":
+        split = lambda s: [s.strip()] if s.strip() else []
+    else:
+        raise ValueError(f"unknown tokenizer: {kind}")
+    if lowercase:
+        return lambda s: tuple(t.lower() for t in split(s))
+    return lambda s: tuple(split(s))
+
+def split_terms(side: str) -> list[str]:
+    """쉼표 분리(백슬래시 이스케이프 해제), 앞뒤 공백 제거"""
+    out, buf, esc = [], [], False
+    for ch in side:
+        if esc:
+            buf.append(ch); esc = False
+        elif ch == "\\":
+            esc = True
+        elif ch == ",":
+            out.append("".join(buf).strip()); buf = []
+        else:
+            buf.append(ch)
+    out.append("".join(buf).strip())
+    return [t for t in out if t]
+
+def _unbalanced(term: str) -> bool:
+    return term.count("(") != term.count(")")
+
+class SynonymEmulator:
+    def __init__(self, tokenizer: str = "standard", lowercase: bool = True, expand: bool = True, cap: int = 0):
+        self.analyze = make_tokenizer(tokenizer, lowercase)
+        self.expand_equiv = expand
+        self.cap = cap                       # >0이면 줄마다 각 변의 항목을 앞에서 cap개로 자름(캡 what-if)
+        self.rules: dict[tuple, set] = {}    # 좌변 토큰열 → {출력 토큰열}
+        self.sources: dict[tuple, set] = {}  # 좌변 토큰열 → {줄 번호}
+        self.max_lhs = 0
+        self.lines = 0
+        self.errors = {"empty_term": 0, "bad_line": 0, "unbalanced": 0}
+
+    # ---------- 규칙 ----------
+    def add_line(self, line: str, lineno: int = 0):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            return
+        self.lines += 1
+        parts = re.split(r'(?<!\\)=>', line)
+        if len(parts) > 2:
+            self.errors["bad_line"] += 1
+            return
+        sides = [split_terms(p) for p in parts]
+        if self.cap:
+            sides = [s[:self.cap] for s in sides]
+        for s in sides:
+            self.errors["unbalanced"] += sum(_unbalanced(t) for t in s)
+        seqs = []
+        for s in sides:
+            toks = []
+            for t in s:
+                a = self.analyze(t)
+                if a:
+                    toks.append(a)
+                else:
+                    self.errors["empty_term"] += 1
+            seqs.append(list(dict.fromkeys(toks)))
+        if len(seqs) == 2:
+            lhs, rhs = seqs
+        else:
+            lhs = seqs[0]
+            rhs = seqs[0] if self.expand_equiv else seqs[0][:1]
+        if not rhs:
+            return
+        for k in lhs:
+            self.rules.setdefault(k, set()).update(rhs)
+            self.sources.setdefault(k, set()).add(lineno)
+            if len(k) > self.max_lhs:
+                self.max_lhs = len(k)
+
+    def add_file(self, path):
+        with open(path, encoding="utf-8-sig") as f:
+            for i, line in enumerate(f, 1):
+                self.add_line(line, i)
+        return self
+
+    @classmethod
+    def from_files(cls, paths, **kw) -> "SynonymEmulator":
+        em = cls(**kw)
+        for p in paths:
+            em.add_file(p)
+        return em
+
+    # ---------- 확장 ----------
+    def expand(self, query: str) -> Expansion:
+        toks = self.analyze(query)
+        rules, n = self.rules, len(toks)
+        i = matches = graph = max_fan = 0
+        paths = 1
+        while i < n:
+            hit = None
+            for L in range(min(self.max_lhs, n - i), 0, -1):
+                out = rules.get(toks[i:i + L])
+                if out is not None:
+                    hit = (L, out)
+                    break
+            if hit is None:
+                graph += 1; i += 1
+                continue
+            L, out = hit
+            matches += 1
+            graph += sum(len(o) for o in out)
+            max_fan = max(max_fan, len(out))
+            paths = min(PATHS_CAP, paths * len(out))
+            i += L
+        return Expansion(n, matches, graph, paths, max_fan)
+
+    # ---------- 요약 ----------
+    def fanout_stats(self) -> dict:
+        fan = sorted(len(v) for v in self.rules.values())
+        toks = sorted(sum(len(o) for o in v) for v in self.rules.values())
+        return {"lhs_keys": len(fan), "fanout": _pcts(fan), "graph_tokens_per_match": _pcts(toks)}
+
+    def ambiguous(self, limit: int = 20) -> list[dict]:
+        """여러 줄(=여러 대표/규칙)에서 정의돼 출력이 합쳐진 좌변 — fan-out이 큰 순"""
+        amb = [(k, v) for k, v in self.sources.items() if len(v) > 1]
+        amb.sort(key=lambda kv: (-len(self.rules[kv[0]]), -len(kv[1])))
+        return [{"lhs": " ".join(k), "lines": len(v), "fanout": len(self.rules[k]),
+                 "outputs": [" ".join(o) for o in sorted(self.rules[k])[:5]]} for k, v in amb[:limit]]
+
+    def report(self, queries, top: int = 10) -> dict:
+        exps = [self.expand(q) for q in queries]
+        worst = sorted(zip(queries, exps), key=lambda qe: -qe[1].graph_tokens)[:top]
+        n_amb = sum(1 for v in self.sources.values() if len(v) > 1)
+        return {
+            "lines": self.lines, "errors": dict(self.errors), "ambiguous_lhs": n_amb,
+            **self.fanout_stats(),
+            "queries": len(exps),
+            "matched_rate": round(sum(1 for e in exps if e.matches) / len(exps), 4) if exps else None,
+            "query_graph_tokens": _pcts(sorted(e.graph_tokens for e in exps)),
+            "query_paths": _pcts(sorted(e.paths for e in exps)),
+            "query_max_fanout": _pcts(sorted(e.max_fanout for e in exps)),
+            "worst_queries": [{"q": q, **e._asdict()} for q, e in worst],
+        }
+
+def _pcts(sorted_vals) -> dict:
+    if not sorted_vals:
+        return {}
+    n = len(sorted_vals)
+    pick = lambda p: sorted_vals[min(n - 1, int(p / 100 * n))]
+    return {"p50": pick(50), "p90": pick(90), "p95": pick(95), "p99": pick(99),
+            "max": sorted_vals[-1], "mean": round(sum(sorted_vals) / n, 2)}
+
+def read_queries(path: str) -> list[str]:
+    with open(path, encoding="utf-8-sig") as f:
+        return [l.strip() for l in f if l.strip()]
+
+def lhs_queries(em: SynonymEmulator) -> list[str]:
+    """질의 로그가 없을 때: 모든 좌변을 한 번씩 질의한 것으로 간주(최악 근사)"""
+    return [" ".join(k) for k in em.rules]
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rules", action="append", required=True, help="Solr 형식 동의어 파일(여러 번 가능)")
+    ap.add_argument("--queries", default="", help="질의 로그(한 줄에 하나). 없으면 모든 좌변")
+    ap.add_argument("--tokenizer", choices=["standard", "whitespace", "keyword"], default="standard")
+    ap.add_argument("--no-lowercase", action="store_true")
+    ap.add_argument("--no-expand", action="store_true", help="동치 줄을 첫 항목으로만 매핑(expand=false)")
+    ap.add_argument("--caps", default="", help="줄당 항목 캡 what-if 비교(예: 10,20,50)")
+    ap.add_argument("--top", type=int, default=10)
+    ap.add_argument("--json", default="", help="보고서 JSON 저장 경로")
+    args = ap.parse_args()
+
+    kw = dict(tokenizer=args.tokenizer, lowercase=not args.no_lowercase, expand=not args.no_expand)
+    t0 = time.perf_counter()
+    em = SynonymEmulator.from_files(args.rules, **kw)
+    queries = read_queries(args.queries) if args.queries else lhs_queries(em)
+    rep = em.report(queries, args.top)
+    rep["load_s"] = round(time.perf_counter() - t0, 2)
+    print(f"[OK] {rep['lines']:,} lines, {rep['lhs_keys']:,} lhs keys, errors={rep['errors']}, "
+          f"ambiguous lhs={rep['ambiguous_lhs']:,}")
+    print(f"     fan-out per lhs   {rep['fanout']}")
+    print(f"     query graph toks  {rep['query_graph_tokens']}  ({rep['queries']:,} queries, matched {rep['matched_rate']})")
+    print(f"     query paths       {rep['query_paths']}")
+    print("     worst queries:")
+    for w in rep["worst_queries"]:
+        print(f"       {w['graph_tokens']:>6} toks  fan-out {w['max_fanout']:>4}  {w['q'][:60]}")
+    amb = em.ambiguous(args.top)
+    if amb:
+        print("     ambiguous lhs (여러 줄에서 정의):")
+        for a in amb:
+            print(f"       {a['fanout']:>4} outputs / {a['lines']} lines  {a['lhs'][:50]}")
+    rep["ambiguous"] = amb
+
+    if args.caps:
+        rep["caps"] = {}
+        print("     cap  lhs_keys  fanout_p99  graph_toks_p50/p95/p99/max")
+        for cap in (int(x) for x in args.caps.split(",") if x.strip()):
+            r = SynonymEmulator.from_files(args.rules, cap=cap, **kw).report(queries, 0)
+            g = r["query_graph_tokens"]
+            rep["caps"][cap] = {k: r[k] for k in ("lhs_keys", "fanout", "query_graph_tokens", "query_paths")}
+            print(f"     {cap:>3}  {r['lhs_keys']:>8,}  {r['fanout'].get('p99', 0):>10}  "
+                  f"{g.get('p50')}/{g.get('p95')}/{g.get('p99')}/{g.get('max')}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(rep, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"[OK] report → {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -20,6 +20,12 @@ def read_korean_csv(path: str | Path, dtype=str) -> pd.DataFrame:
             last_err = e
     raise last_err
 
+def load_hira_list(path: str | Path) -> pd.DataFrame:
+    """HIRA 약제목록 엑셀 로드 + 9자리 제품코드 행만 남기기(빌더 공용)"""
+    df = pd.read_excel(path, dtype=str).rename(columns=lambda c: c.strip())
+    df['제품코드'] = df['제품코드'].astype(str).str.replace(r'\D','', regex=True)
+    return df[df['제품코드'].str.len()==9].reset_index(drop=True)
+
 def norm_text(s: str | None) -> str | None:
     if s is None:
         return None
@@ -28,6 +34,35 @@ def norm_text(s: str | None) -> str | None:
     s = s.replace('（','(').replace('）',')')       # 전각괄호→반각
     return s
 
+# 조회 키: norm_text + 괄호 통일(번들 BRMAP과 동일) + 공백 제거 + 소문자
+# 빌더가 만든 공백삭제/소문자 변형과 같은 키로 모이며, surface_key(surface_key(x)) == surface_key(x)
+_KEY_MAP = str.maketrans({
+    "（":"(", "［":"(", "｛":"(", "{":"(", "[":"(", "【":"(", "〔":"(",
+    "）":")", "］":")", "｝":")", "}":")", "]":")", "】":")", "〕":")",
+    "\ufeff":"", "ᆞ":"·", "ㆍ":"·", "，":",",
+})
+
+def surface_key(s: str | None) -> str:
+    if s is None:
+        return ""
+    return "".join(str(s).translate(_KEY_MAP).split()).lower()
+
+# 한글 음절 → 호환 자모(초성/중성/종성), 초성만
+_CHO  = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_JONG = ["", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ", "ㄿ", "ㅀ",
+         "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+_JAMO_TABLE = {0xAC00 + i: _CHO[i // 588] + _JUNG[(i % 588) // 28] + _JONG[i % 28] for i in range(11172)}
+_CHOSUNG_TABLE = {0xAC00 + i: _CHO[i // 588] for i in range(11172)}
+
+def to_jamo(s: str | None) -> str:
+    """surface_key 후 한글 음절 → 호환 자모(아 → ㅇㅏ)"""
+    return surface_key(s).translate(_JAMO_TABLE)
+
+def to_chosung(s: str | None) -> str:
+    """surface_key 후 한글 음절 → 초성(아시클로버 → ㅇㅅㅋㄹㅂ), 그 외 문자는 그대로"""
+    return surface_key(s).translate(_CHOSUNG_TABLE)
+
 # 괄호 토큰 추출 필터
 _UNIT_TOKENS = set("회 병 매 정 캡슐 펌프 회분 팩 튜브 스틱 패취 패치 포".split())
 _UNIT_RX = r'(mg|g|mL|mcg|µg|㎖|㎎|%|U\b|정\b|캡슐\b|병\b|회\b)'
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+variants.py — 표기 변형 공용 엔진(지연 생성 + 우선순위 + lemma별 예산)
+
+번들(generate_variants), solution/final_perfect_fix(generate_korean_variants),
+scripts/create_final_dict, scripts/pharma_preprocessor(현 dict_processor create_final/preprocess 정책)가
+각자 하이픈/공백/괄호 변형을 set으로 한꺼번에 만든 뒤 `[:15]`, `[:2]`처럼 잘라 쓰던 것을 하나로 모았다.
+
+  - 규칙은 이름 붙은 단일 치환(RULES), 프로필(PROFILES)은 규칙 이름의 우선순위 튜플
+  - iter_variants는 제너레이터: 규칙 순서대로 하나씩 만들어 원문/대표형(exclude)/이미 낸 변형과 같으면 건너뜀
+    (원문 하나당 변형은 규칙 수 이하라 중간 set 없이 짧은 튜플 비교로 충분)
+  - Budget을 같은 lemma의 모든 표면형 호출에 넘기면 lemma 전체에서 n개를 낸 뒤 바로 멈춤 —
+    변형 문자열 자체를 더 만들지 않는다
+
+  for v in iter_variants("세파클러-캅셀", "bundle"): ...
+  b = Budget(8)
+  for s in surfaces_of_lemma:
+      out += variants(s, ("bundle", "korean"), exclude=(canonical,), budget=b)
+
+프로필
+  bundle  캅셀→캡슐, 하이픈 제거, 공백 제거, `·`→공백     (build_applied_price_bundle)
+  korean  공백 제거, 하이픈→공백, 하이픈 제거              (final_perfect_fix 한글 성분명)
+  dict    하이픈 제거, 하이픈→공백, 괄호 제거              (scripts/ 사전 후처리)
+"""
+
+import re
+from functools import lru_cache
+
+_WS = re.compile(r'\s+')
+_PAREN = re.compile(r'\([^)]*\)')
+
+def _squash(s: str) -> str:
+    return _WS.sub(" ", s).strip()
+
+RULES = {
+    "capsule":      lambda s: s.replace("캅셀", "캡슐"),
+    "no_hyphen":    lambda s: s.replace("-", ""),
+    "hyphen_space": lambda s: _squash(s.replace("-", " ")) if "-" in s else s,
+    "no_space":     lambda s: s.replace(" ", ""),
+    "middot_space": lambda s: s.replace("·", " "),
+    "no_paren":     lambda s: _squash(_PAREN.sub("", s)) if "(" in s and ")" in s else s,
+}
+
+PROFILES = {
+    "bundle": ("capsule", "no_hyphen", "no_space", "middot_space"),
+    "korean": ("no_space", "hyphen_space", "no_hyphen"),
+    "dict":   ("no_hyphen", "hyphen_space", "no_paren"),
+}
+
+class Budget:
+    """lemma 하나에 허용하는 변형 수. take()가 False면 생성 중단"""
+    __slots__ = ("remaining",)
+
+    def __init__(self, n: int | None):
+        self.remaining = n
+
+    def take(self) -> bool:
+        if self.remaining is None:
+            return True
+        if self.remaining <= 0:
+            return False
+        self.remaining -= 1
+        return True
+
+    @property
+    def exhausted(self) -> bool:
+        return self.remaining is not None and self.remaining <= 0
+
+@lru_cache(maxsize=None)
+def rule_names(profiles) -> tuple:
+    """프로필 이름(또는 이름 튜플/규칙 이름) → 중복 없는 규칙 이름 튜플(앞 프로필 우선)"""
+    if isinstance(profiles, str):
+        profiles = (profiles,)
+    out = []
+    for p in profiles:
+        for r in PROFILES.get(p, (p,)):
+            if r not in RULES:
+                raise ValueError(f"unknown variant rule/profile: {p}")
+            if r not in out:
+                out.append(r)
+    return tuple(out)
+
+def iter_variants(text: str, profiles="bundle", exclude=(), budget: Budget | None = None):
+    """원문과 다른 변형을 우선순위 순으로 하나씩. exclude(대표형 등)와 같은 것은 건너뜀"""
+    s = (text or "").strip()
+    if not s:
+        return
+    emitted = ()
+    for name in rule_names(profiles):
+        if budget is not None and budget.exhausted:
+            return
+        v = RULES[name](s).strip()
+        if not v or v == s or v in emitted or v in exclude:
+            continue
+        if budget is not None and not budget.take():
+            return
+        emitted += (v,)
+        yield v
+
+def variants(text: str, profiles="bundle", exclude=(), budget: Budget | None = None,
+             limit: int | None = None, include_self: bool = False) -> list[str]:
+    """iter_variants 목록판. include_self=True면 원문을 맨 앞에(예산에는 세지 않음). limit은 목록 전체 길이"""
+    s = (text or "").strip()
+    out = [s] if include_self and s and s not in exclude else []
+    it = iter_variants(s, profiles, exclude, budget)
+    while limit is None or len(out) < limit:     # limit에 닿으면 다음 변형은 만들지 않음
+        v = next(it, None)
+        if v is None:
+            break
+        out.append(v)
+    return out
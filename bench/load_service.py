@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+load_service.py — back/lookup_service.py 부하 테스트(asyncio 클라이언트, 표준 라이브러리)
+
+keep-alive 연결 N개로 요청을 계속 보내 처리량(req/s, item/s)과 지연 분위수(p50/p90/p99/max)를 잰다.
+--batch > 1 이면 POST 배치 엔드포인트로 질의 B개씩 묶어 보낸다. 끝나면 서버 /health의 캐시 적중률도 출력.
+
+질의: --queries 파일(한 줄에 하나, 또는 CSV + --column) / 없으면 합성 제품명(synth_corpus, 대부분 캐시 미스)
+
+사용 예:
+  python ../back/lookup_service.py --syn_dir ../back/out --bundle_dir ../back/outdir &
+  python load_service.py --endpoint resolve --concurrency 32 --requests 20000
+  python load_service.py --endpoint product --queries ../back/outdir/01_applied_price_enriched.csv --column 제품코드 --batch 100
+  python load_service.py --endpoint autocomplete --queries prefixes.txt --json ./load_ac.json
+"""
+
+import csv, json, time, random, asyncio, argparse
+from urllib.parse import urlsplit, quote
+
+from synth_corpus import generate_names
+
+ENDPOINTS = ("resolve", "expand", "autocomplete", "product")
+
+def load_queries(path: str, column: str, n_synth: int, seed: int) -> list[str]:
+    if not path:
+        return generate_names(n_synth, seed)
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        if column:
+            return [r[column].strip() for r in csv.DictReader(f) if (r.get(column) or "").strip()]
+        return [l.strip() for l in f if l.strip()]
+
+def _request(method: str, host: str, path: str, body: bytes = b"") -> bytes:
+    head = f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nConnection: keep-alive\r\n"
+    if body:
+        head += f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+    return (head + "\r\n").encode("latin-1") + body
+
+async def _read_response(reader) -> tuple[int, bytes]:
+    status = int((await reader.readline()).split()[1])
+    n = 0
+    while True:
+        h = await reader.readline()
+        if h in (b"\r\n", b"\n", b""):
+            break
+        k, _, v = h.decode("latin-1").partition(":")
+        if k.strip().lower() == "content-length":
+            n = int(v)
+    return status, (await reader.readexactly(n) if n else b"")
+
+async def _worker(host, port, reqs: asyncio.Queue, lat: list, errors: list):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while True:
+            try:
+                raw = reqs.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            t = time.perf_counter()
+            writer.write(raw)
+            await writer.drain()
+            status, _ = await _read_response(reader)
+            lat.append((time.perf_counter() - t) * 1000)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+async def _get_json(host, port, path):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(_request("GET", host, path)); await writer.drain()
+    _, body = await _read_response(reader)
+    writer.close()
+    return json.loads(body)
+
+def _pct(sorted_vals, p):
+    return sorted_vals[min(len(sorted_vals) - 1, int(p / 100 * len(sorted_vals)))] if sorted_vals else float("nan")
+
+async def run(args, queries):
+    u = urlsplit(args.url)
+    host, port = u.hostname, u.port or 80
+    rng = random.Random(args.seed)
+    extra = args.params
+    reqs = asyncio.Queue()
+    for _ in range(args.requests):
+        if args.batch > 1:
+            body = {"q": [rng.choice(queries) for _ in range(args.batch)]}
+            body.update(dict(p.split("=", 1) for p in extra))
+            reqs.put_nowait(_request("POST", host, f"/{args.endpoint}",
+                                     json.dumps(body, ensure_ascii=False).encode("utf-8")))
+        else:
+            qs = "&".join([f"q={quote(rng.choice(queries))}"] + extra)
+            reqs.put_nowait(_request("GET", host, f"/{args.endpoint}?{qs}"))
+    before = await _get_json(host, port, "/health")
+    lat, errors = [], []
+    t0 = time.perf_counter()
+    await asyncio.gather(*(_worker(host, port, reqs, lat, errors) for _ in range(args.concurrency)))
+    wall = time.perf_counter() - t0
+    after = await _get_json(host, port, "/health")
+    hits = after["cache"]["hits"] - before["cache"]["hits"]
+    misses = after["cache"]["misses"] - before["cache"]["misses"]
+    s = sorted(lat)
+    return {"endpoint": args.endpoint, "requests": len(lat), "batch": args.batch, "concurrency": args.concurrency,
+            "wall_s": round(wall, 3), "req_per_s": round(len(lat) / wall, 1),
+            "items_per_s": round(len(lat) * args.batch / wall, 1),
+            "p50_ms": round(_pct(s, 50), 3), "p90_ms": round(_pct(s, 90), 3), "p99_ms": round(_pct(s, 99), 3),
+            "max_ms": round(s[-1], 3) if s else None, "errors": len(errors),
+            "cache_hit_rate": round(hits / (hits + misses), 4) if hits + misses else None}
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--url", default="http://127.0.0.1:8765")
+    ap.add_argument("--endpoint", choices=ENDPOINTS, default="resolve")
+    ap.add_argument("--queries", default="", help="질의 파일(줄 단위) 또는 CSV(--column 지정)")
+    ap.add_argument("--column", default="", help="--queries가 CSV일 때 사용할 컬럼")
+    ap.add_argument("--synth", type=int, default=5000, help="--queries 없을 때 합성 제품명 수")
+    ap.add_argument("--requests", type=int, default=10000)
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--batch", type=int, default=1, help=">1이면 POST 배치(요청당 질의 수)")
+    ap.add_argument("--param", dest="params", action="append", default=[],
+                    help="추가 옵션 key=value(예: k=5, as_of=2025-08-15, all=1)")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--json", default="", help="결과 JSON 저장 경로")
+    args = ap.parse_args()
+
+    queries = load_queries(args.queries, args.column, args.synth, args.seed)
+    if not queries:
+        raise SystemExit("[ERR] 질의가 없습니다")
+    print(f"[RUN] {args.endpoint}: {args.requests:,} requests × batch {args.batch}, "
+          f"concurrency {args.concurrency}, {len(queries):,} distinct queries")
+    res = asyncio.run(run(args, queries))
+    print(f"[OK] {res['req_per_s']:,.0f} req/s ({res['items_per_s']:,.0f} items/s)  "
+          f"p50={res['p50_ms']}ms p90={res['p90_ms']}ms p99={res['p99_ms']}ms max={res['max_ms']}ms  "
+          f"errors={res['errors']}  cache hit={res['cache_hit_rate']}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(res, f, ensure_ascii=False, indent=2)
+        print(f"[OK] saved → {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,454 @@
+# -*- coding: utf-8 -*-
+"""
+run_bench.py — 정규화/병합/유의어 산출/사전 처리기 벤치마크 + 성능 회귀 게이트(합성 코퍼스)
+
+측정 대상(각 규모별, 이름은 --only 접두어로 선택)
+  fn.*       extract_pumyeong / components_from_name / normalize_general
+  rule.*     정규화 규칙 단위(drop_trailing_dose, drop_dose_anywhere, drop_orphan_units, drop_pack_tokens,
+             outer_paren_segments, split_outside_parens, unify+norm_spaces, is_pure_dose/has_form)
+  merge      merge_pharma_data.merge_frames (적용약가 + 약가마스터 + ATC)
+  bundle.*   build_applied_price_bundle 단계(latest, atc/subs 집계, enrich, syn_rows, write_rules)
+  resolver.* back/drug_resolver.py 인덱스 구축 / 배치 조회
+  extractor.* back/mention_extractor.py 자유 텍스트 언급 태깅(합성 메모)
+  fuzzy.*    back/fuzzy_matcher.py 자모 오타 질의(rows = 질의 수)
+  scripts.*  scripts/ 사전 처리기(합성 '=>' 사전 라인). scripts.dict_processor.<정책> = dict_processor.POLICIES 각각
+
+회귀 게이트
+  --save-baseline base.json       결과(rows/s)를 기준선으로 저장
+  --compare base.json             기준선 대비 비교표 출력, --max-regress(%)보다 느려진 항목이 있으면 exit 1
+  --repeat N                      항목별 N회 실행 중 최고 처리량 사용(노이즈 완화)
+
+사용 예:
+  python run_bench.py                                        # 50k, 500k, 5M
+  python run_bench.py --sizes 50k --only fn.,merge
+  python run_bench.py --sizes 50k --repeat 3 --save-baseline ./baseline_50k.json
+  python run_bench.py --sizes 50k --repeat 3 --compare ./baseline_50k.json --max-regress 10
+"""
+
+import io, sys, ast, gc, json, argparse, tempfile, platform, contextlib
+from datetime import datetime
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+ROOT = HERE.parent
+sys.path.insert(0, str(ROOT / "back"))
+sys.path.insert(0, str(ROOT / "merged_data"))
+sys.path.append(str(ROOT / "scripts"))          # dict_processor (scripts/*_processor는 이 모듈의 얇은 래퍼)
+
+import pandas as pd
+from synth_corpus import generate_tables, generate_dict_lines
+from run_report import RunReport
+import build_applied_price_bundle as bundle
+from merge_pharma_data import merge_frames
+from drug_resolver import DrugResolver
+from mention_extractor import MentionExtractor
+from fuzzy_matcher import FuzzyMatcher
+import dict_processor
+
+DEFAULT_SIZES = (50_000, 500_000, 5_000_000)
+BASELINE_VERSION = 1
+
+# ---------- scripts/ 로더: 모듈 최상위 파일 I/O 없이 함수 정의만 ----------
+def load_script_defs(path: Path) -> dict:
+    """
+    scripts/*.py 중 상당수는 최상위에서 하드코딩 경로를 열기 때문에 import 불가.
+    import/def/class/단순 대입만 남기고(open() 호출 포함 대입 제외) 실행한 네임스페이스를 돌려준다.
+    """
+    tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+    def uses_open(node):
+        return any(isinstance(n, ast.Call) and getattr(n.func, "id", "") == "open" for n in ast.walk(node))
+    keep = [n for n in tree.body
+            if isinstance(n, (ast.Import, ast.ImportFrom, ast.FunctionDef, ast.ClassDef))
+            or (isinstance(n, ast.Assign) and not uses_open(n))]
+    ns = {"__name__": f"bench_{path.stem}", "__file__": str(path)}
+    exec(compile(ast.Module(body=keep, type_ignores=[]), str(path), "exec"), ns)
+    return ns
+
+_SCRIPTS = {}
+def script(name: str) -> dict:
+    if name not in _SCRIPTS:
+        _SCRIPTS[name] = load_script_defs(ROOT / "scripts" / f"{name}.py")
+    return _SCRIPTS[name]
+
+@contextlib.contextmanager
+def quiet():
+    """처리기들의 진행률 print 억제(측정 대상 아님)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+# ---------- 공용 입력(측정 제외, 규모별 1회 생성) ----------
+def _names(data):
+    return data["products"]["제품명"]
+
+def _segments(data, cache):
+    if "segments" not in cache:
+        cache["segments"] = [seg for nm in _names(data).head(100_000) for seg in bundle.outer_paren_segments(nm)]
+    return cache["segments"]
+
+def _enriched(data, cache) -> pd.DataFrame:
+    """01 테이블 형태. 앞 벤치 결과가 있으면 재사용"""
+    if "enriched" in cache:
+        return cache["enriched"]
+    p = data["products"]
+    pum = cache.get("pumyeong")
+    if pum is None: pum = p["제품명"].map(bundle.extract_pumyeong)
+    comp = cache.get("components")
+    if comp is None: comp = p["제품명"].map(bundle.components_from_name)
+    ko = p["성분_KO"].map(bundle.normalize_general)
+    en = p["성분_EN"].map(bundle.english_only)
+    cache["enriched"] = pd.DataFrame({
+        "제품코드": p["제품코드"], "제품명": p["제품명"], "품명_정제": pum,
+        "주성분코드": p["주성분코드"], "성분명_KO": ko, "성분명_EN": en,
+        "성분_정제": ko.where(ko != "", comp), "업체명": p["업체명"], "상한금액": p["상한금액"],
+    })
+    return cache["enriched"]
+
+def _dict_file(data, cache, fmt="arrow") -> Path:
+    key = f"dict_{fmt}"
+    if key not in cache:
+        lines = generate_dict_lines(data["n_dict"], data["seed"], fmt=fmt)
+        p = Path(cache["tmpdir"]) / f"{key}.txt"
+        p.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        cache[key] = p
+    return cache[key]
+
+# ---------- 벤치 함수: (data, cache) → rows_out ----------
+def b_extract_pumyeong(data, cache):
+    cache["pumyeong"] = _names(data).map(bundle.extract_pumyeong)
+    return len(cache["pumyeong"])
+
+def b_components_from_name(data, cache):
+    cache["components"] = _names(data).map(bundle.components_from_name)
+    return len(cache["components"])
+
+def b_normalize_general(data, cache):
+    p = data["products"]
+    raw = p["성분_KO"].where(p.index % 2 == 0, p["성분_EN"])   # KO/EN 혼합(실데이터 일반명처럼)
+    return len(raw.map(bundle.normalize_general))
+
+def _rule(fn, src="names"):
+    def run(data, cache):
+        xs = _names(data).tolist() if src == "names" else _segments(data, cache)
+        for x in xs:
+            fn(x)
+        return len(xs)
+    return run
+
+def b_merge(data, cache):
+    with quiet():
+        final_df, _ = merge_frames(data["price"], data["atc"], data["master"])
+    return len(final_df)
+
+def b_bundle_latest(data, cache):
+    return len(bundle.choose_latest_per_code(data["price"], code_col="제품코드"))
+
+def b_bundle_atc(data, cache):
+    cache["atc_agg"] = bundle.aggregate_atc(data["atc"])
+    return len(cache["atc_agg"])
+
+def b_bundle_subs(data, cache):
+    cache["subs_agg"] = bundle.aggregate_substances(data["master"].rename(columns={"일반명코드": "주성분코드"}))
+    return len(cache["subs_agg"])
+
+def b_bundle_enrich(data, cache):
+    atc = cache.get("atc_agg"); subs = cache.get("subs_agg")
+    if atc is None: atc = bundle.aggregate_atc(data["atc"])
+    if subs is None: subs = bundle.aggregate_substances(data["master"].rename(columns={"일반명코드": "주성분코드"}))
+    return len(bundle.build_enriched(data["products"], atc, subs))
+
+def b_bundle_syn_rows(data, cache):
+    cache["syn_df"] = bundle.build_syn_rows(_enriched(data, cache))
+    return len(cache["syn_df"])
+
+def b_bundle_write_rules(data, cache):
+    enriched = _enriched(data, cache)
+    syn_df = cache.get("syn_df")
+    if syn_df is None: syn_df = bundle.build_syn_rows(enriched)
+    bundle.write_rules(enriched, syn_df, Path(cache["tmpdir"]))
+    return len(syn_df)
+
+def _resolver(data, cache) -> DrugResolver:
+    if "resolver" not in cache:
+        syn_df = cache.get("syn_df")
+        if syn_df is None: syn_df = bundle.build_syn_rows(_enriched(data, cache))
+        r = DrugResolver()
+        r.add_syn_rows(syn_df)
+        cache["resolver"] = r
+    return cache["resolver"]
+
+def p_resolver(data, cache):
+    if cache.get("syn_df") is None:
+        cache["syn_df"] = bundle.build_syn_rows(_enriched(data, cache))
+    cache.pop("resolver", None)
+
+def b_resolver_build(data, cache):
+    return len(_resolver(data, cache))
+
+def p_resolver_queries(data, cache):
+    """원문 제품명(fast path) + 공백/대소문자 변형(키 경로) 혼합"""
+    _resolver(data, cache)
+    names = _names(data).tolist()
+    cache["queries"] = names + [n.upper().replace("(", " (") for n in names]
+
+def b_resolver_resolve(data, cache):
+    q = cache["queries"]
+    cache["resolver"].resolve_many(q)
+    return len(q)
+
+def p_extractor(data, cache):
+    """합성 메모: 제품명 3개 + 상용구 → 문서 1개 (rows = 문서 수)"""
+    if "extractor" not in cache:
+        ex = MentionExtractor()
+        ex.add_resolver(_resolver(data, cache), data["products"]["업체명"].unique())
+        cache["extractor"] = ex.build()
+    names = _names(data).tolist()
+    cache["memos"] = [f"{names[i]} 1T bid, {names[i-1]} 중단 후 {names[i-2]} 처방. 경과 관찰"
+                      for i in range(len(names))]
+
+def b_extractor(data, cache):
+    docs = cache["memos"]
+    for _ in cache["extractor"].extract_stream(docs):
+        pass
+    return len(docs)
+
+def p_fuzzy(data, cache):
+    """대표명에 오타 1개(캡슐→캅셀, 마지막 글자 삭제) — 질의 2,000개 고정"""
+    if "fuzzy" not in cache:
+        fm = FuzzyMatcher()
+        fm.add_resolver(_resolver(data, cache))
+        cache["fuzzy"] = fm
+    canon = _enriched(data, cache)["품명_정제"].drop_duplicates().head(1000).tolist()
+    cache["fuzzy_q"] = [c.replace("캡슐", "캅셀") for c in canon] + [c[:-1] for c in canon if len(c) > 3]
+
+def b_fuzzy(data, cache):
+    fm = cache["fuzzy"]
+    for q in cache["fuzzy_q"]:
+        fm.lookup(q)
+    return len(cache["fuzzy_q"])
+
+def _script_lines(mod, fmt="arrow"):
+    """process_line(line) 형 처리기: 사전 파일을 한 줄씩"""
+    def run(data, cache):
+        fn = script(mod)["process_line"]
+        n = 0
+        with quiet(), open(_dict_file(data, cache, fmt), encoding="utf-8") as f:
+            for line in f:
+                fn(line); n += 1
+        return n
+    return run
+
+def _dict_policy(policy):
+    """dict_processor.process(lines, make_policy(policy), out): 사전 파일 한 번 순회"""
+    def run(data, cache):
+        out = Path(cache["tmpdir"]) / f"dict_processor.{policy}.out.txt"
+        with quiet(), open(_dict_file(data, cache), encoding="utf-8") as f, \
+                open(out, "w", encoding="utf-8") as o:
+            st = dict_processor.process(f, dict_processor.make_policy(policy), o)
+        return st["entries"]
+    return run
+
+def _dict_norm(attr):
+    """dict_processor 정규화 규칙 체인(NORM_*)을 이름마다 한 번"""
+    def run(data, cache):
+        f = getattr(dict_processor, attr)
+        xs = _names(data).tolist()
+        for x in xs:
+            f(x)
+        return len(xs)
+    return run
+
+BENCHES = {
+    "fn.extract_pumyeong": b_extract_pumyeong,
+    "fn.components_from_name": b_components_from_name,
+    "fn.normalize_general": b_normalize_general,
+    "rule.unify_norm_spaces": _rule(lambda s: bundle.norm_spaces(bundle.unify_brackets(s))),
+    "rule.drop_trailing_dose": _rule(bundle.drop_trailing_dose),
+    "rule.drop_dose_anywhere": _rule(bundle.drop_dose_anywhere),
+    "rule.drop_orphan_units": _rule(bundle.drop_orphan_units),
+    "rule.drop_pack_tokens": _rule(bundle.drop_pack_tokens, "segments"),
+    "rule.outer_paren_segments": _rule(bundle.outer_paren_segments),
+    "rule.split_outside_parens": _rule(bundle.split_outside_parens, "segments"),
+    "rule.is_pure_dose": _rule(bundle.is_pure_dose, "segments"),
+    "rule.has_form": _rule(bundle.has_form, "segments"),
+    "merge": b_merge,
+    "bundle.latest": b_bundle_latest,
+    "bundle.atc_aggregate": b_bundle_atc,
+    "bundle.subs_aggregate": b_bundle_subs,
+    "bundle.enrich": b_bundle_enrich,
+    "bundle.syn_rows": b_bundle_syn_rows,
+    "bundle.write_rules": b_bundle_write_rules,
+    "resolver.build": b_resolver_build,
+    "resolver.resolve_many": b_resolver_resolve,
+    "extractor.extract_stream": b_extractor,
+    "fuzzy.lookup": b_fuzzy,
+    "scripts.convert_pharma_dict": _script_lines("convert_pharma_dict", fmt="group"),
+    "scripts.dict_processor.strict": _dict_policy("strict"),
+    "scripts.dict_processor.simple": _dict_policy("simple"),
+    "scripts.dict_processor.final": _dict_policy("final"),
+    "scripts.dict_processor.consolidate": _dict_policy("consolidate"),
+    "scripts.dict_processor.union": _dict_policy("union"),
+    "scripts.dict_processor.compound": _dict_policy("compound"),
+    "scripts.dict_processor.compound_improved": _dict_policy("compound_improved"),
+    "scripts.dict_processor.compound_final": _dict_policy("compound_final"),
+    "scripts.dict_processor.create_final": _dict_policy("create_final"),
+    "scripts.dict_processor.preprocess": _dict_policy("preprocess"),
+    "scripts.dict_processor.NORM_COMPOUND_IU": _dict_norm("NORM_COMPOUND_IU"),
+}
+# 측정 전 준비(시간에 포함하지 않음)
+PREPARE = {
+    "resolver.build": p_resolver,
+    "resolver.resolve_many": p_resolver_queries,
+    "extractor.extract_stream": p_extractor,
+    "fuzzy.lookup": p_fuzzy,
+}
+# 이름 호환(초기 버전 이름)
+ALIASES = {"extract_pumyeong": "fn.extract_pumyeong", "components_from_name": "fn.components_from_name",
+           "normalize_general": "fn.normalize_general", "synonym_export": "bundle."}
+
+def select(only) -> list[str]:
+    if not only:
+        return list(BENCHES)
+    pats = [ALIASES.get(o, o) for o in only]
+    return [n for n in BENCHES if any(n == p or n.startswith(p) for p in pats)]
+
+def run_suite(sizes, seed: int = 42, only=None, repeat: int = 1, dict_ratio: float = 0.2,
+              report: RunReport | None = None) -> RunReport:
+    """dict_ratio: scripts.* 입력 사전 라인 수 = 규모 × 비율(사전은 제품 수보다 훨씬 작음)"""
+    report = report or RunReport("bench")
+    names = select(only)
+    for n in sizes:
+        rec = report.start(f"generate@{n}")
+        data = generate_tables(n, seed)
+        data["seed"], data["n_dict"] = seed, max(1, int(n * dict_ratio))
+        report.finish(rec, rows_out=n)
+        with tempfile.TemporaryDirectory() as td:
+            cache = {"tmpdir": td}
+            # 워밍업: 정규식 컴파일/스크립트 로딩 등 1회성 비용을 측정에서 제외
+            warm = generate_tables(min(n, 500), seed)
+            warm["seed"], warm["n_dict"] = seed, 100
+            with quiet():
+                warm_cache = {"tmpdir": td}
+                for name in names:
+                    if name in PREPARE:
+                        PREPARE[name](warm, warm_cache)
+                    BENCHES[name](warm, warm_cache)
+            del warm
+            for name in names:
+                for _ in range(max(1, repeat)):
+                    if name in PREPARE:
+                        PREPARE[name](data, cache)
+                    gc.collect()
+                    with report.stage(f"{name}@{n}", rows_in=None) as st:
+                        st.rows_in = st.rows_out = BENCHES[name](data, cache)
+                    s = report.stages[-1]
+                    print(f"[BENCH] {name:<46} n={n:>10,}  {s.wall_s:8.2f}s  "
+                          f"{(s.rows_per_s or 0):>12,.0f} rows/s  peak {s.peak_rss_mb or 0:,.0f}MB")
+        del data, cache
+        gc.collect()
+    return report
+
+# ---------- 기준선 저장/비교 ----------
+def results_of(report: RunReport) -> dict:
+    """{stage@n: 최고 처리량 기록}(repeat 중 best)"""
+    out = {}
+    for s in report.stages:
+        if s.name.startswith("generate@") or s.rows_per_s is None:
+            continue
+        cur = out.get(s.name)
+        if cur is None or s.rows_per_s > cur["rows_per_s"]:
+            out[s.name] = {"rows_per_s": s.rows_per_s, "wall_s": s.wall_s, "rows": s.rows_in,
+                           "peak_rss_mb": s.peak_rss_mb}
+    return out
+
+def save_baseline(report: RunReport, path, meta: dict):
+    doc = {"version": BASELINE_VERSION,
+           "meta": {**meta, "created": datetime.now().isoformat(timespec="seconds"),
+                    "python": platform.python_version(), "platform": platform.platform()},
+           "results": results_of(report)}
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Path(path).write_text(json.dumps(doc, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"[OK] baseline saved → {path} ({len(doc['results'])} items)")
+
+def compare(report: RunReport, path, max_regress: float) -> list[str]:
+    """기준선 대비 diff 표 출력. 반환: 허용치를 넘겨 느려진 항목"""
+    base = json.loads(Path(path).read_text(encoding="utf-8"))
+    if base.get("version") != BASELINE_VERSION:
+        raise SystemExit(f"[ERR] baseline version mismatch: {base.get('version')}")
+    cur = results_of(report)
+    # --only/--sizes로 일부만 돌린 경우 기준선의 나머지는 비교 대상에서 제외
+    ran = set(cur)
+    skipped = [k for k in base["results"] if k not in ran]
+    rows = []
+    for name in sorted(ran | (set(base["results"]) - set(skipped))):
+        b = base["results"].get(name); c = cur.get(name)
+        if not b or not c:
+            rows.append((name, b and b["rows_per_s"], c and c["rows_per_s"], None))
+            continue
+        delta = (c["rows_per_s"] - b["rows_per_s"]) / b["rows_per_s"] * 100   # +: 빨라짐, -: 느려짐
+        rows.append((name, b["rows_per_s"], c["rows_per_s"], delta))
+    # 가장 느려진 항목부터
+    rows.sort(key=lambda r: (r[3] is None, r[3] if r[3] is not None else 0))
+    failed = []
+    print(f"\n[GATE] baseline={path}  max regress={max_regress:.1f}%")
+    print(f"  {'bench@rows':<52}{'base rows/s':>14}{'now rows/s':>14}{'delta':>9}  ")
+    for name, b, c, d in rows:
+        fb = f"{b:,.0f}" if b else "-"; fc = f"{c:,.0f}" if c else "-"
+        if d is None:
+            flag = "NEW" if not b else "MISSING"
+            print(f"  {name:<52}{fb:>14}{fc:>14}{'-':>9}  {flag}")
+            continue
+        flag = ""
+        if -d > max_regress:
+            flag = "<<< SLOWER"; failed.append(name)
+        elif d > max_regress:
+            flag = "faster"
+        print(f"  {name:<52}{fb:>14}{fc:>14}{d:>+8.1f}%  {flag}")
+    if skipped:
+        print(f"  (기준선 중 이번에 실행하지 않은 {len(skipped)}개 항목 제외)")
+    if failed:
+        print(f"\n[FAIL] {len(failed)}개 항목이 {max_regress:.1f}% 넘게 느려짐: " + ", ".join(failed))
+    else:
+        print(f"\n[PASS] 허용치({max_regress:.1f}%) 이내")
+    return failed
+
+def parse_sizes(s: str) -> list[int]:
+    out = []
+    for tok in s.split(","):
+        tok = tok.strip().lower().replace("_", "")
+        if not tok: continue
+        mul = 1_000_000 if tok.endswith("m") else 1_000 if tok.endswith("k") else 1
+        out.append(int(float(tok.rstrip("mk")) * mul))
+    return out
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", default=",".join(str(x) for x in DEFAULT_SIZES), help="예: 50k,500k,5m")
+    ap.add_argument("--seed",  type=int, default=42)
+    ap.add_argument("--only",  default="", help="쉼표 구분 벤치 이름/접두어(fn., rule., merge, bundle., scripts.)")
+    ap.add_argument("--repeat", type=int, default=1, help="항목별 반복 횟수(최고값 사용)")
+    ap.add_argument("--json",  default="", help="run_report JSON 저장 경로")
+    ap.add_argument("--save-baseline", default="", help="기준선 JSON 저장")
+    ap.add_argument("--compare", default="", help="기준선 JSON과 비교(회귀 시 exit 1)")
+    ap.add_argument("--max-regress", type=float, default=10.0, help="허용 처리량 감소율(%%)")
+    ap.add_argument("--list", action="store_true", help="벤치 이름 목록만 출력")
+    args = ap.parse_args()
+
+    if args.list:
+        print("\n".join(BENCHES)); return
+    only = [x.strip() for x in args.only.split(",") if x.strip()]
+    if only and not select(only):
+        raise SystemExit(f"[ERR] 일치하는 벤치 없음: {only} (--list 참고)")
+    sizes = parse_sizes(args.sizes)
+    report = run_suite(sizes, args.seed, only, args.repeat)
+    report.print_summary()
+    if args.json:
+        report.write_json(args.json)
+    if args.save_baseline:
+        save_baseline(report, args.save_baseline,
+                      {"sizes": sizes, "seed": args.seed, "only": only, "repeat": args.repeat})
+    if args.compare:
+        if compare(report, args.compare, args.max_regress):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
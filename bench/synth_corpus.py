@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+synth_corpus.py — 시드 고정 합성 HIRA 제품명/테이블 생성기(벤치마크용)
+
+실데이터(약 5.4만 행)보다 큰 규모(50만, 500만)에서 정규화/병합/유의어 산출 성능을 재기 위한 코퍼스.
+실제 제품명 패턴을 흉내 낸다:
+  - 브랜드 + 제형 + 강도      예) 아토르정20밀리그램, 듀오텔미정40/10밀리그램
+  - 성분 괄호(중첩 포함)       예) (아토르바스타틴칼슘삼수화물), (세파클러(as 세파클러수화물))
+  - 다성분 '·' 목록 + 비율     예) [아목시실린·클라불란산칼륨(7:1)]
+  - 수출명 세그먼트            예) (수출명:Atorel)
+  - 포장/함량 꼬리             예) _(0.25g/1캡슐), _(1000KIU/mL), _(10L)
+
+사용 예:
+  python synth_corpus.py --rows 500000 --seed 42 --out ./synth_500k.csv
+"""
+
+import random, argparse
+from pathlib import Path
+
+# 성분(KO, EN) — 실제 빈출 성분 + 합성 성분으로 어휘 확장
+INGREDIENTS = [
+    ("아토르바스타틴칼슘삼수화물", "atorvastatin calcium"), ("로수바스타틴칼슘", "rosuvastatin calcium"),
+    ("암로디핀베실산염", "amlodipine besylate"), ("발사르탄", "valsartan"), ("텔미사르탄", "telmisartan"),
+    ("세파클러수화물", "cefaclor"), ("아시클로버", "acyclovir"), ("가바펜틴", "gabapentin"),
+    ("프레가발린", "pregabalin"), ("메트포르민염산염", "metformin hydrochloride"), ("시타글립틴", "sitagliptin"),
+    ("아목시실린수화물", "amoxicillin"), ("클라불란산칼륨", "clavulanate potassium"),
+    ("세레콕시브", "celecoxib"), ("트리아졸람", "triazolam"), ("도세탁셀삼수화물", "docetaxel"),
+    ("인플릭시맵", "infliximab"), ("이소트레티노인", "isotretinoin"), ("토피라메이트", "topiramate"),
+    ("에제티미브", "ezetimibe"), ("히드로클로로티아지드", "hydrochlorothiazide"), ("프로피베린염산염", "propiverine"),
+    ("글리코피롤레이트", "glycopyrrolate"), ("사르포그렐레이트염산염", "sarpogrelate"), ("아프로티닌", "aprotinin"),
+    ("헤파린나트륨", "heparin sodium"), ("콜린알포세레이트", "choline alfoscerate"), ("은행엽건조엑스", "ginkgo biloba ext."),
+]
+_SYL = list("가나다라마바사아자차카타파하도로모보소오조초코토포호디리미비시이지치키티피히네레메베세에제")
+FORMS = ["정", "필름코팅정", "서방정", "캡슐", "연질캡슐", "캅셀", "주", "주사", "시럽", "점안액", "크림", "겔", "프리필드시린지주"]
+FORM_UNIT = {"정": "정", "필름코팅정": "정", "서방정": "정", "캡슐": "캡슐", "연질캡슐": "캡슐", "캅셀": "캡슐",
+             "주": "병", "주사": "병", "시럽": "병", "점안액": "병", "크림": "g", "겔": "g", "프리필드시린지주": "mL"}
+UNITS_KO = ["밀리그램", "밀리그람", "그램", "mg", "g", "mcg", "㎎"]
+COMPANIES = ["한림제약(주)", "대웅제약(주)", "한미약품(주)", "종근당(주)", "유한양행(주)", "동아에스티(주)",
+             "(주)셀트리온", "한국화이자제약(주)", "보령제약(주)", "일동제약(주)", "삼진제약(주)", "휴온스(주)"]
+
+def _syllables(rng: random.Random, lo=2, hi=4) -> str:
+    return "".join(rng.choice(_SYL) for _ in range(rng.randint(lo, hi)))
+
+def _num(rng: random.Random) -> str:
+    return rng.choice(["0.125", "0.25", "1", "2.5", "5", "10", "20", "40", "80", "100", "150", "300", "500", "1000"])
+
+def _ingredient_pool(n_rows: int, rng: random.Random) -> list[tuple[str, str]]:
+    """행 수에 비례해 성분 어휘 확장(약 1/40) — 5M 행이면 12.5만 성분"""
+    pool = list(INGREDIENTS)
+    target = max(len(pool), n_rows // 40)
+    suffix = ["염산염", "나트륨", "칼륨", "수화물", "베실산염", ""]
+    while len(pool) < target:
+        ko = _syllables(rng, 3, 5) + rng.choice(suffix)
+        en = "".join(rng.choice("abcdefghiklmnoprstuvz") for _ in range(rng.randint(6, 11)))
+        pool.append((ko, en))
+    return pool
+
+def make_name(rng: random.Random, pool, brand: str | None = None) -> tuple[str, list[int]]:
+    """합성 제품명 1개 + 사용된 성분 인덱스"""
+    form = rng.choice(FORMS)
+    brand = brand or _syllables(rng)
+    k = rng.choices([1, 2, 3], weights=[80, 17, 3])[0]
+    idx = rng.sample(range(len(pool)), k)
+    parts = [brand, rng.choice(["", "플러스", "듀오", "에프", "엑스알"]) if rng.random() < 0.15 else "", form]
+    # 강도: 단일/복합(40/10)/KIU
+    r = rng.random()
+    if r < 0.45:
+        parts.append(_num(rng) + rng.choice(UNITS_KO))
+    elif r < 0.55 and k > 1:
+        parts.append("/".join(_num(rng) for _ in range(k)) + rng.choice(UNITS_KO))
+    elif r < 0.58:
+        parts.append(rng.choice(["10,000KIU", "50000K.I.U.", "5000IU"]))
+    name = "".join(parts)
+    # 성분 괄호: 단일/다성분(·, 비율)/중첩(as ...)
+    kos = [pool[i][0] for i in idx]
+    r = rng.random()
+    if r < 0.75:
+        inner = "·".join(kos) if rng.random() < 0.8 else ".".join(kos)
+        if k > 1 and rng.random() < 0.3:
+            inner += f"({rng.randint(1, 9)}:1)"
+        if k == 1 and rng.random() < 0.1:
+            inner += f"(as {pool[idx[0]][1]})"
+        name += f"({inner})" if rng.random() < 0.9 else f"[{inner}]"
+    if rng.random() < 0.05:
+        name += f"(수출명:{brand}{rng.choice(['Tab', 'Cap', 'Inj', ''])}, {_syllables(rng)}{form})"
+    # 포장/함량 꼬리
+    unit = FORM_UNIT[form]
+    r = rng.random()
+    if r < 0.6:
+        name += f"_({_num(rng)}{rng.choice(['mg', 'g'])}/1{unit})"
+    elif r < 0.8:
+        name += f"_(1{unit})"
+    elif r < 0.9:
+        name += f"_({_num(rng)}mg/{rng.choice(['1', '2', '5', '10'])}mL)"
+    elif r < 0.95:
+        name += f"_({rng.choice(['1000', '5000', '10,000'])}KIU/mL)"
+    else:
+        name += f"_({rng.choice(['10', '50', '100'])}{rng.choice(['mL', 'L'])})"
+    return name, idx
+
+def generate_names(n: int, seed: int = 42) -> list[str]:
+    rng = random.Random(seed)
+    pool = _ingredient_pool(n, rng)
+    return [make_name(rng, pool)[0] for _ in range(n)]
+
+def generate_dict_lines(n: int, seed: int = 42, fmt: str = "arrow") -> list[str]:
+    """
+    scripts/ 사전 처리기 입력용 합성 사전 라인
+      fmt="arrow" : '유사값1, 유사값2, ... => 대표값'   (pharma_dict_* / unidirectional_dict 형식)
+      fmt="group" : '대표값: 약품명1, 약품명2, ...'     (5_주성분별약품그룹 형식)
+    """
+    rng = random.Random(seed)
+    pool = _ingredient_pool(n * 3, rng)
+    salts = ["", " hydrochloride", " hcl", " sodium", " besylate", " mesylate", " sulfate"]
+    greek = ["", "", "", "α-", "β-"]
+    out = []
+    for _ in range(n):
+        ko, en = rng.choice(pool)
+        rep = rng.choice(greek) + en + rng.choice(salts)
+        k = rng.choices([1, 2, 3, 5, 12], weights=[40, 25, 15, 15, 5])[0]
+        names = []
+        for _ in range(k):
+            nm = make_name(rng, pool)[0]
+            # 사전 라인의 유사값은 꼬리 포장 정보가 빠진 품명 형태가 대부분
+            names.append(nm.split("_(", 1)[0] if rng.random() < 0.8 else nm)
+        if rng.random() < 0.3:
+            names.append(ko)
+        if fmt == "group":
+            out.append(f"{rep}: {', '.join(names)}")
+        else:
+            out.append(f"{', '.join(names)} => {rep}")
+    return out
+
+def generate_tables(n: int, seed: int = 42) -> dict:
+    """
+    벤치용 테이블 묶음(pandas 필요)
+      products  : 제품코드/제품명/주성분코드/업체명/상한금액 + 성분 원문(KO/EN)
+      price     : merge_pharma_data.merge_frames 형식(12번째 컬럼=의성분코드)
+      atc       : 식약분류/주성분코드/제품코드/제품명/업체명/ATC코드/ATC코드 명칭
+      master    : 일반명코드/제형구분코드/제형/일반명/분류번호/투여경로/함량/단위
+    """
+    import pandas as pd
+    rng = random.Random(seed)
+    pool = _ingredient_pool(n, rng)
+    n_sub = max(1, n // 12)        # 주성분코드 수(실데이터 비율 근사)
+    sub_codes = [f"{100000 + i:06d}{rng.choice(['ATB', 'ACH', 'BIJ', 'ASY', 'ATR'])}" for i in range(n_sub)]
+    sub_ing = [rng.sample(range(len(pool)), rng.choices([1, 2, 3], weights=[80, 17, 3])[0]) for _ in range(n_sub)]
+    brands = [_syllables(rng) for _ in range(max(1, n // 6))]
+
+    rows = []
+    for i in range(n):
+        s = rng.randrange(n_sub)
+        name, _ = make_name(rng, pool, brand=rng.choice(brands))
+        ing = sub_ing[s]
+        rows.append({
+            "제품코드": f"{600000000 + i:09d}",
+            "제품명": name,
+            "주성분코드": sub_codes[s],
+            "업체명": rng.choice(COMPANIES),
+            "상한금액": str(rng.randint(10, 200000)),
+            "성분_KO": "·".join(pool[j][0] for j in ing),
+            "성분_EN": "/".join(pool[j][1] for j in ing),
+        })
+    products = pd.DataFrame(rows)
+
+    price = pd.DataFrame({
+        "연번": [str(i + 1) for i in range(n)], "투여": "내복", "분류": "112",
+        "적용일자": "2025-09-01", "품목기준코드": products["제품코드"], "제품코드": products["제품코드"],
+        "제품명": products["제품명"], "업체명": products["업체명"], "규격": "1", "단위": "정",
+        "상한금액": products["상한금액"], "주성분코드": products["주성분코드"],
+    })
+    # ATC: 주성분코드당 0~2개 제품만 매핑(주성분코드 조인 시 행 증폭을 ~2배로 제한)
+    by_sub = {}
+    for i, r in enumerate(rows):
+        by_sub.setdefault(r["주성분코드"], []).append(i)
+    atc_idx = []
+    for code in sub_codes:
+        cand = by_sub.get(code, [])
+        atc_idx.extend(cand[:rng.choice([0, 1, 1, 2])])
+    atc = pd.DataFrame({
+        "식약분류": "112",
+        "주성분코드": [rows[i]["주성분코드"] for i in atc_idx],
+        "제품코드": [rows[i]["제품코드"] for i in atc_idx],
+        "제품명": [rows[i]["제품명"] for i in atc_idx],
+        "업체명": [rows[i]["업체명"] for i in atc_idx],
+        "ATC코드": [f"{rng.choice('ABCDGHJLMNPRSV')}{rng.randint(1, 16):02d}{rng.choice('ABCDE')}{rng.choice('ABCDEFX')}{rng.randint(1, 30):02d}" for _ in atc_idx],
+        "ATC코드 명칭": [rows[i]["성분_EN"].split("/")[0] for i in atc_idx],
+    })
+    master = pd.DataFrame({
+        "일반명코드": sub_codes, "제형구분코드": [c[-2:] for c in sub_codes], "제형": "정제",
+        "일반명": ["·".join(pool[j][0] if rng.random() < 0.5 else pool[j][1] for j in ing) for ing in sub_ing],
+        "분류번호": "112", "투여경로": "내복", "함량": "10", "단위": "mg",
+    })
+    return {"products": products, "price": price, "atc": atc, "master": master}
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=50000)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--out",  default="synth_products.csv")
+    args = ap.parse_args()
+    t = generate_tables(args.rows, args.seed)
+    Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+    t["products"].to_csv(args.out, index=False, encoding="utf-8-sig")
+    print(f"[OK] {len(t['products']):,} rows → {args.out}")
@@ -1,7 +1,52 @@
 import pandas as pd
 import os
+import sys
 from datetime import datetime
 
+# 단계별 계측(back/run_report.py 공용)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "back"))
+from run_report import RunReport, stage
+
+def merge_frames(df_price, df_atc, df_master, report=None):
+    """
+    적용약가 + 약가마스터 + ATC 좌조인(의성분코드 기준). 반환: (final_df, 약가마스터 키 컬럼명)
+    """
+    
+    # 컬럼명 정리 (인코딩 문제 해결을 위해 인덱스 사용)
+    price_component_col = df_price.columns[11]  # 의성분코드
+    atc_component_col = df_atc.columns[1]       # 의성분코드
+    master_component_col = df_master.columns[0] # 일반명코드
+    
+    print(f"매핑 키: {price_component_col} ↔ {atc_component_col} ↔ {master_component_col}")
+    
+    # 1단계: 적용약가 + 약가마스터 매핑 (99.3% 커버리지)
+    with stage(report, "merge.master", rows_in=len(df_price)) as st:
+        merged_df = df_price.merge(
+            df_master, 
+            left_on=price_component_col, 
+            right_on=master_component_col, 
+            how='left',
+            suffixes=('', '_master')
+        )
+        st.rows_out = len(merged_df)
+    
+    print(f"1단계 병합 완료: {len(merged_df):,}행")
+    
+    # 2단계: ATC 정보 추가 (50% 커버리지)
+    with stage(report, "merge.atc", rows_in=len(merged_df)) as st:
+        final_df = merged_df.merge(
+            df_atc,
+            left_on=price_component_col,
+            right_on=atc_component_col,
+            how='left',
+            suffixes=('', '_atc')
+        )
+        st.rows_out = len(final_df)
+    
+    print(f"2단계 병합 완료: {len(final_df):,}행")
+    
+    return final_df, master_component_col
+
 def merge_pharma_data():
     """
     세 개의 의약품 데이터 파일을 의성분코드 기준으로 합치는 함수
@@ -14,50 +59,30 @@ def merge_pharma_data():
     atc_file = os.path.join(base_path, "건강보험심사평가원_ATC코드 매핑 목록_20240630.csv")
     master_file = os.path.join(base_path, "건강보험심사평가원_약가마스터_의약품주성분_20241014.csv")
     
+    report = RunReport("merge_pharma_data")
     print("데이터 파일 로딩 중...")
     
     # 1. 적용약가파일 로딩 (Excel)
-    df_price = pd.read_excel(excel_file)
+    with report.stage("load.price") as st:
+        df_price = pd.read_excel(excel_file)
+        st.rows_out = len(df_price)
     print(f"적용약가파일: {len(df_price):,}행 로딩 완료")
     
     # 2. ATC 매핑파일 로딩 (CSV)
-    df_atc = pd.read_csv(atc_file, encoding='cp949')
+    with report.stage("load.atc") as st:
+        df_atc = pd.read_csv(atc_file, encoding='cp949')
+        st.rows_out = len(df_atc)
     print(f"ATC매핑파일: {len(df_atc):,}행 로딩 완료")
     
     # 3. 약가마스터파일 로딩 (CSV)
-    df_master = pd.read_csv(master_file, encoding='cp949')
+    with report.stage("load.master") as st:
+        df_master = pd.read_csv(master_file, encoding='cp949')
+        st.rows_out = len(df_master)
     print(f"약가마스터파일: {len(df_master):,}행 로딩 완료")
     
     print("\n데이터 병합 시작...")
     
-    # 컬럼명 정리 (인코딩 문제 해결을 위해 인덱스 사용)
-    price_component_col = df_price.columns[11]  # 의성분코드
-    atc_component_col = df_atc.columns[1]       # 의성분코드
-    master_component_col = df_master.columns[0] # 일반명코드
-    
-    print(f"매핑 키: {price_component_col} ↔ {atc_component_col} ↔ {master_component_col}")
-    
-    # 1단계: 적용약가 + 약가마스터 매핑 (99.3% 커버리지)
-    merged_df = df_price.merge(
-        df_master, 
-        left_on=price_component_col, 
-        right_on=master_component_col, 
-        how='left',
-        suffixes=('', '_master')
-    )
-    
-    print(f"1단계 병합 완료: {len(merged_df):,}행")
-    
-    # 2단계: ATC 정보 추가 (50% 커버리지)
-    final_df = merged_df.merge(
-        df_atc,
-        left_on=price_component_col,
-        right_on=atc_component_col,
-        how='left',
-        suffixes=('', '_atc')
-    )
-    
-    print(f"2단계 병합 완료: {len(final_df):,}행")
+    final_df, master_component_col = merge_frames(df_price, df_atc, df_master, report)
     
     # 매핑 통계 출력
     total_records = len(final_df)
@@ -76,13 +101,15 @@ def merge_pharma_data():
     # CSV 저장
     csv_filename = f"merged_pharma_data_{timestamp}.csv"
     csv_path = os.path.join(output_path, csv_filename)
-    final_df.to_csv(csv_path, index=False, encoding='utf-8-sig')
+    with report.stage("write.csv", rows_in=len(final_df)):
+        final_df.to_csv(csv_path, index=False, encoding='utf-8-sig')
     print(f"\nCSV 파일 저장: {csv_filename}")
     
     # Excel 저장 (참고용)
     excel_filename = f"merged_pharma_data_{timestamp}.xlsx"
     excel_path = os.path.join(output_path, excel_filename)
-    final_df.to_excel(excel_path, index=False)
+    with report.stage("write.excel", rows_in=len(final_df)):
+        final_df.to_excel(excel_path, index=False)
     print(f"Excel 파일 저장: {excel_filename}")
     
     # 컬럼 정보 출력
@@ -93,6 +120,9 @@ def merge_pharma_data():
         if i < 10 or 'ATC' in str(col) or '일반명' in str(col) or '성분' in str(col):
             print(f"  {col}")
     
+    report.print_summary()
+    report.write_json(os.path.join(output_path, f"merged_pharma_data_{timestamp}.run_report.json"))
+    
     return final_df, csv_path, excel_path
 
 if __name__ == "__main__":
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+dict_diff.py — 사전 세대(archive/) 간 변경 추적
+
+`유사값, ... => 대표값` 파일 여러 개를 순서대로 읽어, 이웃한 두 세대마다
+대표값(dict_processor.merge_key로 정규화)을 키로 맞춰 다음을 센다.
+
+  added             새 세대에만 있는 대표값
+  removed           이전 세대에만 있는 대표값
+  renamed           removed와 added 중 유의어 집합 자카드 ≥ --rename-threshold인 1:1 쌍(예: 염 통합, 대소문자/표기 교정)
+  synonyms_changed  대표값은 같고 유의어 집합이 달라진 것(+추가/-삭제 목록)
+  unchanged         둘 다 같은 것
+
+파일마다 한 번만 훑으며(줄 → 해시 키 dict) 메모리에는 이웃한 두 세대만 둔다.
+이름 변경 후보는 추가된 대표값의 유의어 역색인으로만 찾는다(전체 쌍 비교 없음).
+
+  python dict_diff.py --archive ../archive --log changes.jsonl --summary summary.json
+  python dict_diff.py old.txt new.txt --log changes.jsonl
+
+--archive는 ARCHIVE_ORDER(파이프라인 생성 순서) 중 있는 파일만 그 순서대로 쓴다.
+"""
+
+import json
+import argparse
+from pathlib import Path
+
+from dict_processor import parse_entries, merge_key
+
+ARCHIVE_ORDER = (
+    "pharma_unidirectional_dict.txt",             # convert_pharma_dict
+    "pharma_unidirectional_dict_cleaned.txt",
+    "pharma_unidirectional_dict_final.txt",       # strict/simple/final 정책
+    "pharma_unidirectional_dict_submission.txt",
+    "pharma_unidirectional_dict_ultimate.txt",    # consolidate 정책
+    "pharma_dict_final_merged.txt",
+    "pharma_dict_submission_ready.txt",           # create_final_dict / process_pharma_dict
+    "pharma_dict_final_processed.txt",            # pharma_preprocessor
+)
+CHANGE_TYPES = ("added", "removed", "renamed", "synonyms_changed")
+
+class Version:
+    """한 세대: 정규화 대표값 → (원문 대표값, 첫 줄 번호, 유의어 키 → 원문)"""
+    __slots__ = ("name", "entries", "lines", "duplicates")
+
+    def __init__(self, name):
+        self.name = name
+        self.entries = {}
+        self.lines = 0
+        self.duplicates = 0                  # 같은 정규화 대표값이 여러 줄(유의어는 합침)
+
+    @classmethod
+    def load(cls, path):
+        v = cls(Path(path).name)
+        with open(path, encoding="utf-8-sig") as f:
+            for e in parse_entries(f):
+                v.lines += 1
+                key = merge_key(e.representative)
+                if not key:
+                    continue
+                syns = {}
+                for s in e.similars:
+                    k = merge_key(s)
+                    if k and k != key:
+                        syns.setdefault(k, s)
+                cur = v.entries.get(key)
+                if cur is None:
+                    v.entries[key] = (e.representative, e.line_no, syns)
+                else:
+                    v.duplicates += 1
+                    for k, s in syns.items():
+                        cur[2].setdefault(k, s)
+        return v
+
+def _jaccard(a, b) -> float:
+    if not a and not b:
+        return 1.0
+    inter = len(a.keys() & b.keys())
+    return inter / (len(a) + len(b) - inter)
+
+def diff_versions(old: Version, new: Version, rename_threshold: float = 0.5, max_posting: int = 200):
+    """→ (counts dict, 변경 기록 list). 기록은 CHANGE_TYPES 순, 같은 종류 안에서는 키 순"""
+    removed = old.entries.keys() - new.entries.keys()
+    added = new.entries.keys() - old.entries.keys()
+
+    # 이름 변경: 추가된 대표값의 유의어 역색인 → 삭제된 대표값마다 공유 유의어가 있는 후보만 채점
+    index = {}
+    for k in added:
+        for s in new.entries[k][2]:
+            index.setdefault(s, []).append(k)
+    scored = []
+    for k in removed:
+        syns = old.entries[k][2]
+        cands = set()
+        for s in syns:
+            post = index.get(s, ())
+            if len(post) <= max_posting:     # 너무 흔한 유의어는 후보 근거에서 제외
+                cands.update(post)
+        for c in cands:
+            j = _jaccard(syns, new.entries[c][2])
+            if j >= rename_threshold:
+                scored.append((-j, k, c))
+    renamed, used_old, used_new = [], set(), set()
+    for negj, k, c in sorted(scored):        # 점수 높은 쌍부터 1:1로
+        if k in used_old or c in used_new:
+            continue
+        used_old.add(k); used_new.add(c)
+        renamed.append((k, c, -negj))
+
+    log = []
+    for k in sorted(added - used_new):
+        rep, line, syns = new.entries[k]
+        log.append({"type": "added", "key": k, "new_rep": rep, "new_line": line, "n_synonyms": len(syns)})
+    for k in sorted(removed - used_old):
+        rep, line, syns = old.entries[k]
+        log.append({"type": "removed", "key": k, "old_rep": rep, "old_line": line, "n_synonyms": len(syns)})
+    for k, c, j in sorted(renamed):
+        o, n = old.entries[k], new.entries[c]
+        log.append({"type": "renamed", "key": k, "new_key": c, "old_rep": o[0], "new_rep": n[0],
+                    "old_line": o[1], "new_line": n[1], "jaccard": round(j, 4),
+                    "added_synonyms": sorted(n[2][s] for s in n[2].keys() - o[2].keys()),
+                    "removed_synonyms": sorted(o[2][s] for s in o[2].keys() - n[2].keys())})
+    unchanged = 0
+    for k in sorted(old.entries.keys() & new.entries.keys()):
+        o, n = old.entries[k], new.entries[k]
+        plus, minus = n[2].keys() - o[2].keys(), o[2].keys() - n[2].keys()
+        if not plus and not minus:
+            unchanged += 1
+            continue
+        log.append({"type": "synonyms_changed", "key": k, "old_rep": o[0], "new_rep": n[0],
+                    "old_line": o[1], "new_line": n[1],
+                    "added_synonyms": sorted(n[2][s] for s in plus),
+                    "removed_synonyms": sorted(o[2][s] for s in minus)})
+    counts = {t: 0 for t in CHANGE_TYPES}
+    for r in log:
+        counts[r["type"]] += 1
+    counts["unchanged"] = unchanged
+    counts["synonyms_added"] = sum(len(r.get("added_synonyms", ())) for r in log)
+    counts["synonyms_removed"] = sum(len(r.get("removed_synonyms", ())) for r in log)
+    return counts, log
+
+def diff_chain(paths, log_path=None, rename_threshold=0.5):
+    """paths 순서대로 이웃 세대 diff. log_path가 있으면 세대 쌍마다 변경 기록을 JSONL에 이어 씀"""
+    summary = []
+    out = open(log_path, "w", encoding="utf-8") if log_path else None
+    try:
+        prev = Version.load(paths[0])
+        for p in paths[1:]:
+            cur = Version.load(p)
+            counts, log = diff_versions(prev, cur, rename_threshold)
+            summary.append({"from": prev.name, "to": cur.name,
+                            "entries_from": len(prev.entries), "entries_to": len(cur.entries),
+                            "lines_to": cur.lines, "duplicate_reps_to": cur.duplicates, **counts})
+            if out:
+                for r in log:
+                    out.write(json.dumps({"from": prev.name, "to": cur.name, **r}, ensure_ascii=False) + "\n")
+            prev = cur                       # 이전 세대는 버림 — 메모리에는 항상 두 세대만
+    finally:
+        if out:
+            out.close()
+    return summary
+
+def print_summary(summary):
+    for s in summary:
+        print(f"[DIFF] {s['from']} → {s['to']}")
+        print(f"       entries {s['entries_to']:,}  +{s['added']:,} -{s['removed']:,}  renamed {s['renamed']:,}  "
+              f"synonyms_changed {s['synonyms_changed']:,} (+{s['synonyms_added']:,}/-{s['synonyms_removed']:,})  "
+              f"unchanged {s['unchanged']:,}")
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("paths", nargs="*", help="세대 순서대로 사전 파일(2개 이상)")
+    ap.add_argument("--archive", default="", help="archive 디렉터리(ARCHIVE_ORDER 순서로 사용)")
+    ap.add_argument("--log", default="", help="변경 기록 JSONL")
+    ap.add_argument("--summary", default="", help="세대별 요약 JSON")
+    ap.add_argument("--rename-threshold", type=float, default=0.5)
+    args = ap.parse_args()
+
+    paths = [Path(p) for p in args.paths]
+    if args.archive:
+        paths += [Path(args.archive) / n for n in ARCHIVE_ORDER if (Path(args.archive) / n).exists()]
+    if len(paths) < 2:
+        raise SystemExit("[ERR] 비교할 세대가 2개 이상 필요합니다")
+
+    summary = diff_chain(paths, args.log or None, args.rename_threshold)
+    print_summary(summary)
+    if args.summary:
+        Path(args.summary).write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"[OK] summary → {args.summary}")
+    if args.log:
+        print(f"[OK] change log → {args.log}")
+
+if __name__ == "__main__":
+    main()
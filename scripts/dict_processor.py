@@ -0,0 +1,593 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+dict_processor.py — `유사값, ... => 대표값` 사전 스트리밍 처리기(정책 교체형)
+
+strict_/simple_/final_pharma_processor.py, consolidate_script.py, process_pharma_dict(_improved/_final).py,
+create_final_dict.py, pharma_preprocessor.py가 각자 파일을 통째로 읽고 clean_text/normalize_text/
+get_base_compound를 따로 들고 있던 것을 하나로 모았다(각 스크립트는 기존 경로로 run을 부르는 진입점만 남음).
+
+  - parse_entries: 줄 단위 제너레이터(`번호→` 접두어 제거, `=>` 하나인 줄만). 파일을 메모리에 올리지 않음
+  - 규칙 객체(Sub/Replace/Chain)는 모듈 로드 시 한 번 컴파일, 정책은 규칙 묶음 + 파라미터
+  - 정책.feed(entry)가 내보낼 줄을 바로 돌려주면 즉시 쓰고, 묶음이 필요한 정책(consolidate/union/compound 계열)은
+    feed에서 그룹만 쌓았다가 finish()에서 내보냄 — 어느 정책이든 입력은 한 번만 읽는다
+
+정책
+  strict             용량/단위/비율 제거 + 하이픈/괄호 변형, 2글자 이상만 (strict_pharma_processor)
+  simple             같은 정리, 하이픈 유지, 1글자 허용 (simple_pharma_processor)
+  final              같은 정리, 하이픈 제거 + `호수`/`^숫자` 패턴 (final_pharma_processor)
+  consolidate        염 형태를 떼어낸 대표값이 같은 줄을 하나로 병합 (consolidate_script)
+  union              표면형(대표값/유사값)을 하나라도 공유하는 줄을 union-find로 병합 + 병합 감사 CSV
+                     (대표값이 달라도 같은 브랜드 유사값을 가진 줄이 합쳐짐. 거의 선형 시간)
+  compound           대표값 정규화(NFD/그리스 문자/용량·법인 표기 제거) 후 염 토큰을 뗀 기본 성분으로 병합,
+                     hcl/hbr 염 형태를 유사값에 추가 (process_pharma_dict)
+  compound_improved  같은 정규화, 끝 염만 제거, 가장 짧은 정규화 대표값이 대표 (process_pharma_dict_improved)
+  compound_final     띄어 쓴 끝 염만 제거, 여러 줄이 모이면 기본 성분이 대표 (process_pharma_dict_final)
+  create_final       끝 염 제거 + back/variants dict 프로필 변형(기본 성분당 예산) (create_final_dict)
+  preprocess         NFKC 정규화, 기본 성분이 대표, 모든 값의 variants 변형을 유사값으로 (pharma_preprocessor)
+
+CLI:
+  python dict_processor.py pharma_unidirectional_dict_cleaned.txt pharma_unidirectional_dict_final.txt --policy strict
+  python dict_processor.py pharma_unidirectional_dict_submission.txt pharma_unidirectional_dict_ultimate.txt --policy consolidate
+  python dict_processor.py pharma_dict_final_merged.txt pharma_dict_submission_ready.txt --policy compound
+  python dict_processor.py pharma_dict_final_merged.txt pharma_dict_clusters.txt --policy union --audit merge_audit.csv
+"""
+
+import re
+import csv
+import sys
+import argparse
+import unicodedata
+from pathlib import Path
+from functools import partial
+from operator import methodcaller
+from collections import namedtuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "back"))
+from utils_kor import surface_key
+from variants import variants, Budget
+
+Entry = namedtuple("Entry", "line_no similars representative")
+
+# ---------------- 규칙 객체 ----------------
+class Sub:
+    """미리 컴파일한 정규식 치환"""
+    __slots__ = ("rx", "repl")
+
+    def __init__(self, pattern, repl="", flags=0):
+        self.rx = re.compile(pattern, flags)
+        self.repl = repl
+
+    def __call__(self, s):
+        return self.rx.sub(self.repl, s)
+
+class Replace:
+    """고정 문자열 치환"""
+    __slots__ = ("old", "new")
+
+    def __init__(self, old, new=""):
+        self.old, self.new = old, new
+
+    def __call__(self, s):
+        return s.replace(self.old, self.new)
+
+class Chain:
+    """규칙을 순서대로 적용"""
+    __slots__ = ("rules",)
+
+    def __init__(self, *rules):
+        self.rules = rules
+
+    def __call__(self, s):
+        for r in self.rules:
+            s = r(s)
+        return s
+
+_I = re.IGNORECASE
+_PAREN = Sub(r'\([^)]*\)')
+
+_UNITS = r'(?:mg|mcg|㎍|g|kg|ml|mL|l|L|IU|단위|호|%|㎎|㎖|㎞|㎝|mm|cm|km|아이유)'
+DOSE_STRICT = Chain(
+    Sub(r'\d+\.?\d*\s*' + _UNITS, flags=_I),
+    Sub(r'\d+\.?\d*\s*(?:마이크로그람|그람|밀리그람)', flags=_I),
+    Sub(r'\d+\s*:\s*\d+'), Sub(r'\d+\.?\d*\s*%'),
+    Sub(r'^\d+\.?\d*\s*'), Sub(r'\s*\d+\.?\d*$'), Sub(r'\d+\.?\d*(?=\s)'),
+)
+DOSE_SIMPLE = Chain(
+    Sub(r'\d+\.?\d*\s*(?:mg|mcg|㎍|g|kg|ml|mL|l|IU|단위|호|%|㎎|㎖|㎞|㎝|mm|cm|km|마이크로그람|그람|밀리그람)', flags=_I),
+    Sub(r'\d+\s*:\s*\d+'), Sub(r'\d+\.?\d*%'), Sub(r'\d+\.?\d*$'), Sub(r'\d+\.?\d*(?=\s)'),
+)
+DOSE_FINAL = Chain(
+    Sub(r'\d+\.?\d*\s*(?:mg|mcg|㎍|g|kg|ml|mL|l|L|IU|단위|호|호수|%|㎎|㎖|㎞|㎝|mm|cm|km)', flags=_I),
+    Sub(r'\d+\.?\d*\s*마이크로그람', flags=_I), Sub(r'\d+\.?\d*\s*그람', flags=_I),
+    Sub(r'\d+\.?\d*\s*밀리그람', flags=_I),
+    Sub(r'\d+\s*:\s*\d+'), Sub(r'\d+\.?\d*\s*%'), Sub(r'\d+\.?\d*(?=\s|$)'), Sub(r'^\d+\.?\d*'),
+)
+TOKENS = Chain(Replace("ext."), Replace("."), Replace("/"), Replace("&"))
+GREEK = Chain(Sub(r'α|alpha', 'alfa', _I), Sub(r'β|beta', 'beta', _I), Sub(r'γ|gamma', 'gamma', _I))
+NO_SPACE = Chain(Sub(r'\s+'), str.strip)
+
+# ---------------- 파싱 ----------------
+def parse_entries(lines):
+    """`유사값, ... => 대표값` 줄 → Entry (빈 줄/`=>` 없는 줄/`=>` 여러 개인 줄은 건너뜀)"""
+    for no, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or "=>" not in line:
+            continue
+        if "→" in line:                      # 라인 번호 제거
+            line = line.split("→", 1)[1]
+        parts = line.split("=>")
+        if len(parts) != 2:
+            continue
+        similars = tuple(v.strip() for v in parts[0].split(",") if v.strip())
+        yield Entry(no, similars, parts[1].strip())
+
+def format_line(similars, representative) -> str:
+    return f"{', '.join(similars)} => {representative}"
+
+# ---------------- 정책 ----------------
+class CleanPolicy:
+    """줄 단위 정리: 유사값마다 정리본 + 하이픈 유지본 + 괄호 제거본, 대표값은 괄호 제거 후 정리"""
+
+    def __init__(self, name, dose, strip_hyphen=True, min_len=1):
+        self.name = name
+        hyphen = (Replace("-"),) if strip_hyphen else ()
+        self.clean = Chain(dose, TOKENS, *hyphen, GREEK, NO_SPACE)
+        self.keep_hyphen = Chain(dose, TOKENS, GREEK, NO_SPACE)
+        self.min_len = min_len
+        self.seen = set()
+
+    def surfaces(self, val):
+        yield self.clean(val)
+        if "-" in val:
+            yield self.keep_hyphen(val)
+        if "(" in val and ")" in val:
+            nb = _PAREN(val).strip()
+            if nb:
+                yield self.clean(nb)
+                if "-" in nb:
+                    yield self.keep_hyphen(nb)
+
+    def feed(self, e: Entry):
+        rep = e.representative
+        if "(" in rep and ")" in rep:
+            rep = _PAREN(rep).strip() or rep
+        rep = self.clean(rep)
+        if len(rep) < self.min_len:
+            return ()
+        sims = {s for v in e.similars for s in self.surfaces(v) if len(s) >= self.min_len and s != rep}
+        if not sims:
+            return ()
+        line = format_line(sorted(sims), rep)
+        if line in self.seen:                # 완전히 같은 매핑 중복 제거
+            return ()
+        self.seen.add(line)
+        return (line,)
+
+    def finish(self):
+        return ()
+
+# 염 토큰마다 `토큰.*$`를 차례로 적용(consolidate_script와 같은 순서 — dihydrochloride보다 hydrochloride가 먼저)
+_SALT = Chain(*(Sub(t + r'.*$') for t in (
+    "hydrochloride", "hcl", "hydrobromide", "hbr", "sulfate", "황산", "acetate", "아세테이트", "dihydrochloride",
+    "monohydrochloride", "bisulfate", "tartrate", "maleate", "succinate", "phosphate", "nitrate", "citrate",
+    "fumarate", "mesylate", "besylate", "tosylate", "hemisulfate", "monosulfate", "disulfate", "malate")))
+
+def base_component(rep: str) -> str:
+    """염 형태 제거(소문자)"""
+    return _SALT(rep.lower()).strip()
+
+class ConsolidatePolicy:
+    """염을 뗀 기본 성분이 같은 대표값끼리 병합. 그룹이 2개 이상이면 기본형(없으면 가장 짧은 것, 소문자)이 대표"""
+    name = "consolidate"
+
+    def __init__(self):
+        self.groups = {}                     # base → {대표값: [유사값...]} (입력 순서 유지)
+
+    def feed(self, e: Entry):
+        reps = self.groups.setdefault(base_component(e.representative), {})
+        reps.setdefault(e.representative, []).extend(e.similars)
+        return ()
+
+    def finish(self):
+        out = {}
+        for items in self.groups.values():
+            if len(items) == 1:
+                (rep, syns), = items.items()
+                out[rep] = list(dict.fromkeys(syns))
+                continue
+            base = next((r.lower() for r in items if base_component(r) == r.lower()), None) \
+                or min(items, key=len).lower()
+            syns = {s for r, ss in items.items() for s in ss}
+            syns.update(r for r in items if r.lower() != base)
+            out[base] = sorted(syns)
+        for rep in sorted(out):
+            yield format_line(out[rep], rep)
+
+# ---------------- 기본 성분(base-compound) 병합 정책 ----------------
+# process_pharma_dict(_improved/_final).py, create_final_dict.py, pharma_preprocessor.py가 각자 들고 있던
+# 대표값 정규화 · 염 제거 · 변형 추가를 규칙 객체로 옮긴 것. 출력은 원래 스크립트와 바이트 단위로 같다.
+_GREEK_ALL = str.maketrans({
+    'α': 'alfa', 'β': 'beta', 'γ': 'gamma', 'δ': 'delta', 'ε': 'epsilon', 'ζ': 'zeta', 'η': 'eta',
+    'θ': 'theta', 'ι': 'iota', 'κ': 'kappa', 'λ': 'lambda', 'μ': 'mu', 'ν': 'nu', 'ξ': 'xi',
+    'ο': 'omicron', 'π': 'pi', 'ρ': 'rho', 'σ': 'sigma', 'τ': 'tau', 'υ': 'upsilon', 'φ': 'phi',
+    'χ': 'chi', 'ψ': 'psi', 'ω': 'omega'})
+SPACES = Chain(Sub(r'\s+', ' '), str.strip)
+
+def _compound_norm(iu):
+    """NFD → 그리스 문자 24자 → 소문자 → 용량/비율/농도/ext./법인 표기 제거 → 구분자 공백화"""
+    return Chain(
+        partial(unicodedata.normalize, 'NFD'), methodcaller('translate', _GREEK_ALL), str.lower,
+        Sub(r'\b\d*\.?\d+\s*(mg|g|kg|㎍|mcg|μg|ug|iu|' + iu + r'|%|ppm|ml|l|cc|units?|unit)\b', flags=_I),
+        Sub(r'\b\d+:\d+|w/w|v/v|w/v\b', flags=_I),
+        Sub(r'\b\d+\.?\d*\s*(mg|g|㎍|mcg|μg|ug)/(ml|l|kg)\b', flags=_I),
+        Sub(r'\bext\.?\b', flags=_I),
+        Sub(r'\([주유]\)|㈜|co\.,?\s*ltd\.?|inc\.?|corp\.?|pharmaceutical', flags=_I),
+        Sub(r'[/&.,;:]+', ' '), SPACES)
+
+NORM_COMPOUND = _compound_norm(r'i\.u|ki\.u')            # process_pharma_dict(_improved)
+NORM_COMPOUND_IU = _compound_norm(r'i\.?u\.?|ki\.?u\.?')  # process_pharma_dict_final, create_final_dict
+NORM_PREPROCESS = Chain(                                 # pharma_preprocessor
+    partial(unicodedata.normalize, 'NFKC'), str.lower,
+    Replace('α', 'alfa'), Replace('alpha', 'alfa'), Replace('β', 'beta'), Replace('γ', 'gamma'), Replace('δ', 'delta'),
+    Sub(r'\d+\.?\d*\s*(mg|g|mcg|㎍|iu|i\.u|ki\.u|%|ml|l|ppm|단위|호)\b', flags=_I),
+    Sub(r'\d+:\d+'),
+    Sub(r'\b(w/w|v/v|w/v|ki\.u|i\.u|iu|ext\.?|mg|g|mcg|㎍|%|ml|l|ppm)\b', flags=_I),
+    Sub(r'[/&]', ' '), SPACES)
+
+SALTS = (
+    "hcl", "hydrochloride", "hydrochlorate", "hbr", "hydrobromide", "succinate", "tartrate", "sulfate",
+    "sulphate", "phosphate", "acetate", "citrate", "fumarate", "maleate", "oxalate", "lactate", "gluconate",
+    "stearate", "palmitate", "benzoate", "salicylate", "sodium", "potassium", "calcium", "magnesium",
+    "aluminum", "zinc", "iron", "chloride", "bromide", "iodide", "fluoride", "oxide", "hydroxide", "carbonate",
+    "bicarbonate", "mesylate", "tosylate", "besylate", "esylate", "disodium", "dipotassium", "dihydrochloride",
+    "monohydrate", "dihydrate", "trihydrate", "anhydrous")
+PREPROCESS_SALTS = (
+    "hcl", "hydrochloride", "hbr", "hydrobromide", "sulfate", "sulphate", "acetate", "besylate", "mesylate",
+    "tartrate", "citrate", "maleate", "fumarate", "succinate", "phosphate", "sodium", "potassium", "calcium",
+    "magnesium", "valerate", "propionate", "butyrate", "palmitate", "adipate", "oxalate")
+
+def _strip_salts(fmt, salts=SALTS):
+    """염 토큰마다 fmt(토큰) 패턴을 차례로 제거"""
+    return Chain(*(Sub(fmt % t, flags=_I) for t in salts))
+
+_SALT_ANYWHERE = _strip_salts(r'%s\b')          # 어디서든 (compound)
+_SALT_TAIL = _strip_salts(r'\s*%s$')            # 끝, 붙어 있어도 (compound_improved)
+_SALT_SPACED = _strip_salts(r'\s+%s$')          # 끝, 띄어 쓴 것만 (compound_final)
+_SALT_GLUED = _strip_salts(r'%s$')              # 끝 (create_final)
+_SALT_PREPROCESS = _strip_salts(r'\s+%s$', PREPROCESS_SALTS)
+
+_SALT_FORMS = ("{}hcl", "{}hydrochloride", "{} hcl", "{} hydrochloride", "{}hbr", "{}hydrobromide", "{} hbr", "{} hydrobromide")
+_HCL_FORMS = ("{}hcl", "{} hcl")
+VARIANT_BUDGET = 64                             # 기본 성분 하나에 붙일 variants 변형 수 상한(원문은 세지 않음)
+
+def _hyphen_forms(v):
+    return (v.replace('-', ''), v.replace('-', ' ')) if '-' in v else ()
+
+def _no_paren(v):
+    return _PAREN(v).strip() if '(' in v and ')' in v else ""
+
+class CompoundPolicy:
+    """대표값을 정규화하고 염을 뗀 기본 성분별로 줄을 모았다가(feed), 기본 성분 순으로 한 줄씩 내보냄(finish).
+    하위 클래스는 normalize(대표값 정규화), base(정규화 대표값 → 기본 성분, None이면 줄 버림),
+    merge(기본 성분, [(유사값들, 원래 대표값, 정규화 대표값)] → 결과 줄 또는 None)만 정한다."""
+    name = ""
+    normalize = NORM_COMPOUND
+
+    def __init__(self):
+        self.groups = {}
+
+    def base(self, norm):
+        raise NotImplementedError
+
+    def merge(self, base, entries):
+        raise NotImplementedError
+
+    def feed(self, e: Entry):
+        norm = self.normalize(e.representative)
+        base = self.base(norm)
+        if base is not None:
+            self.groups.setdefault(base, []).append((e.similars, e.representative, norm))
+        return ()
+
+    def finish(self):
+        for base in sorted(self.groups):
+            line = self.merge(base, self.groups[base])
+            if line:
+                yield line
+
+class CompoundMergePolicy(CompoundPolicy):
+    """염 토큰을 어디서든 뗀 기본 성분으로 병합. 대표값은 가장 짧은 정규화 대표값,
+    유사값은 원래 값 + 정규화 대표값 + 하이픈/괄호 변형 + 기본 성분의 hcl/hbr 염 형태 (process_pharma_dict)"""
+    name = "compound"
+
+    def base(self, norm):
+        return (SPACES(_SALT_ANYWHERE(norm)) or norm) if norm else None
+
+    def merge(self, base, entries):
+        rep = min((n for _, _, n in entries), key=lambda n: (len(n), n))
+        vals = {f.format(base) for f in _SALT_FORMS} - {base}
+        for similars, orig, norm in entries:
+            vals.update(similars)
+            vals.add(orig)
+            vals.add(norm)
+            vals.update(_hyphen_forms(norm))
+            np_ = _no_paren(orig)
+            if np_:
+                vals.add(np_.lower())
+        sims = {v for v in vals if v and v.strip() and (self.normalize(v) if v != v.lower() else v) != rep}
+        return format_line(sorted(sims), rep) if sims else None
+
+class CompoundImprovedPolicy(CompoundPolicy):
+    """끝에 붙은 염만 떼어 병합. 가장 짧은 정규화 대표값이 대표, 나머지 원래 대표값은 유사값으로
+    (process_pharma_dict_improved)"""
+    name = "compound_improved"
+
+    def base(self, norm):
+        return (SPACES(_SALT_TAIL(norm)) or norm) if norm else None
+
+    def merge(self, base, entries):
+        _, best_orig, best = min(entries, key=lambda t: (len(t[2]), t[2]))
+        sims = {v for similars, _, _ in entries for v in similars}
+        sims.update(orig for _, orig, norm in entries if norm != best)
+        sims.discard(best_orig)
+        extra = {h for v in list(sims) + [best] for h in _hyphen_forms(v)}
+        extra.update(np_ for np_ in map(_no_paren, sims) if np_ and np_ != best)
+        if best == base:
+            extra.update(f.format(base) for f in _SALT_FORMS)
+        sims |= extra
+        final = {v for v in sims if v and v.strip() and self.normalize(v) != best}
+        return format_line(sorted(final), best) if final else None
+
+class CompoundFinalPolicy(CompoundPolicy):
+    """띄어 쓴 끝 염만 떼어 병합. 한 줄뿐인 그룹은 그 정규화 대표값을, 여러 줄이면 기본 성분을 대표로
+    (process_pharma_dict_final)"""
+    name = "compound_final"
+    normalize = NORM_COMPOUND_IU
+
+    def base(self, norm):
+        return (_SALT_SPACED(norm).strip() or norm) if norm else None
+
+    def merge(self, base, entries):
+        if len(entries) == 1:
+            (similars, _, rep), = entries
+            vals = set(similars)
+            vals.update([h for v in vals for h in _hyphen_forms(v)])
+            vals.update([np_ for np_ in map(_no_paren, vals) if np_ and self.normalize(np_) != rep])
+            forms = _SALT_FORMS[:4]
+        else:
+            rep = base                       # 그룹 안 줄은 모두 기본 성분이 같으므로 기본형이 곧 최적 대표값
+            vals = {v for similars, _, _ in entries for v in similars}
+            vals.update(orig for _, orig, norm in entries if norm != rep)
+            extra = {h for v in vals for h in _hyphen_forms(v)}   # 괄호 변형은 하이픈 변형이 아닌 원래 값에서만
+            extra.update(np_ for np_ in map(_no_paren, vals) if np_ and self.normalize(np_) != rep)
+            vals |= extra
+            forms = _HCL_FORMS
+        if rep == base and len(base) > 3:
+            vals.update(f.format(base) for f in forms)
+        final = {v for v in vals if v and v.strip() and self.normalize(v) != rep}
+        return format_line(sorted(final), rep) if final else None
+
+class CreateFinalPolicy(CompoundPolicy):
+    """끝 염(붙어 있어도)을 떼어 병합, 변형은 back/variants의 dict 프로필을 기본 성분당 VARIANT_BUDGET개까지
+    (create_final_dict)"""
+    name = "create_final"
+    normalize = NORM_COMPOUND_IU
+
+    def base(self, norm):
+        fixed = norm.replace('hyrobromide', 'hydrobromide')
+        return _SALT_GLUED(fixed).strip() or fixed
+
+    def merge(self, base, entries):
+        budget = Budget(VARIANT_BUDGET)
+        if len(entries) == 1:
+            (similars, _, rep), = entries
+            vals = set(similars)
+            for v in list(vals):
+                vals.update(variants(v, "dict", budget=budget))
+            salts = rep == base and len(base) > 3
+        else:
+            rep = base
+            vals = {v for similars, _, _ in entries for v in similars}
+            vals.update(orig for _, orig, norm in entries if norm != rep)
+            for v in sorted(vals):
+                vals.update(variants(v, "dict", budget=budget))
+            salts = len(base) > 3
+        if salts:
+            vals.update(f.format(base) for f in _HCL_FORMS)
+        final = {v for v in vals if v and self.normalize(v) != rep}
+        return format_line(sorted(final), rep) if final else None
+
+class PreprocessPolicy(CompoundPolicy):
+    """기본 성분(띄어 쓴 끝 염 제거)을 대표로, 유사값/대표값과 그 정규화본의 variants 변형(원문 포함)을
+    모두 유사값으로 모음. 기본 성분마다 VARIANT_BUDGET 예산 하나 (pharma_preprocessor)"""
+    name = "preprocess"
+    normalize = NORM_PREPROCESS
+
+    def __init__(self):
+        super().__init__()
+        self.budgets = {}
+
+    def feed(self, e: Entry):
+        norm = self.normalize(e.representative)
+        base = _SALT_PREPROCESS(norm).strip()
+        vals = self.groups.setdefault(base, set())
+        budget = self.budgets.get(base)
+        if budget is None:
+            budget = self.budgets[base] = Budget(VARIANT_BUDGET)
+        for v in [x for s in e.similars for x in (self.normalize(s), s)] + [e.representative, norm]:
+            vals.update(x for x in variants(v, "dict", budget=budget, include_self=True) if x)
+        return ()
+
+    def merge(self, base, vals):
+        sims = [s for s in sorted(vals) if s.strip()]
+        return format_line(sims, base) if base and sims else None
+
+# ---------------- union-find 병합 ----------------
+_KEY_GREEK = {"α": "alfa", "alpha": "alfa", "β": "beta", "γ": "gamma"}
+_KEY_GREEK_RX = re.compile(r'alpha|[αβγ]')
+_KEY_SEP_RX = re.compile(r'[\s\-.·]+')          # NFKC 뒤 새로 생긴 공백 포함
+
+def merge_key(x: str) -> str:
+    """병합 키 = utils_kor.surface_key(괄호 통일 + 공백 제거 + 소문자) 위에 사전 표기 흔들림을 더 접은 것.
+    번들/조회용 surface_key는 `-`, `.`, `·`를 의미 있는 글자로 남기지만(`co-amoxiclav`와 `coamoxiclav`는
+    다른 표면형으로 색인), 사전 병합에서는 이들과 NFKC 전각/호환 문자, 그리스 문자(GREEK과 같은 치환)
+    차이만 있는 줄을 같은 성분으로 묶어야 하므로 여기서 추가로 정규화한다."""
+    x = surface_key(x)
+    if not x.isascii():
+        x = _KEY_GREEK_RX.sub(lambda m: _KEY_GREEK[m.group()], unicodedata.normalize("NFKC", x).lower())
+    elif "alpha" in x:
+        x = x.replace("alpha", "alfa")
+    return _KEY_SEP_RX.sub("", x)
+
+class UnionFind:
+    """배열 기반(경로 반감 + 크기 합치기) — 연산당 거의 상수"""
+    __slots__ = ("parent", "size")
+
+    def __init__(self):
+        self.parent, self.size = [], []
+
+    def add(self) -> int:
+        self.parent.append(len(self.parent)); self.size.append(1)
+        return len(self.parent) - 1
+
+    def find(self, x: int) -> int:
+        p = self.parent
+        while p[x] != x:
+            p[x] = p[p[x]]
+            x = p[x]
+        return x
+
+    def union(self, a: int, b: int) -> bool:
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return False
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+        return True
+
+AUDIT_COLS = ["cluster", "line_a", "representative_a", "line_b", "representative_b", "shared_surface", "surface_key"]
+
+class UnionPolicy:
+    """대표값/유사값 중 정규화 표면형(merge_key)이 하나라도 같은 줄을 모두 한 클러스터로 병합.
+    표면형 키마다 처음 가진 줄만 기억하고, 뒤 줄이 같은 키를 가지면 (처음 줄, 뒤 줄) 연결을 남긴 뒤
+    finish에서 연결을 차례로 union(실제로 두 클러스터를 합친 연결만 감사 기록).
+    max_share: 이 수보다 많은 줄에 나오는 키는 병합 근거로 쓰지 않음(흔한 브랜드/일반어 차단, 0=제한 없음)"""
+    name = "union"
+
+    def __init__(self, audit=None, max_share=0):
+        self.audit_path = audit
+        self.max_share = max_share
+        self.uf = UnionFind()
+        self.entries = []                    # [Entry]
+        self.owner = {}                      # 표면형 키 → 처음 가진 줄(entries 인덱스)
+        self.share = {}                      # 표면형 키 → 가진 줄 수
+        self.links = []                      # (처음 가진 줄, 현재 줄, 표면형, 키)
+        self.merges = []                     # links 중 실제로 두 클러스터를 합친 것
+
+    def feed(self, e: Entry):
+        i = self.uf.add()
+        self.entries.append(e)
+        keys = {}                            # 키 → 이 줄에서 처음 나온 표면형(줄 안 중복 키는 한 번만)
+        for surf in (e.representative,) + e.similars:
+            keys.setdefault(merge_key(surf), surf)
+        keys.pop("", None)
+        for key, surf in keys.items():
+            j = self.owner.setdefault(key, i)
+            self.share[key] = self.share.get(key, 0) + 1
+            if j != i:
+                self.links.append((j, i, surf, key))
+        return ()
+
+    def _representative(self, members) -> str:
+        """염 없는 기본형 중 가장 짧은 것(없으면 가장 짧은 대표값)"""
+        reps = sorted({self.entries[i].representative for i in members}, key=lambda r: (len(r), r))
+        return next((r for r in reps if base_component(r) == r.lower()), reps[0])
+
+    def finish(self):
+        for j, i, surf, key in self.links:   # max_share를 넘는 키는 마지막에야 알 수 있어 병합은 여기서
+            if self.max_share and self.share[key] > self.max_share:
+                continue
+            if self.uf.union(j, i):
+                self.merges.append((j, i, surf, key))
+        clusters = {}
+        for i in range(len(self.entries)):
+            clusters.setdefault(self.uf.find(i), []).append(i)
+        names = {root: self._representative(members) for root, members in clusters.items()}
+        if self.audit_path:
+            with open(self.audit_path, "w", encoding="utf-8-sig", newline="") as f:
+                w = csv.writer(f)
+                w.writerow(AUDIT_COLS)
+                for a, b, surf, key in self.merges:
+                    ea, eb = self.entries[a], self.entries[b]
+                    w.writerow([names[self.uf.find(a)], ea.line_no, ea.representative,
+                                eb.line_no, eb.representative, surf, key])
+        out = []
+        for root, members in clusters.items():
+            rep = names[root]
+            syns = {s for i in members for s in (self.entries[i].representative,) + self.entries[i].similars}
+            syns.discard(rep)
+            out.append((rep, sorted(syns)))
+        for rep, syns in sorted(out):
+            if syns:
+                yield format_line(syns, rep)
+
+POLICIES = {
+    "strict": lambda: CleanPolicy("strict", DOSE_STRICT, strip_hyphen=True, min_len=2),
+    "simple": lambda: CleanPolicy("simple", DOSE_SIMPLE, strip_hyphen=False, min_len=1),
+    "final": lambda: CleanPolicy("final", DOSE_FINAL, strip_hyphen=True, min_len=1),
+    "consolidate": ConsolidatePolicy,
+    "union": UnionPolicy,
+    "compound": CompoundMergePolicy,
+    "compound_improved": CompoundImprovedPolicy,
+    "compound_final": CompoundFinalPolicy,
+    "create_final": CreateFinalPolicy,
+    "preprocess": PreprocessPolicy,
+}
+
+def make_policy(name: str, **kw):
+    """kw는 union 정책 옵션(audit, max_share)"""
+    if name not in POLICIES:
+        raise ValueError(f"unknown policy: {name} (choose from {', '.join(POLICIES)})")
+    return POLICIES[name](**kw) if kw else POLICIES[name]()
+
+# ---------------- 실행 ----------------
+def process(lines, policy, out) -> dict:
+    """lines(반복 가능) → policy → out.write. 한 번만 순회, 결과 줄은 나오는 즉시 기록"""
+    stats = {"entries": 0, "written": 0}
+
+    def emit(rows):
+        for row in rows:
+            out.write(row + "\n")
+            stats["written"] += 1
+
+    for e in parse_entries(lines):
+        stats["entries"] += 1
+        emit(policy.feed(e))
+    emit(policy.finish())
+    return stats
+
+def run(input_file, output_file, policy="strict", **kw) -> dict:
+    p = make_policy(policy, **kw) if isinstance(policy, str) else policy
+    with open(input_file, "r", encoding="utf-8") as f, open(output_file, "w", encoding="utf-8") as out:
+        stats = process(f, p, out)
+    print(f"[OK] {p.name}: {stats['entries']:,} entries → {stats['written']:,} lines → {output_file}")
+    if isinstance(p, UnionPolicy):
+        print(f"[OK] union: {len(p.merges):,} merges" + (f" → audit {p.audit_path}" if p.audit_path else ""))
+    return stats
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("input")
+    ap.add_argument("output")
+    ap.add_argument("--policy", choices=sorted(POLICIES), default="strict")
+    ap.add_argument("--audit", default="", help="union: 병합 감사 CSV(어느 두 줄이 어떤 표면형으로 합쳐졌는지)")
+    ap.add_argument("--max-share", type=int, default=0, help="union: 이보다 많은 줄에 나오는 표면형은 병합 근거에서 제외")
+    args = ap.parse_args()
+    kw = {"audit": args.audit or None, "max_share": args.max_share} if args.policy == "union" else {}
+    run(args.input, args.output, args.policy, **kw)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+near_duplicates.py — 사전 줄 사이 근사 중복 탐지(MinHash + LSH)
+
+find_duplicates.py는 염을 뗀 대표값이 완전히 같은 줄만 찾는다. 여기서는 줄마다 유의어 집합
+(대표값 + 유사값, dict_processor.merge_key로 정규화)을 MinHash 서명으로 만들고 LSH 밴드로 버킷팅해
+같은 버킷에 들어온 쌍만 실제 자카드 유사도를 계산한다 — 전체 쌍 비교(O(n²)) 없이 후보만 본다.
+
+  - 서명: 표면형 키 → blake2b 32비트 해시 → h_i(x) = (a_i·x + b_i) mod p (p = 2^32 다음 소수),
+    numpy로 표면형 5만 개 묶음 단위 계산 후 minimum.reduceat. 메모리는 (묶음 표면형 수 × num_perm)
+  - LSH: bands × rows = num_perm, 임계값 근처에서 S-curve가 오르도록 (bands, rows) 자동 선택
+  - 밴드마다 서명 조각을 64비트로 섞어 정렬 → 같은 값 구간이 버킷. --max-bucket보다 큰 버킷은 건너뜀(건수 보고)
+  - 후보 쌍은 정렬된 해시 배열 교집합으로 정확한 자카드를 재계산, --threshold 이상만 CSV로
+
+입력 형식(자동 인식): `유사값, ... => 대표값` / `대표값: 약품, ...` / `표면형, 표면형, ...`
+
+CLI:
+  python near_duplicates.py ../archive/pharma_dict_final_merged.txt --scope within --out near_dups.csv
+  python near_duplicates.py "../archive/pharma_dict_*" "../solution/developer_output_perfect/*.txt" \\
+      --threshold 0.6 --out near_dups.csv
+"""
+
+import csv
+import glob
+import hashlib
+import argparse
+from pathlib import Path
+from collections import namedtuple
+
+import numpy as np
+
+from dict_processor import merge_key
+
+PRIME = np.uint64(4294967311)                # 2^32 다음 소수 — a·x + b가 uint64 안에 들어감
+Line = namedtuple("Line", "file line_no representative")
+
+def parse_line(line: str):
+    """→ (대표값, [표면형...]) 또는 None"""
+    line = line.strip()
+    if not line:
+        return None
+    if "=>" in line:
+        left, _, right = line.partition("=>")
+        rep = right.strip()
+        terms = [rep] + [t.strip() for t in left.split(",")]
+    elif ": " in line:
+        rep, _, rest = line.partition(": ")
+        rep = rep.strip()
+        terms = [rep] + [t.strip() for t in rest.split(",")]
+    else:
+        terms = [t.strip() for t in line.split(",")]
+        rep = terms[0]
+    return rep, [t for t in terms if t]
+
+def term_hash(term: str) -> int:
+    return int.from_bytes(hashlib.blake2b(term.encode("utf-8"), digest_size=4).digest(), "little")
+
+def choose_bands(num_perm: int, threshold: float) -> tuple[int, int]:
+    """bands × rows = num_perm 중 (1/b)^(1/r)가 threshold 바로 아래인 것(후보 누락을 줄이는 쪽)"""
+    best = None
+    for r in range(1, num_perm + 1):
+        if num_perm % r:
+            continue
+        b = num_perm // r
+        t = (1.0 / b) ** (1.0 / r)
+        score = (threshold - t) if t <= threshold else 2 * (t - threshold)
+        if best is None or score < best[0]:
+            best = (score, b, r)
+    return best[1], best[2]
+
+class MinHasher:
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.a = rng.integers(1, 2**32 - 1, size=(num_perm, 1), dtype=np.uint64)   # a·x + b < 2^64
+        self.b = rng.integers(0, 2**32 - 1, size=(num_perm, 1), dtype=np.uint64)
+
+    def signatures(self, hashes: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+        """hashes: 줄들의 표면형 해시를 이어 붙인 uint64 배열, offsets: 줄 시작 위치 → (n_lines, num_perm) uint32"""
+        h = (self.a * hashes[None, :] + self.b) % PRIME
+        return np.minimum.reduceat(h, offsets, axis=1).T.astype(np.uint32)
+
+def read_sets(paths, min_terms: int = 2):
+    """파일들을 줄 단위로 읽어 (Line, 정렬된 고유 해시 배열) 생성"""
+    for path in paths:
+        with open(path, encoding="utf-8-sig") as f:
+            for no, raw in enumerate(f, 1):
+                parsed = parse_line(raw)
+                if not parsed:
+                    continue
+                rep, terms = parsed
+                keys = {merge_key(t) for t in terms} - {""}
+                if not keys or len(keys) < min_terms:
+                    continue
+                hs = np.unique(np.fromiter((term_hash(k) for k in keys), dtype=np.uint64, count=len(keys)))
+                yield Line(str(path), no, rep), hs
+
+def build_signatures(items, hasher: MinHasher, chunk_terms: int = 50000):
+    """→ (lines, sets, signatures). 표면형 chunk_terms개 단위로 서명 계산(중간 배열 ≈ chunk_terms × num_perm × 8B)"""
+    lines, sets, sigs = [], [], []
+    buf, n_terms = [], 0
+    def flush():
+        if not buf:
+            return
+        lens = np.fromiter((len(h) for h in buf), dtype=np.int64, count=len(buf))
+        offsets = np.concatenate(([0], np.cumsum(lens)[:-1]))
+        sigs.append(hasher.signatures(np.concatenate(buf), offsets))
+        buf.clear()
+    for line, hs in items:
+        lines.append(line); sets.append(hs); buf.append(hs)
+        n_terms += len(hs)
+        if n_terms >= chunk_terms:
+            flush()
+            n_terms = 0
+    flush()
+    sig = np.vstack(sigs) if sigs else np.zeros((0, hasher.num_perm), dtype=np.uint32)
+    return lines, sets, sig
+
+def _band_keys(band: np.ndarray) -> np.ndarray:
+    """(n, rows) uint32 → 행별 64비트 혼합 값(FNV식 곱-xor)"""
+    k = np.full(band.shape[0], 1469598103934665603, dtype=np.uint64)
+    for c in range(band.shape[1]):
+        k = (k ^ band[:, c].astype(np.uint64)) * np.uint64(1099511628211)
+    return k
+
+def candidate_pairs(sig: np.ndarray, bands: int, rows: int, max_bucket: int = 500):
+    """→ (후보 쌍 집합{(i, j)}, 건너뛴 큰 버킷 수)"""
+    pairs, skipped = set(), 0
+    for bi in range(bands):
+        keys = _band_keys(sig[:, bi * rows:(bi + 1) * rows])
+        order = np.argsort(keys, kind="stable")
+        sk = keys[order]
+        starts = np.flatnonzero(np.concatenate(([True], sk[1:] != sk[:-1])))
+        ends = np.append(starts[1:], len(sk))
+        for s, e in zip(starts[ends - starts > 1], ends[ends - starts > 1]):
+            if e - s > max_bucket:
+                skipped += 1
+                continue
+            ids = order[s:e].tolist()
+            for x in range(len(ids)):
+                for y in range(x + 1, len(ids)):
+                    a, b = ids[x], ids[y]
+                    pairs.add((a, b) if a < b else (b, a))
+    return pairs, skipped
+
+def jaccard(a: np.ndarray, b: np.ndarray) -> float:
+    inter = len(np.intersect1d(a, b, assume_unique=True))
+    return inter / (len(a) + len(b) - inter)
+
+OUT_COLS = ["jaccard", "est_jaccard", "file_a", "line_a", "representative_a", "n_a",
+            "file_b", "line_b", "representative_b", "n_b"]
+
+SCOPES = ("all", "within", "across")
+
+def find_near_duplicates(paths, out, threshold=0.5, num_perm=128, min_terms=2, max_bucket=500, seed=1,
+                         scope="all"):
+    """scope: all(모든 쌍) / within(같은 파일 안 — 사전 정리용) / across(다른 파일끼리 — 세대 비교용)"""
+    hasher = MinHasher(num_perm, seed)
+    lines, sets, sig = build_signatures(read_sets(paths, min_terms), hasher)
+    bands, rows = choose_bands(num_perm, threshold)
+    pairs, skipped = candidate_pairs(sig, bands, rows, max_bucket)
+    rows_out = []
+    for i, j in pairs:
+        same = lines[i].file == lines[j].file
+        if (scope == "within" and not same) or (scope == "across" and same):
+            continue
+        jac = jaccard(sets[i], sets[j])
+        if jac >= threshold:
+            rows_out.append((jac, float((sig[i] == sig[j]).mean()), i, j))
+    rows_out.sort(key=lambda r: (-r[0], r[2], r[3]))
+    with open(out, "w", encoding="utf-8-sig", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(OUT_COLS)
+        for jac, est, i, j in rows_out:
+            a, b = lines[i], lines[j]
+            w.writerow([round(jac, 4), round(est, 4), a.file, a.line_no, a.representative, len(sets[i]),
+                        b.file, b.line_no, b.representative, len(sets[j])])
+    return {"lines": len(lines), "bands": bands, "rows": rows, "candidates": len(pairs),
+            "pairs": len(rows_out), "skipped_buckets": skipped}
+
+def expand(patterns):
+    out = []
+    for p in patterns:
+        hits = sorted(glob.glob(p))
+        out.extend(hits if hits else [p])
+    return [Path(p) for p in out if Path(p).is_file()]
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("paths", nargs="+", help="사전 파일 또는 glob(따옴표로 감싸기)")
+    ap.add_argument("--out", required=True, help="후보 쌍 CSV")
+    ap.add_argument("--threshold", type=float, default=0.5, help="자카드 하한")
+    ap.add_argument("--num-perm", type=int, default=128)
+    ap.add_argument("--min-terms", type=int, default=2, help="표면형이 이보다 적은 줄은 제외")
+    ap.add_argument("--max-bucket", type=int, default=500, help="이보다 큰 LSH 버킷은 건너뜀")
+    ap.add_argument("--scope", choices=SCOPES, default="all", help="within: 같은 파일 안 쌍만, across: 다른 파일끼리만")
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+
+    paths = expand(args.paths)
+    if not paths:
+        raise SystemExit("[ERR] 입력 파일이 없습니다")
+    st = find_near_duplicates(paths, args.out, args.threshold, args.num_perm, args.min_terms,
+                              args.max_bucket, args.seed, args.scope)
+    print(f"[OK] {len(paths)} files, {st['lines']:,} lines, LSH {st['bands']}×{st['rows']} → "
+          f"{st['candidates']:,} candidates → {st['pairs']:,} pairs ≥ {args.threshold} → {args.out}"
+          + (f"  (skipped {st['skipped_buckets']:,} oversized buckets)" if st["skipped_buckets"] else ""))
+
+if __name__ == "__main__":
+    main()
@@ -8,16 +8,26 @@
 
 import pandas as pd
 import re
+import sys
 from pathlib import Path
-from collections import defaultdict
+from collections import namedtuple
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 
-def to_text(x) -> str:
-    if x is None or pd.isna(x):
-        return ""
-    s = str(x).strip()
-    if s.lower() in {"nan", "none", "null", ""}:
-        return ""
-    return s
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "back"))
+from variants import variants
+
+_NULL_TEXT = {"nan", "none", "null", ""}
+
+def text_col(col: pd.Series) -> pd.Series:
+    """결측/공백/"nan"·"none"·"null" 문자열 → "", 나머지는 양끝 공백 제거(컬럼 단위)"""
+    s = col.astype(object).where(col.notna(), "").astype(str).str.strip()
+    return s.where(~s.str.lower().isin(_NULL_TEXT), "")
+
+def map_unique(col: pd.Series, fn) -> pd.Series:
+    """고유값마다 fn을 한 번만 적용해 컬럼 전체에 매핑"""
+    uniq = col.unique()
+    return col.map(dict(zip(uniq, map(fn, uniq))))
 
 def fix_brackets_and_repetition(text: str) -> str:
     """텍스트에서 잘못된 괄호와 중복 문자열 정리"""
@@ -72,26 +82,17 @@ def extract_korean_ingredients_enhanced():
         )
         subs_df.columns = ['주성분코드', '약효분류코드', '제형', '일반명', '분류번호', '투여경로', '함량', '단위']
         
-        korean_map = {}
-        for _, row in subs_df.iterrows():
-            code = to_text(row['주성분코드'])
-            ingredient = to_text(row['일반명'])
-            if code and ingredient and re.search(r'[가-힣]', ingredient):
-                korean_map[code] = fix_brackets_and_repetition(ingredient)
-                
+        code = text_col(subs_df['주성분코드'])
+        ingredient = text_col(subs_df['일반명'])
+        keep = (code != "") & ingredient.str.contains(r'[가-힣]')
+        # 같은 코드가 여러 줄이면 마지막 줄 우선(기존 순차 덮어쓰기와 동일)
+        last = pd.DataFrame({'code': code[keep], 'name': ingredient[keep]}).drop_duplicates('code', keep='last')
+        korean_map = dict(zip(last['code'], map_unique(last['name'], fix_brackets_and_repetition)))
         return korean_map
     except Exception as e:
         print(f"한글 성분명 추출 실패: {e}")
         return {}
 
-def normalize_ingredient_for_grouping(ingredient: str) -> str:
-    """성분명을 그룹핑을 위한 표준 형식으로 변환"""
-    if not ingredient:
-        return ""
-    normalized = ingredient.lower()
-    normalized = re.sub(r'\s+', ' ', normalized).strip()
-    return normalized
-
 def clean_brand_name(name: str) -> str:
     if not name:
         return ""
@@ -101,29 +102,176 @@ def clean_brand_name(name: str) -> str:
     clean = re.sub(r'\s+', ' ', clean).strip()
     return clean
 
-def generate_korean_variants(korean_name: str) -> list:
-    """한글 성분명의 다양한 표기 변형 생성"""
+def generate_korean_variants(korean_name: str, limit: int = None) -> list:
+    """한글 성분명의 다양한 표기 변형 생성 (원문 먼저, 이후 공백 제거 → 하이픈 공백 → 하이픈 제거 순)"""
     if not korean_name:
         return []
+    return variants(korean_name, "korean", include_self=True, limit=limit)
+
+GROUP_FIELDS = ('codes', 'ko_names', 'en_names', 'brands', 'companies')
+
+def group_ingredients(df: pd.DataFrame, korean_ingredients: dict) -> dict:
+    """그룹 키(정리된 영문 성분명, 없으면 한글 성분명의 소문자/공백 정규화) → 필드별 set.
+    행 순회 없이 컬럼 연산 + 고유값 단위 정리 + groupby(unique)로 집계"""
+    code = text_col(df['주성분코드'])
+    brand = text_col(df['품명_정제'])
+    brand = brand.where(brand != "", text_col(df['제품명']))
+    ko = text_col(df['성분명_KO'])
+    ko = ko.where(ko != "", code.map(korean_ingredients).fillna(""))
+    t = pd.DataFrame({
+        'codes': code,
+        'ko_names': map_unique(ko, fix_brackets_and_repetition),
+        'en_names': map_unique(text_col(df['성분명_EN']), fix_brackets_and_repetition),
+        'brands': map_unique(brand, clean_brand_name),
+        'companies': text_col(df['업체명']),
+    })
+    key = t['en_names'].where(t['en_names'] != "", t['ko_names'])
+    t['key'] = key.str.lower().str.replace(r'\s+', ' ', regex=True).str.strip()
+    t = t[(t['codes'] != "") & (t['key'] != "")]
     
-    variants = [korean_name]
-    
-    # 공백 제거한 형태
-    no_space = korean_name.replace(' ', '')
-    if no_space != korean_name:
-        variants.append(no_space)
-    
-    # 하이픈을 공백으로 바꾼 형태
-    if '-' in korean_name:
-        variants.append(korean_name.replace('-', ' '))
-    
-    # 하이픈 제거한 형태
-    if '-' in korean_name:
-        variants.append(korean_name.replace('-', ''))
-        
-    return list(set(variants))
+    groups = {k: {f: set() for f in GROUP_FIELDS} for k in t['key'].unique()}
+    for field in GROUP_FIELDS:
+        sub = t.loc[t[field] != "", ['key', field]]
+        for k, values in sub.groupby('key', sort=False)[field].unique().items():
+            groups[k][field].update(values)
+    return groups
+
+# ---------------- 출력: 그룹별 중간 표현 1회 계산 → 5개 파일을 한 번의 정렬 순회로 기록 ----------------
+_NESTED_PAREN = re.compile(r'\)[^)]*\)')
+
+@lru_cache(maxsize=None)
+def clean_name(name: str) -> str:
+    """fix_brackets_and_repetition 결과(캐시). 같은 이름이 여러 파일/그룹에 나와도 한 번만 정리"""
+    return fix_brackets_and_repetition(name)
+
+@lru_cache(maxsize=None)
+def is_clean(name: str) -> bool:
+    """`)...)` 같은 깨진 괄호가 없는 정리 결과인지(캐시)"""
+    return bool(name) and not _NESTED_PAREN.search(name)
+
+GroupView = namedtuple("GroupView", "key codes ko_names en_names companies rep_ko rep_en rep brands")
+
+def build_group_views(ingredient_groups) -> list:
+    """그룹 키 순 GroupView 목록. 정렬/대표값 선택은 여기서 한 번만(대표값은 사전순 첫 값 — 실행마다 같음)"""
+    views = []
+    for key, g in sorted(ingredient_groups.items()):
+        views.append(GroupView(
+            key=key, codes=sorted(g['codes']), ko_names=g['ko_names'], en_names=g['en_names'],
+            companies=g['companies'],
+            rep_ko=min(g['ko_names'], default=""),
+            rep_en=min(g['en_names'], default=""),
+            rep=min(g['ko_names'] or g['en_names'] or g['brands'], default=""),
+            brands=sorted(g['brands'])))
+    return views
+
+class ProperNounWriter:
+    """1. 고유명사 사전 — 전체 그룹을 모은 뒤 정렬해서 기록"""
+    filename = "1_고유명사사전_perfect.txt"
+
+    def __init__(self):
+        self.nouns = set()
+
+    def write(self, f, g):
+        self.nouns.update(g.ko_names, g.en_names, g.companies)
+
+    def close(self, f):
+        for noun in sorted(self.nouns):
+            if len(noun.strip()) > 1:
+                fixed = clean_name(noun)
+                if is_clean(fixed):
+                    f.write(f"{fixed}\n")
+
+class CodeMapWriter:
+    """2. 주성분코드 매핑 — `코드(최대 3개) => 대표 한글, 대표 영문, 브랜드(최대 10개)`"""
+    filename = "2_주성분코드매핑_perfect.txt"
 
-def final_perfect_fix():
+    def write(self, f, g):
+        names = [clean_name(n) for n in (g.rep_ko, g.rep_en) if n]
+        names += [clean_name(b) for b in g.brands[:10]]
+        if names:
+            f.write(f"{', '.join(g.codes[:3])} => {', '.join(n for n in names if is_clean(n))}\n")
+
+    def close(self, f):
+        pass
+
+class KoEnWriter:
+    """3. 성분 한글/영문 — 영문 + 한글 변형(최대 2개) / 영문만 / 한글 변형(최대 3개)"""
+    filename = "3_성분한글영문_perfect.txt"
+
+    def write(self, f, g):
+        en = clean_name(g.rep_en) if g.rep_en else ""
+        ko = clean_name(g.rep_ko) if g.rep_ko else ""
+        if g.rep_en and g.rep_ko:
+            if en and ko and not _NESTED_PAREN.search(en + ko):
+                parts = [en] + generate_korean_variants(ko, limit=2)
+                if len(parts) >= 2:
+                    f.write(f"{', '.join(parts)}\n")
+        elif g.rep_en:
+            if is_clean(en):
+                f.write(f"{en}\n")
+        elif g.rep_ko:
+            if is_clean(ko):
+                ko_variants = generate_korean_variants(ko, limit=3)
+                if ko_variants:
+                    f.write(f"{', '.join(ko_variants)}\n")
+
+    def close(self, f):
+        pass
+
+class SearchSynonymWriter:
+    """4. 검색용 유의어 — 한글/영문/브랜드 합집합(정리 후 최대 15개)"""
+    filename = "4_검색기용유의어사전_perfect.txt"
+
+    def write(self, f, g):
+        terms = g.ko_names | g.en_names | set(g.brands)
+        if len(terms) > 1:
+            fixed = [n for n in map(clean_name, sorted(terms)) if is_clean(n)][:15]
+            if len(fixed) > 1:
+                f.write(f"{', '.join(fixed)}\n")
+
+    def close(self, f):
+        pass
+
+class SubstanceGroupWriter:
+    """5. 주성분별 약품그룹 — `대표명: 브랜드, ...` (브랜드 2개 이상)"""
+    filename = "5_주성분별약품그룹_perfect.txt"
+
+    def write(self, f, g):
+        if len(g.brands) > 1:
+            rep = clean_name(g.rep)
+            brands = [b for b in map(clean_name, g.brands) if is_clean(b)]
+            if rep and brands and is_clean(rep):
+                f.write(f"{rep}: {', '.join(brands)}\n")
+
+    def close(self, f):
+        pass
+
+WRITERS = (ProperNounWriter, CodeMapWriter, KoEnWriter, SearchSynonymWriter, SubstanceGroupWriter)
+
+def write_outputs(groups, output_dir: Path, parallel: bool = False):
+    """그룹 목록을 한 번 순회하며 5개 파일을 함께 기록. parallel=True면 파일마다 스레드 하나"""
+    writers = [w() for w in WRITERS]
+    files = [open(output_dir / w.filename, "w", encoding="utf-8") for w in writers]
+    try:
+        if parallel:
+            def run(w, f):
+                for g in groups:
+                    w.write(f, g)
+                w.close(f)
+            with ThreadPoolExecutor(max_workers=len(writers)) as ex:
+                for fut in [ex.submit(run, w, f) for w, f in zip(writers, files)]:
+                    fut.result()
+        else:
+            for g in groups:
+                for w, f in zip(writers, files):
+                    w.write(f, g)
+            for w, f in zip(writers, files):
+                w.close(f)
+    finally:
+        for f in files:
+            f.close()
+
+def final_perfect_fix(parallel: bool = False):
     """의약품 데이터 최종 처리 메인 함수"""
     print("=== 의약품 데이터 최종 처리 시작 ===")
     
@@ -137,152 +285,13 @@ def final_perfect_fix():
     korean_ingredients = extract_korean_ingredients_enhanced()
     print(f"한글 성분명: {len(korean_ingredients):,}개")
     
-    # 성분명별로 관련 정보를 그룹핑
-    ingredient_groups = defaultdict(lambda: {
-        'codes': set(),
-        'ko_names': set(),
-        'en_names': set(),
-        'brands': set(),
-        'companies': set()
-    })
-    
     print("데이터 처리 중...")
-    for idx, row in df.iterrows():
-        if idx % 10000 == 0:
-            print(f"  진행: {idx:,}/{len(df):,}")
-            
-        substance_code = to_text(row['주성분코드'])
-        product_name = to_text(row['제품명'])
-        brand_name = to_text(row['품명_정제'])
-        ingredient_ko = to_text(row['성분명_KO'])
-        ingredient_en = to_text(row['성분명_EN'])
-        company_name = to_text(row['업체명'])
-        
-        if not substance_code:
-            continue
-            
-        # 성분명 정리 및 오류 수정
-        ko_ingredient = fix_brackets_and_repetition(ingredient_ko or korean_ingredients.get(substance_code, ""))
-        en_ingredient = fix_brackets_and_repetition(ingredient_en)
-        
-        # 그룹핑용 키 생성 (영문명을 우선 사용)
-        grouping_key = ""
-        if en_ingredient:
-            grouping_key = normalize_ingredient_for_grouping(en_ingredient)
-        elif ko_ingredient:
-            grouping_key = normalize_ingredient_for_grouping(ko_ingredient)
-            
-        if not grouping_key:
-            continue
-            
-        group = ingredient_groups[grouping_key]
-        group['codes'].add(substance_code)
-        if ko_ingredient:
-            group['ko_names'].add(ko_ingredient)
-        if en_ingredient:
-            group['en_names'].add(en_ingredient)
-            
-        clean_brand = clean_brand_name(brand_name or product_name)
-        if clean_brand:
-            group['brands'].add(clean_brand)
-        if company_name:
-            group['companies'].add(company_name)
+    ingredient_groups = group_ingredients(df, korean_ingredients)
+    print(f"  성분 그룹: {len(ingredient_groups):,}개")
     
     print("최종 파일 생성...")
-    
-    # 1. 고유명사 사전 생성
-    all_proper_nouns = set()
-    for group in ingredient_groups.values():
-        all_proper_nouns.update(group['ko_names'])
-        all_proper_nouns.update(group['en_names'])
-        all_proper_nouns.update(group['companies'])
-    
-    with open(output_dir / "1_고유명사사전_perfect.txt", "w", encoding="utf-8") as f:
-        for noun in sorted(all_proper_nouns):
-            if len(noun.strip()) > 1:
-                fixed_noun = fix_brackets_and_repetition(noun)
-                if fixed_noun and not re.search(r'\)[^)]*\)', fixed_noun):
-                    f.write(f"{fixed_noun}\n")
-    
-    # 2. 주성분코드 매핑 생성
-    with open(output_dir / "2_주성분코드매핑_perfect.txt", "w", encoding="utf-8") as f:
-        for group_key, group in sorted(ingredient_groups.items()):
-            representative_en = list(group['en_names'])[0] if group['en_names'] else ""
-            representative_ko = list(group['ko_names'])[0] if group['ko_names'] else ""
-            
-            all_names = []
-            if representative_ko:
-                all_names.append(fix_brackets_and_repetition(representative_ko))
-            if representative_en:
-                all_names.append(fix_brackets_and_repetition(representative_en))
-            
-            brands = sorted(group['brands'])[:10]
-            all_names.extend([fix_brackets_and_repetition(b) for b in brands])
-            
-            codes_str = ", ".join(sorted(group['codes'])[:3])
-            if all_names:
-                names_str = ", ".join([n for n in all_names if n and not re.search(r'\)[^)]*\)', n)])
-                f.write(f"{codes_str} => {names_str}\n")
-    
-    # 3. 성분 한글/영문 매핑 (영문, 한글 변형들)
-    with open(output_dir / "3_성분한글영문_perfect.txt", "w", encoding="utf-8") as f:
-        for group_key, group in sorted(ingredient_groups.items()):
-            representative_en = list(group['en_names'])[0] if group['en_names'] else ""
-            representative_ko = list(group['ko_names'])[0] if group['ko_names'] else ""
-            
-            if representative_en and representative_ko:
-                en_fixed = fix_brackets_and_repetition(representative_en)
-                ko_fixed = fix_brackets_and_repetition(representative_ko)
-                
-                if en_fixed and ko_fixed and not re.search(r'\)[^)]*\)', en_fixed + ko_fixed):
-                    # 한글명의 다양한 변형 생성
-                    ko_variants = generate_korean_variants(ko_fixed)
-                    
-                    # 영문명과 한글 변형 2개까지 결합
-                    parts = [en_fixed] + ko_variants[:2]
-                    
-                    if len(parts) >= 2:
-                        f.write(f"{', '.join(parts)}\n")
-            elif representative_en:
-                en_fixed = fix_brackets_and_repetition(representative_en)
-                if en_fixed and not re.search(r'\)[^)]*\)', en_fixed):
-                    f.write(f"{en_fixed}\n")
-            elif representative_ko:
-                ko_fixed = fix_brackets_and_repetition(representative_ko)
-                if ko_fixed and not re.search(r'\)[^)]*\)', ko_fixed):
-                    ko_variants = generate_korean_variants(ko_fixed)
-                    if ko_variants:
-                        f.write(f"{', '.join(ko_variants[:3])}\n")
-    
-    # 4. 검색용 유의어사전 생성
-    with open(output_dir / "4_검색기용유의어사전_perfect.txt", "w", encoding="utf-8") as f:
-        for group_key, group in sorted(ingredient_groups.items()):
-            all_terms = set()
-            all_terms.update(group['ko_names'])
-            all_terms.update(group['en_names'])
-            all_terms.update(group['brands'])
-            
-            if len(all_terms) > 1:
-                fixed_terms = [fix_brackets_and_repetition(t) for t in sorted(all_terms)]
-                fixed_terms = [t for t in fixed_terms if t and not re.search(r'\)[^)]*\)', t)][:15]
-                if len(fixed_terms) > 1:
-                    f.write(f"{', '.join(fixed_terms)}\n")
-    
-    # 5. 주성분별 약품그룹 생성
-    with open(output_dir / "5_주성분별약품그룹_perfect.txt", "w", encoding="utf-8") as f:
-        for group_key, group in sorted(ingredient_groups.items()):
-            if len(group['brands']) > 1:
-                representative = (list(group['ko_names'])[0] if group['ko_names'] else 
-                                list(group['en_names'])[0] if group['en_names'] else 
-                                list(group['brands'])[0])
-                
-                fixed_representative = fix_brackets_and_repetition(representative)
-                all_brands = sorted(group['brands'])
-                fixed_brands = [fix_brackets_and_repetition(b) for b in all_brands]
-                fixed_brands = [b for b in fixed_brands if b and not re.search(r'\)[^)]*\)', b)]
-                
-                if fixed_representative and fixed_brands and not re.search(r'\)[^)]*\)', fixed_representative):
-                    f.write(f"{fixed_representative}: {', '.join(fixed_brands)}\n")
+    groups = build_group_views(ingredient_groups)
+    write_outputs(groups, output_dir, parallel=parallel)
     
     print(f"\n=== 의약품 데이터 최종 처리 완료 ===")
     print(f"결과 저장: {output_dir.resolve()}")
@@ -298,4 +307,4 @@ def final_perfect_fix():
         print(f"- {file.name}: {lines:,}개")
 
 if __name__ == "__main__":
-    final_perfect_fix()
\ No newline at end of file
+    final_perfect_fix(parallel="--parallel" in sys.argv)
\ No newline at end of file